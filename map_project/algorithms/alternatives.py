@@ -0,0 +1,109 @@
+import time
+from collections import namedtuple
+
+from algorithms.path_finder import _direct_cost, _source_seeds, _target_seeds, shortest_path_tree
+
+MAX_ALTERNATIVES = 5
+DEFAULT_MAX_STRETCH = 1.4  # 최단 경로 비용의 몇 배까지를 대안으로 보는지
+DEFAULT_MAX_OVERLAP = 0.7  # 이미 고른 경로와 겹치는 비용 비율의 상한
+DEFAULT_TIME_BUDGET = 1.0  # 초
+
+# 대안 경로. overlap 은 먼저 고른 경로들과 겹치는 비용 비율, plateau 는 두 최단 경로 트리가
+# 함께 지나는 구간의 비용이다.
+Alternative = namedtuple("Alternative", ["path", "cost", "stretch", "overlap", "plateau"])
+
+
+def _plateaus(forward, backward):
+    """
+    순방향 트리(출발점에서)와 역방향 트리(도착점까지)가 함께 지나는 구간(plateau) 목록.
+    u -> v 가 두 트리 모두의 엣지이면 (v 의 순방향 부모가 u 이고 u 의 역방향 다음이 v) 같은 plateau 다.
+    [(첫 노드, 끝 노드)] 을 plateau 비용이 큰 것부터 반환한다.
+    """
+    (forward_costs, forward_parent), (backward_costs, backward_next) = forward, backward
+    shared = sorted(forward_costs.keys() & backward_costs.keys(), key=forward_costs.__getitem__)
+    first_of = {}
+    last_of = {}
+    for node in shared:
+        parent = forward_parent[node]
+        if parent is not None and parent in first_of and backward_next.get(parent) == node:
+            first = first_of[parent]
+        else:
+            first = node
+        first_of[node] = first
+        last_of[first] = node
+    plateaus = list(last_of.items())
+    plateaus.sort(key=lambda item: forward_costs[item[0]] - forward_costs[item[1]])
+    return plateaus
+
+
+def _via_path(last, forward_parent, backward_next):
+    """출발점에서 last 까지 순방향 트리를, 그 뒤로는 역방향 트리를 따라가는 경로."""
+    path = [last]
+    while forward_parent[path[-1]] is not None:
+        path.append(forward_parent[path[-1]])
+    path.reverse()
+    while backward_next[path[-1]] is not None:
+        path.append(backward_next[path[-1]])
+    return path
+
+
+def _edge_costs(path, graph):
+    """경로의 (u, v) 엣지별 비용."""
+    return {(u, v): graph.find_edge(u, v)[1] for u, v in zip(path, path[1:])}
+
+
+def alternative_routes(start, goal, graph, best_cost, k=3, max_stretch=DEFAULT_MAX_STRETCH,
+                       max_overlap=DEFAULT_MAX_OVERLAP, time_budget=DEFAULT_TIME_BUDGET, stats=None):
+    """
+    plateau 방법으로 찾은 최단 경로와 대안 경로 최대 k 개 (Alternative 목록, 첫 항목이 최단 경로).
+    출발점에서의 순방향 트리와 도착점까지의 역방향 트리를 비용 best_cost * max_stretch 까지 한 번씩
+    만들고, 두 트리가 함께 지나는 구간이 긴 경로부터 비용이 max_stretch 배 이하이고 이미 고른
+    경로들과 겹치는 비용이 max_overlap 이하인 것을 고른다. 긴 plateau 를 지나는 경로는 그 구간
+    양쪽이 모두 최단 경로이므로 불필요하게 돌아가는 부분이 적다.
+    time_budget 초가 지나면 그때까지 만든 트리와 고른 경로로 끝낸다 (stats["timedOut"]).
+    """
+    deadline = time.monotonic() + time_budget
+    if stats is None:
+        stats = {}
+    stats.update(candidates=0, timedOut=False)
+    if _direct_cost(start, goal, graph) <= best_cost:
+        return [Alternative([], best_cost, 1.0, 0.0, best_cost)]
+
+    max_cost = best_cost * max_stretch
+    forward = shortest_path_tree(graph, _source_seeds(start, graph), max_cost=max_cost, deadline=deadline)
+    backward = shortest_path_tree(graph, _target_seeds(goal, graph), reverse=True, max_cost=max_cost,
+                                  deadline=deadline)
+    forward_costs, forward_parent = forward
+    backward_costs, backward_next = backward
+    stats["timedOut"] = time.monotonic() > deadline
+
+    plateaus = [plateau for plateau in _plateaus(forward, backward)
+                if forward_costs[plateau[1]] + backward_costs[plateau[1]] <= max_cost]
+    if not plateaus:
+        return []
+    # 최단 경로(비용이 가장 작은 plateau)를 먼저 고르고 나머지는 plateau 가 긴 순서로 본다.
+    shortest = min(plateaus, key=lambda plateau: forward_costs[plateau[1]] + backward_costs[plateau[1]])
+    plateaus.remove(shortest)
+    plateaus.insert(0, shortest)
+
+    routes = []
+    shared = {}  # 고른 경로들의 (u, v) 엣지 -> 비용
+    for first, last in plateaus:
+        if len(routes) > k:
+            break
+        if routes and time.monotonic() > deadline:
+            stats["timedOut"] = True
+            break
+        stats["candidates"] += 1
+        cost = forward_costs[last] + backward_costs[last]
+        path = _via_path(last, forward_parent, backward_next)
+        if len(set(path)) < len(path):
+            continue  # 같은 노드를 두 번 지나는(되돌아오는) 경로
+        edges = _edge_costs(path, graph)
+        overlap = sum(weight for edge, weight in edges.items() if edge in shared) / cost if cost else 1.0
+        if routes and overlap > max_overlap:
+            continue
+        plateau = forward_costs[last] - forward_costs[first]
+        routes.append(Alternative(path, cost, cost / best_cost if best_cost else 1.0, overlap, plateau))
+        shared.update(edges)
+    return routes
@@ -0,0 +1,363 @@
+import argparse
+import heapq
+import time
+
+import numpy as np
+
+from algorithms.graph import RoadGraph, load_arrays
+from algorithms.path_finder import _direct_cost, _source_seeds, _target_seeds
+
+WITNESS_SETTLE_LIMIT = 500  # 지름길이 필요한지 확인하는 탐색의 최대 확정 노드 수
+WITNESS_HOP_LIMIT = 5  # 그 탐색이 따라가는 최대 엣지 수
+SIMULATION_SETTLE_LIMIT = 50  # 우선순위 계산용 모의 축약에서의 한도
+SIMULATION_HOP_LIMIT = 2
+CH_ARRAYS = (
+    "ch_rank",
+    "ch_up_offsets", "ch_up_targets", "ch_up_weights", "ch_up_middle",
+    "ch_down_offsets", "ch_down_targets", "ch_down_weights", "ch_down_middle",
+)
+
+
+def _adjacency_lists(offsets, targets, weights, middle):
+    """CSR 배열을 노드별 (상대 노드, 길이, 중간 노드) 튜플 목록으로 바꾼다."""
+    edges = list(zip(targets.tolist(), weights.tolist(), middle.tolist()))
+    offsets = offsets.tolist()
+    return [edges[lo:hi] for lo, hi in zip(offsets, offsets[1:])]
+
+
+def _to_csr(num_nodes, edges):
+    """(노드, 상대 노드, 길이, 중간 노드) 목록을 CSR 배열로."""
+    edges = sorted(edges, key=lambda edge: edge[0])
+    sources = np.array([e[0] for e in edges], dtype=np.int64)
+    offsets = np.zeros(num_nodes + 1, dtype=np.int32)
+    np.cumsum(np.bincount(sources, minlength=num_nodes), out=offsets[1:])
+    return (
+        offsets,
+        np.array([e[1] for e in edges], dtype=np.int32),
+        np.array([e[2] for e in edges], dtype=np.float64),
+        np.array([e[3] for e in edges], dtype=np.int32),
+    )
+
+
+class _Contractor:
+    """노드 축약 순서를 정하고 지름길(shortcut)을 만드는 전처리 상태."""
+
+    def __init__(self, graph):
+        self.num_nodes = graph.num_nodes
+        # out_edges[u][v] = (길이, 중간 노드 또는 -1). 평행 엣지는 가장 짧은 것만 남긴다.
+        self.out_edges = [dict() for _ in range(self.num_nodes)]
+        self.in_edges = [dict() for _ in range(self.num_nodes)]
+        for u in range(self.num_nodes):
+            for v, weight in graph.neighbors(u):
+                if u != v and (v not in self.out_edges[u] or weight < self.out_edges[u][v][0]):
+                    self.out_edges[u][v] = (weight, -1)
+                    self.in_edges[v][u] = (weight, -1)
+        self.contracted_neighbors = [0] * self.num_nodes
+        self.depth = [0] * self.num_nodes  # 이웃이 먼저 축약될 때마다 쌓이는 계층 깊이
+        self.rank = np.full(self.num_nodes, -1, dtype=np.int32)
+        self.up_edges = []
+        self.down_edges = []
+
+    def _witness_costs(self, source, excluded, targets, max_cost, settle_limit, hop_limit):
+        """
+        excluded 를 거치지 않고 source 에서 targets 까지의 (제한된) 최단 거리.
+        hop_limit 개보다 많은 엣지를 거치는 경로는 보지 않는다. 찾지 못한 witness 는
+        필요 없는 지름길을 하나 더 만들 뿐 최단 거리는 그대로다.
+        """
+        costs = {source: 0.0}
+        hops = {source: 0}
+        frontier = [(0.0, source)]
+        remaining = set(targets)
+        settled = 0
+        out_edges = self.out_edges
+        while frontier and remaining and settled < settle_limit:
+            cost, node = heapq.heappop(frontier)
+            if cost > costs[node]:
+                continue
+            if cost > max_cost:
+                break
+            remaining.discard(node)
+            settled += 1
+            node_hops = hops[node] + 1
+            if node_hops > hop_limit:
+                continue
+            for neighbor, (weight, _) in out_edges[node].items():
+                new_cost = cost + weight
+                if neighbor != excluded and new_cost < costs.get(neighbor, float("inf")):
+                    costs[neighbor] = new_cost
+                    hops[neighbor] = node_hops
+                    heapq.heappush(frontier, (new_cost, neighbor))
+        return costs
+
+    def _shortcuts(self, node, settle_limit, hop_limit):
+        """node 를 축약할 때 필요한 지름길 (u, w, 길이) 목록."""
+        shortcuts = []
+        outgoing = self.out_edges[node]
+        for u, (in_weight, _) in self.in_edges[node].items():
+            targets = [w for w in outgoing if w != u]
+            if not targets:
+                continue
+            max_cost = in_weight + max(outgoing[w][0] for w in targets)
+            witness = self._witness_costs(u, node, targets, max_cost, settle_limit, hop_limit)
+            for w in targets:
+                via = in_weight + outgoing[w][0]
+                if witness.get(w, float("inf")) > via:
+                    shortcuts.append((u, w, via))
+        return shortcuts
+
+    def priority(self, node):
+        """
+        2 * 엣지 차이(추가될 지름길 수 - 사라질 엣지 수) + 이미 축약된 이웃 수 + 계층 깊이.
+        깊이 항은 한 지역에서 축약이 줄지어 이어지지 않게 해 질의가 오르는 계층을 얕게 만든다.
+        """
+        shortcuts = self._shortcuts(node, SIMULATION_SETTLE_LIMIT, SIMULATION_HOP_LIMIT)
+        degree = len(self.out_edges[node]) + len(self.in_edges[node])
+        return 2 * (len(shortcuts) - degree) + self.contracted_neighbors[node] + self.depth[node]
+
+    def contract(self, node, rank):
+        self.rank[node] = rank
+        for u, w, weight in self._shortcuts(node, WITNESS_SETTLE_LIMIT, WITNESS_HOP_LIMIT):
+            if w not in self.out_edges[u] or weight < self.out_edges[u][w][0]:
+                self.out_edges[u][w] = (weight, node)
+                self.in_edges[w][u] = (weight, node)
+
+        # 남은 엣지는 모두 node 보다 나중에 축약될(순위가 높은) 노드로 이어진다.
+        depth = self.depth[node] + 1
+        for w, (weight, middle) in self.out_edges[node].items():
+            self.up_edges.append((node, w, weight, middle))
+            del self.in_edges[w][node]
+            self.contracted_neighbors[w] += 1
+            self.depth[w] = max(self.depth[w], depth)
+        for u, (weight, middle) in self.in_edges[node].items():
+            self.down_edges.append((node, u, weight, middle))
+            del self.out_edges[u][node]
+            self.contracted_neighbors[u] += 1
+            self.depth[u] = max(self.depth[u], depth)
+        self.out_edges[node] = {}
+        self.in_edges[node] = {}
+
+
+def build_contraction_hierarchy(graph, verbose=False):
+    """
+    prepare_graph 로 만든 RoadGraph 에서 Contraction Hierarchies 를 만든다.
+    우선순위가 가장 낮은 노드부터 축약하고(우선순위는 꺼낼 때 다시 계산하는 lazy update),
+    축약한 노드를 거치는 최단 경로를 대신할 지름길은 확정 노드 수와 엣지 수(hop)를 제한한
+    witness 탐색으로 판단한다.
+    """
+    contractor = _Contractor(graph)
+    queue = [(contractor.priority(node), node) for node in range(graph.num_nodes)]
+    heapq.heapify(queue)
+
+    rank = 0
+    began = time.perf_counter()
+    while queue:
+        _, node = heapq.heappop(queue)
+        priority = contractor.priority(node)
+        if queue and priority > queue[0][0]:
+            heapq.heappush(queue, (priority, node))
+            continue
+        contractor.contract(node, rank)
+        rank += 1
+        if verbose and rank % 10000 == 0:
+            print(f"contracted {rank}/{graph.num_nodes} nodes ({time.perf_counter() - began:.1f}s)")
+
+    return ContractionHierarchy(
+        graph,
+        contractor.rank,
+        *_to_csr(graph.num_nodes, contractor.up_edges),
+        *_to_csr(graph.num_nodes, contractor.down_edges),
+    )
+
+
+class ContractionHierarchy:
+    """
+    Contraction Hierarchies 질의 엔진.
+    up_* 는 각 노드에서 순위가 더 높은 노드로 나가는 엣지, down_* 는 순위가 더 높은 노드에서
+    들어오는 엣지(역방향 탐색용)이며, *_middle 은 지름길이 대신하는 중간 노드(원래 엣지는 -1)다.
+    """
+
+    def __init__(self, graph, rank,
+                 up_offsets, up_targets, up_weights, up_middle,
+                 down_offsets, down_targets, down_weights, down_middle):
+        self.graph = graph
+        self.rank = rank
+        self.up_offsets = up_offsets
+        self.up_targets = up_targets
+        self.up_weights = up_weights
+        self.up_middle = up_middle
+        self.down_offsets = down_offsets
+        self.down_targets = down_targets
+        self.down_weights = down_weights
+        self.down_middle = down_middle
+        self._adjacency = None
+
+    def adjacency(self):
+        """
+        노드별 (상대 노드, 길이, 중간 노드) 목록 (up, down). 처음 질의할 때 한 번 만든다.
+        질의는 노드마다 몇 개 안 되는 엣지만 보므로 numpy 배열을 잘라 쓰는 것보다 파이썬 목록이 훨씬 빠르다.
+        """
+        if self._adjacency is None:
+            self._adjacency = tuple(
+                _adjacency_lists(offsets, targets, weights, middle)
+                for offsets, targets, weights, middle in (
+                    (self.up_offsets, self.up_targets, self.up_weights, self.up_middle),
+                    (self.down_offsets, self.down_targets, self.down_weights, self.down_middle),
+                )
+            )
+        return self._adjacency
+
+    def search(self, start, goal, stats=None, trace=None):
+        """
+        양방향 상향(upward) Dijkstra. bidirectional_a_star 와 같은 (경로, trace) 를 반환한다.
+        각 방향은 최소 키가 지금까지 찾은 최단 거리 mu 이상이 되면 멈춘다.
+        stall-on-demand: 더 높은 순위 노드를 거쳐 더 싸게 닿을 수 있는 노드는 확장하지 않는다.
+        """
+        costs = [dict(_source_seeds(start, self.graph)), dict(_target_seeds(goal, self.graph))]
+        came_from = [dict.fromkeys(costs[0]), dict.fromkeys(costs[1])]
+        frontiers = [[(cost, node) for node, cost in side.items()] for side in costs]
+        heapq.heapify(frontiers[0])
+        heapq.heapify(frontiers[1])
+        settled = [set(), set()]
+        pushed = len(frontiers[0]) + len(frontiers[1])  # 큐에 넣은 항목 수
+        relaxed = 0
+        # 방향별 확장할 엣지. stall 여부는 반대 방향 엣지로 확인한다.
+        expand = self.adjacency()
+        inf = float("inf")
+
+        best_cost = _direct_cost(start, goal, self.graph)
+        meeting_node = None
+        for node in costs[0].keys() & costs[1].keys():
+            if costs[0][node] + costs[1][node] < best_cost:
+                best_cost = costs[0][node] + costs[1][node]
+                meeting_node = node
+
+        side = 0
+        while (frontiers[0] and frontiers[0][0][0] < best_cost) or (frontiers[1] and frontiers[1][0][0] < best_cost):
+            # 아직 진행할 수 있는 방향을 번갈아 확장
+            if not frontiers[side] or frontiers[side][0][0] >= best_cost:
+                side = 1 - side
+            cost, current = heapq.heappop(frontiers[side])
+            side_costs = costs[side]
+            if current in settled[side] or cost > side_costs[current]:
+                side = 1 - side
+                continue
+            settled[side].add(current)
+            if trace is not None:
+                trace.record(current, cost, came_from[side][current], side)
+
+            other_costs = costs[1 - side]
+            if current in other_costs and cost + other_costs[current] < best_cost:
+                best_cost = cost + other_costs[current]
+                meeting_node = current
+
+            for higher, weight, _ in expand[1 - side][current]:
+                if side_costs.get(higher, inf) + weight < cost:
+                    break
+            else:
+                edges = expand[side][current]
+                relaxed += len(edges)
+                for neighbor, weight, _ in edges:
+                    new_cost = cost + weight
+                    if new_cost < side_costs.get(neighbor, inf):
+                        side_costs[neighbor] = new_cost
+                        came_from[side][neighbor] = current
+                        heapq.heappush(frontiers[side], (new_cost, neighbor))
+                        pushed += 1
+            side = 1 - side
+
+        if stats is not None:
+            stats["distance"] = best_cost
+            stats["settled"] = len(settled[0]) + len(settled[1])
+            stats["relaxed"] = int(relaxed)
+            stats["pushed"] = pushed
+        if trace is not None:
+            trace.finish()
+
+        if best_cost == float("inf"):
+            return None, trace  # 도달할 수 없음
+        if meeting_node is None:
+            return [], trace  # 같은 도로 구간을 그대로 따라가는 경로
+
+        # 상향 경로 두 개를 이어 붙인 뒤 지름길을 원래 엣지로 풀어낸다.
+        forward = [meeting_node]
+        while came_from[0][forward[-1]] is not None:
+            forward.append(came_from[0][forward[-1]])
+        forward.reverse()
+        backward = [meeting_node]
+        while came_from[1][backward[-1]] is not None:
+            backward.append(came_from[1][backward[-1]])
+
+        nodes = forward + backward[1:]
+        path = [nodes[0]]
+        for u, v in zip(nodes, nodes[1:]):
+            path.extend(self._unpack(u, v))
+        return path, trace
+
+    def _shortcut(self, u, v):
+        """u -> v (지름길일 수 있는) 엣지 중 가장 짧은 것의 중간 노드."""
+        up, down = self.adjacency()
+        if self.rank[u] < self.rank[v]:
+            edges, other = up[u], v
+        else:
+            edges, other = down[v], u
+        return min((weight, middle) for target, weight, middle in edges if target == other)[1]
+
+    def _unpack(self, u, v):
+        """u -> v 엣지를 원래 그래프의 노드 목록(u 제외)으로 펼친다."""
+        path = []
+        stack = [(u, v)]
+        while stack:
+            a, b = stack.pop()
+            middle = self._shortcut(a, b)
+            if middle < 0:
+                path.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+        return path
+
+    def save(self, path):
+        """그래프와 CH 배열을 하나의 .npz 로 저장."""
+        self.graph.save(path, **{name: getattr(self, name[len("ch_"):]) for name in CH_ARRAYS})
+
+    @classmethod
+    def load(cls, path, mmap=False):
+        arrays = load_arrays(path, mmap)
+        engine = cls.from_arrays(RoadGraph.from_arrays(arrays), arrays)
+        if engine is None:
+            raise ValueError(f"{path} has no contraction hierarchy data")
+        return engine
+
+    @classmethod
+    def from_arrays(cls, graph, arrays):
+        """load_arrays() 결과에 CH 배열이 있으면 ContractionHierarchy, 없으면 None."""
+        if not all(name in arrays for name in CH_ARRAYS):
+            return None
+        return cls(graph, *(arrays[name] for name in CH_ARRAYS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="도로 그래프의 Contraction Hierarchies 를 미리 만든다.")
+    parser.add_argument("output", help="저장할 .npz 경로")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--graph", help="RoadGraph.save() 로 저장한 그래프")
+    source.add_argument("--bbox", type=float, nargs=4, metavar=("NORTH", "SOUTH", "EAST", "WEST"),
+                        help="도로 그래프 공급자(GRAPH_PROVIDER)에서 불러올 범위")
+    args = parser.parse_args()
+
+    if args.graph:
+        graph = RoadGraph.load(args.graph)
+    else:
+        from algorithms.path_finder import prepare_graph
+        from algorithms.road_network import graph_provider
+        graph = prepare_graph(graph_provider.load_bbox(*args.bbox))
+
+    began = time.perf_counter()
+    ch = build_contraction_hierarchy(graph, verbose=True)
+    print(f"Built contraction hierarchy for {graph.num_nodes} nodes in {time.perf_counter() - began:.1f}s "
+          f"({len(ch.up_targets) + len(ch.down_targets)} edges incl. shortcuts)")
+    ch.save(args.output)
+
+
+if __name__ == "__main__":
+    main()
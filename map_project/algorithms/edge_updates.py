@@ -0,0 +1,99 @@
+import math
+import threading
+
+CLOSED = math.inf  # 통행 금지 엣지의 배수
+
+
+def parse_edge_updates(items):
+    """
+    요청 본문의 갱신 목록을 (u, v, key, 배수) 목록으로. 각 항목은 {"u", "v", "key"(기본 0)} 와
+    "factor"(1 이상, 1 이면 원래대로) 또는 "closed"(true 면 통행 금지, false 면 원래대로) 이다.
+    형식이 맞지 않으면 ValueError.
+    """
+    if not isinstance(items, list):
+        raise ValueError("updates must be a list")
+    changes = []
+    for item in items:
+        if not isinstance(item, dict) or "u" not in item or "v" not in item:
+            raise ValueError("Each update needs u and v (OSM node IDs)")
+        if "closed" in item:
+            factor = CLOSED if item["closed"] else 1.0
+        else:
+            factor = float(item.get("factor", 1.0))
+        if not factor >= 1.0:
+            raise ValueError("factor must be at least 1 (use 1 to clear an update)")
+        changes.append((int(item["u"]), int(item["v"]), int(item.get("key", 0)), factor))
+    return changes
+
+
+class EdgeUpdates:
+    """
+    실시간 엣지 가중치 갱신 (통제, 정체). OSM (u, v, key) 엣지마다 자유 흐름 이동 시간에 곱할
+    배수를 두고, 바뀔 때마다 version 을 올린다. CLOSED 엣지는 길이도 inf 로 본다.
+    배수는 1 이상이라 가중치가 원래 값보다 작아지지 않으므로, 원래 가중치로 미리 만든 하한
+    (직선거리, ALT 랜드마크, 최고 속도) 은 갱신 뒤에도 그대로 쓸 수 있다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._factors = {}  # 버전마다 새로 만들며, 만든 뒤에는 바꾸지 않는다
+        self.version = 0
+
+    def apply(self, changes):
+        """
+        changes [(u, v, key, 배수)] 를 한 번에 적용한다 (같은 엣지는 마지막 값).
+        실제로 바뀐 엣지의 {(u, v, key): (이전 배수, 새 배수)}. 바뀐 엣지가 없으면 버전도 그대로다.
+        """
+        with self._lock:
+            factors = dict(self._factors)
+            for u, v, key, factor in changes:
+                if factor == 1.0:
+                    factors.pop((u, v, key), None)
+                else:
+                    factors[(u, v, key)] = factor
+            delta = self._delta(factors)
+            if delta:
+                self._factors = factors
+                self.version += 1
+            return delta
+
+    def replace(self, version, factors):
+        """다른 프로세스의 snapshot() 으로 바꾼다. apply 와 같이 바뀐 엣지를 반환한다."""
+        with self._lock:
+            delta = self._delta(factors)
+            self._factors = factors
+            self.version = version
+            return delta
+
+    def _delta(self, factors):
+        return {
+            edge: (self._factors.get(edge, 1.0), factors.get(edge, 1.0))
+            for edge in self._factors.keys() | factors.keys()
+            if self._factors.get(edge, 1.0) != factors.get(edge, 1.0)
+        }
+
+    def snapshot(self):
+        """(version, {(u, v, key): 배수}). 돌려준 dict 는 바꾸지 않는다."""
+        with self._lock:
+            return self.version, self._factors
+
+    def stats(self):
+        with self._lock:
+            closed = sum(1 for factor in self._factors.values() if factor == CLOSED)
+            return {"version": self.version, "edges": len(self._factors), "closed": closed}
+
+
+def changed_edges(delta, weight):
+    """
+    delta 에서 weight(distance | time) 가중치가 바뀐 엣지의 (늘어난 (u, v) 집합, 줄어든 엣지가 있는지).
+    정체 배수는 이동 시간만 바꾸고, 통행 금지/해제는 거리도 바꾼다.
+    """
+    increased, decreased = set(), False
+    for (u, v, _), (old, new) in delta.items():
+        if weight == "distance":
+            old, new = math.isinf(old), math.isinf(new)
+        if new > old:
+            increased.add((u, v))
+        elif new < old:
+            decreased = True
+    return increased, decreased
@@ -0,0 +1,339 @@
+import copy
+import math
+import struct
+import zipfile
+
+import numpy as np
+
+from algorithms.spatial_index import EdgeIndex, SpatialIndex
+from algorithms.speeds import DEFAULT_SPEED, MAX_SPEED, kph_to_mps
+
+FORMAT_VERSION = 2
+WEIGHTS = ("distance", "time")
+
+
+def _csr(num_nodes, sources, order):
+    """정렬 순서(order)에 따른 CSR 오프셋 배열."""
+    counts = np.bincount(sources[order], minlength=num_nodes)
+    offsets = np.zeros(num_nodes + 1, dtype=np.int32)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+class RoadGraph:
+    """
+    배열 기반(CSR) 도로 그래프.
+    노드는 0..N-1 의 int32 인덱스로 다루고, node_ids[i] 가 원래 OSM ID 이다.
+    fwd_* 는 나가는 엣지, rev_* 는 들어오는 엣지이며 rev_edges[j] 는 역방향 엣지 j 에
+    대응하는 순방향 엣지 위치다.
+    *_weights 는 길이(m), *_times 는 이동 시간(초)이다. 탐색은 *_weights 를 쓰므로
+    이동 시간으로 탐색할 때는 weighted("time") 그래프를 넘긴다.
+    """
+
+    ARRAYS = (
+        "node_ids", "lat", "lon",
+        "fwd_offsets", "fwd_targets", "fwd_weights", "fwd_keys",
+        "rev_offsets", "rev_targets", "rev_weights", "rev_edges",
+        "fwd_times", "rev_times",
+    )
+
+    def __init__(self, node_ids, lat, lon,
+                 fwd_offsets, fwd_targets, fwd_weights, fwd_keys,
+                 rev_offsets, rev_targets, rev_weights, rev_edges,
+                 fwd_times, rev_times):
+        self.node_ids = node_ids  # 정렬된 OSM ID (int64)
+        self.lat = lat
+        self.lon = lon
+        self.fwd_offsets = fwd_offsets
+        self.fwd_targets = fwd_targets
+        self.fwd_weights = fwd_weights
+        self.fwd_keys = fwd_keys
+        self.rev_offsets = rev_offsets
+        self.rev_targets = rev_targets
+        self.rev_weights = rev_weights
+        self.rev_edges = rev_edges
+        self.fwd_times = fwd_times
+        self.rev_times = rev_times
+        self.weight = "distance"  # fwd_weights/rev_weights 가 나타내는 가중치
+        self.version = 0  # 엣지 가중치가 바뀔 때마다 올리는 버전 (with_edge_factors)
+        self._spatial_index = None
+        self._edge_index = None
+        self._bounds = None
+        self._max_speed = None
+        self._base = None  # weighted() 로 만든 그래프면 원래 그래프
+        self._time_graph = None
+        self._free = None  # with_edge_factors() 로 만든 그래프면 갱신 전의 (fwd_weights, fwd_times)
+
+    @classmethod
+    def from_edges(cls, node_ids, lat, lon, edge_u, edge_v, edge_key, edge_length, edge_speed=None):
+        """
+        OSM ID 로 표현된 노드/엣지 배열에서 그래프를 만든다.
+        edge_speed(km/h) 로 엣지 이동 시간을 한 번 계산해 두며, 없으면 DEFAULT_SPEED 로 본다.
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        order = np.argsort(node_ids, kind="stable")
+        node_ids = node_ids[order]
+        lat = np.asarray(lat, dtype=np.float64)[order]
+        lon = np.asarray(lon, dtype=np.float64)[order]
+        num_nodes = len(node_ids)
+
+        u = np.searchsorted(node_ids, np.asarray(edge_u, dtype=np.int64)).astype(np.int32)
+        v = np.searchsorted(node_ids, np.asarray(edge_v, dtype=np.int64)).astype(np.int32)
+        weights = np.asarray(edge_length, dtype=np.float32)
+        keys = np.asarray(edge_key, dtype=np.int32)
+        speeds = np.full(len(weights), DEFAULT_SPEED) if edge_speed is None else np.asarray(edge_speed, dtype=np.float64)
+        times = (weights / kph_to_mps(speeds)).astype(np.float32)
+
+        fwd_order = np.argsort(u, kind="stable")
+        fwd_offsets = _csr(num_nodes, u, fwd_order)
+        fwd_targets = v[fwd_order]
+        fwd_weights = weights[fwd_order]
+        fwd_keys = keys[fwd_order]
+        fwd_times = times[fwd_order]
+        fwd_sources = u[fwd_order]
+
+        rev_edges = np.argsort(fwd_targets, kind="stable").astype(np.int32)
+        rev_offsets = _csr(num_nodes, fwd_targets, rev_edges)
+        rev_targets = fwd_sources[rev_edges]
+        rev_weights = fwd_weights[rev_edges]
+        rev_times = fwd_times[rev_edges]
+
+        return cls(node_ids, lat, lon,
+                   fwd_offsets, fwd_targets, fwd_weights, fwd_keys,
+                   rev_offsets, rev_targets, rev_weights, rev_edges,
+                   fwd_times, rev_times)
+
+    @property
+    def num_nodes(self):
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self):
+        return len(self.fwd_targets)
+
+    def weighted(self, weight):
+        """
+        weight(distance | time) 로 탐색하는 그래프. distance 면 자신이고, time 이면 배열과 색인을
+        함께 쓰고 *_weights 만 *_times 로 바꾼 그래프를 처음 한 번 만들어 둔다.
+        """
+        base = self._base or self
+        if weight == "distance":
+            return base
+        if weight != "time":
+            raise ValueError(f"Unknown weight: {weight}")
+        if base._time_graph is None:
+            graph = copy.copy(base)
+            graph.fwd_weights, graph.rev_weights = base.fwd_times, base.rev_times
+            graph.weight = "time"
+            graph._base = base
+            base._time_graph = graph
+        return base._time_graph
+
+    def with_edge_factors(self, factors, version=None):
+        """
+        factors {(u, v, key): 배수} (OSM ID, EdgeUpdates) 를 갱신 전 이동 시간에 곱한 새 그래프.
+        배수가 inf 인 엣지는 통행 금지로 보고 길이도 inf 로 두며, factors 에 없는 엣지는 갱신 전
+        값으로 돌아간다. 가중치 배열만 새로 만들고 노드/CSR/색인은 함께 쓰므로, 이전 그래프로
+        진행 중인 탐색은 끝까지 이전 가중치를 본다. version 을 주지 않으면 version + 1.
+        배수는 1 이상이므로 갱신 전 그래프의 max_speed 는 그대로 상한이다.
+        """
+        base = self._base or self
+        free_weights, free_times = base._free or (base.fwd_weights, base.fwd_times)
+        weights, times = np.array(free_weights), np.array(free_times)
+        for (u, v, key), factor in factors.items():
+            edge = base.edge_position(u, v, key)
+            if edge is None:
+                continue
+            times[edge] = free_times[edge] * factor
+            if math.isinf(factor):
+                weights[edge] = np.inf
+
+        graph = copy.copy(base)
+        graph.fwd_weights, graph.fwd_times = weights, times
+        graph.rev_weights, graph.rev_times = weights[base.rev_edges], times[base.rev_edges]
+        graph.version = base.version + 1 if version is None else version
+        graph._free = (free_weights, free_times)
+        graph._time_graph = None
+        return graph
+
+    @property
+    def max_speed(self):
+        """
+        엣지 중 가장 빠른 주행 속도 (m/s). 이동 시간 휴리스틱의 기준이다.
+        길이가 0 이거나 통제된(시간이 inf) 엣지처럼 속도가 유한한 양수가 아닌 엣지는 빼며,
+        그런 엣지뿐이면 속도 상한 MAX_SPEED 로 본다.
+        """
+        base = self._base or self
+        if base._max_speed is None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                speeds = base.fwd_weights / base.fwd_times
+            speeds = speeds[np.isfinite(speeds) & (speeds > 0)]
+            base._max_speed = float(speeds.max()) if len(speeds) else kph_to_mps(MAX_SPEED)
+        return base._max_speed
+
+    @property
+    def spatial_index(self):
+        """최근접 노드 색인. 처음 사용할 때 한 번만 만든다."""
+        if self._base is not None:
+            return self._base.spatial_index
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex(self.lat, self.lon)
+        return self._spatial_index
+
+    @property
+    def edge_index(self):
+        """최근접 도로 구간 색인. 처음 사용할 때 한 번만 만든다."""
+        if self._base is not None:
+            return self._base.edge_index
+        if self._edge_index is None:
+            self._edge_index = EdgeIndex(self)
+        return self._edge_index
+
+    @property
+    def bounds(self):
+        """노드 좌표 범위 (north, south, east, west)."""
+        if self._bounds is None:
+            self._bounds = (
+                float(self.lat.max()), float(self.lat.min()),
+                float(self.lon.max()), float(self.lon.min()),
+            )
+        return self._bounds
+
+    def contains(self, lat, lon):
+        """좌표가 그래프 범위 안에 있는지."""
+        north, south, east, west = self.bounds
+        return south <= lat <= north and west <= lon <= east
+
+    def index_of(self, osm_id):
+        """OSM ID 를 노드 인덱스로 변환."""
+        i = int(np.searchsorted(self.node_ids, osm_id))
+        if i >= self.num_nodes or self.node_ids[i] != osm_id:
+            raise KeyError(osm_id)
+        return i
+
+    def indices_of(self, osm_ids):
+        """OSM ID 배열을 노드 인덱스 배열로 변환. 그래프에 없는 ID 가 있으면 KeyError."""
+        osm_ids = np.asarray(osm_ids, dtype=np.int64)
+        indices = np.minimum(np.searchsorted(self.node_ids, osm_ids), max(self.num_nodes - 1, 0))
+        missing = self.node_ids[indices] != osm_ids if self.num_nodes else osm_ids == osm_ids
+        if missing.any():
+            raise KeyError(int(osm_ids[missing][0]))
+        return indices
+
+    def osm_id(self, index):
+        return int(self.node_ids[index])
+
+    def position(self, index):
+        """노드의 (lat, lon)."""
+        return float(self.lat[index]), float(self.lon[index])
+
+    def neighbors(self, index):
+        """나가는 엣지의 (이웃 인덱스, 가중치) 목록."""
+        lo, hi = self.fwd_offsets[index], self.fwd_offsets[index + 1]
+        return list(zip(self.fwd_targets[lo:hi].tolist(), self.fwd_weights[lo:hi].tolist()))
+
+    def predecessors(self, index):
+        """들어오는 엣지의 (이전 노드 인덱스, 가중치) 목록."""
+        lo, hi = self.rev_offsets[index], self.rev_offsets[index + 1]
+        return list(zip(self.rev_targets[lo:hi].tolist(), self.rev_weights[lo:hi].tolist()))
+
+    def edge_position(self, u, v, key):
+        """OSM ID 로 주어진 엣지 (u, v, key) 의 순방향 엣지 위치. 그래프에 없으면 None."""
+        try:
+            u, v = self.index_of(u), self.index_of(v)
+        except KeyError:
+            return None
+        lo, hi = int(self.fwd_offsets[u]), int(self.fwd_offsets[u + 1])
+        for e in range(lo, hi):
+            if self.fwd_targets[e] == v and self.fwd_keys[e] == key:
+                return e
+        return None
+
+    def find_edge(self, u, v):
+        """u -> v 엣지 중 가중치가 가장 작은 것의 (엣지 위치, 가중치). 없으면 None."""
+        lo, hi = int(self.fwd_offsets[u]), int(self.fwd_offsets[u + 1])
+        best = None
+        for e in range(lo, hi):
+            if self.fwd_targets[e] == v and (best is None or self.fwd_weights[e] < best[1]):
+                best = (e, float(self.fwd_weights[e]))
+        return best
+
+    def save(self, path, **extra):
+        """압축하지 않은 단일 .npz 로 저장 (load(mmap=True) 로 메모리 매핑 가능)."""
+        base = self._base or self
+        arrays = {name: getattr(base, name) for name in self.ARRAYS}
+        if base._free is not None:
+            # 실시간 갱신은 저장하지 않는다.
+            fwd_weights, fwd_times = base._free
+            arrays.update(fwd_weights=fwd_weights, fwd_times=fwd_times,
+                          rev_weights=fwd_weights[base.rev_edges], rev_times=fwd_times[base.rev_edges])
+        np.savez(path, format_version=np.int32(FORMAT_VERSION), **arrays, **extra)
+
+    @classmethod
+    def load(cls, path, mmap=False):
+        """save() 로 저장한 파일을 읽는다. mmap=True 면 배열을 복사하지 않고 매핑한다."""
+        return cls.from_arrays(load_arrays(path, mmap))
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        if int(arrays["format_version"]) != FORMAT_VERSION:
+            raise ValueError(f"Unsupported graph format {int(arrays['format_version'])} "
+                             f"(expected {FORMAT_VERSION}); rebuild the graph file")
+        graph = cls(*(arrays[name] for name in cls.ARRAYS))
+        # index_arrays() 를 함께 저장했으면 색인을 다시 만들지 않는다.
+        if SpatialIndex.stored_in(arrays):
+            index = SpatialIndex.from_arrays(arrays)
+            if len(index.x) != graph.num_nodes:
+                raise ValueError("Stored spatial index does not match the graph; rebuild the graph file")
+            graph._spatial_index = index
+        if EdgeIndex.stored_in(arrays):
+            index = EdgeIndex.from_arrays(arrays, graph)
+            if len(index.sources) != graph.num_edges:
+                raise ValueError("Stored edge index does not match the graph; rebuild the graph file")
+            graph._edge_index = index
+        return graph
+
+    def index_arrays(self):
+        """최근접 노드/도로 구간 색인 배열. save() 의 extra 로 넘기면 load() 가 색인을 다시 만들지 않는다."""
+        return dict(self.spatial_index.to_arrays(), **self.edge_index.to_arrays())
+
+
+def load_arrays(path, mmap=False):
+    """save() 로 저장한 파일의 모든 배열 (함께 저장한 extra 배열 포함)."""
+    if mmap:
+        return _mmap_npz(path)
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def _mmap_npz(path):
+    """압축하지 않은 .npz 안의 배열들을 np.memmap 으로 연다."""
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            name = info.filename[:-len(".npy")]
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path} is compressed and cannot be memory-mapped")
+
+            # 로컬 파일 헤더(30바이트 + 파일명 + extra) 뒤에 .npy 데이터가 온다.
+            f.seek(info.header_offset)
+            header = f.read(30)
+            name_length, extra_length = struct.unpack("<HH", header[26:30])
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+            if shape == () or 0 in shape or dtype.hasobject:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+            else:
+                # memmap 하위 클래스는 슬라이스마다 부가 비용이 있어 일반 ndarray 뷰로 쓴다.
+                arrays[name] = np.memmap(
+                    path, dtype=dtype, mode="r", shape=shape, offset=f.tell(),
+                    order="F" if fortran_order else "C",
+                ).view(np.ndarray)
+    return arrays
@@ -0,0 +1,166 @@
+import argparse
+import os
+import threading
+
+import numpy as np
+
+from algorithms.speeds import DEFAULT_SPEED
+from algorithms.synthetic import CITY_KINDS, city_arrays
+from algorithms.tile_cache import DEFAULT_TILE_DIR, TileCache, graph_from_arrays
+
+# 도로 그래프 공급자는 bbox_arrays(north, south, east, west), load_bbox(...), describe() 를 가진다.
+# bbox_arrays 는 TileCache.bbox_arrays() 와 같은 형식 (범위 안의 노드와 그 노드끼리 잇는 엣지) 이다.
+ARRAY_NAMES = ("node_ids", "node_lat", "node_lon", "edge_u", "edge_v", "edge_key", "edge_length", "edge_speed")
+
+
+class ArrayGraphProvider:
+    """
+    도로망 전체를 배열로 메모리에 두고 요청한 bbox 만큼 잘라 주는 공급자.
+    배열은 처음 쓸 때 한 번 만들며 (_load), 엣지 양 끝의 노드 위치를 미리 구해 두어
+    자르는 데는 엣지 수에 비례하는 마스크 연산만 든다.
+    """
+
+    name = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._arrays = None
+
+    def _load(self):
+        raise NotImplementedError
+
+    def arrays(self):
+        with self._lock:
+            if self._arrays is None:
+                arrays = {name: np.asarray(value) for name, value in self._load().items()}
+                if "edge_speed" not in arrays:
+                    arrays["edge_speed"] = np.full(len(arrays["edge_u"]), DEFAULT_SPEED, dtype=np.float32)
+                order = np.argsort(arrays["node_ids"], kind="stable")
+                for name in ("node_ids", "node_lat", "node_lon"):
+                    arrays[name] = arrays[name][order]
+                arrays["u_index"] = np.searchsorted(arrays["node_ids"], arrays["edge_u"])
+                arrays["v_index"] = np.searchsorted(arrays["node_ids"], arrays["edge_v"])
+                self._arrays = arrays
+            return self._arrays
+
+    def bbox_arrays(self, north, south, east, west):
+        arrays = self.arrays()
+        lat, lon = arrays["node_lat"], arrays["node_lon"]
+        inside = (lat <= north) & (lat >= south) & (lon <= east) & (lon >= west)
+        edge_mask = inside[arrays["u_index"]] & inside[arrays["v_index"]]
+        result = {name: arrays[name][inside] for name in ARRAY_NAMES[:3]}
+        result.update((name, arrays[name][edge_mask]) for name in ARRAY_NAMES[3:])
+        return result
+
+    def load_bbox(self, north, south, east, west):
+        return graph_from_arrays(self.bbox_arrays(north, south, east, west))
+
+    def describe(self):
+        arrays = self.arrays()
+        lat, lon = arrays["node_lat"], arrays["node_lon"]
+        return {
+            "provider": self.name,
+            "nodes": len(arrays["node_ids"]),
+            "edges": len(arrays["edge_u"]),
+            "bbox": [float(lat.max()), float(lat.min()), float(lon.max()), float(lon.min())] if len(lat) else None,
+        }
+
+
+class FixtureGraphProvider(ArrayGraphProvider):
+    """record() 로 저장해 둔 도로망 배열(.npz) 을 다시 쓴다. 네트워크 없이 같은 그래프를 재현한다."""
+
+    name = "fixture"
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    def _load(self):
+        with np.load(self.path) as data:
+            missing = [name for name in ARRAY_NAMES[:-1] if name not in data]
+            if missing:
+                raise ValueError(f"{self.path} is not a graph fixture (missing {', '.join(missing)})")
+            return {name: data[name] for name in ARRAY_NAMES if name in data}
+
+    def describe(self):
+        return dict(super().describe(), path=self.path)
+
+
+class SyntheticGraphProvider(ArrayGraphProvider):
+    """synthetic.city_arrays() 로 만든 가상 도로망. 같은 옵션과 seed 면 항상 같은 그래프다."""
+
+    name = "synthetic"
+
+    def __init__(self, **options):
+        super().__init__()
+        self.options = options
+
+    def _load(self):
+        return city_arrays(**self.options)
+
+    def describe(self):
+        return dict(super().describe(), options=self.options)
+
+
+# 합성 도로망 옵션 이름과 타입
+SYNTHETIC_OPTIONS = {
+    "nodes": int, "seed": int, "spacing": float, "oneway": float, "missing": float, "lat": float, "lng": float,
+}
+SYNTHETIC_ALIASES = {"oneway": "oneway_ratio", "missing": "missing_ratio"}
+
+
+def make_provider(spec="osm"):
+    """
+    설정 문자열로 공급자를 만든다.
+    "osm": OSM 타일 캐시 (GRAPH_TILE_DIR, GRAPH_TILE_OFFLINE=1 이면 캐시된 타일만),
+    "fixture:<경로>": 저장해 둔 배열, "synthetic:<종류>[,이름=값...]": 가상 도로망
+    (종류 grid | radial | random, 이름은 SYNTHETIC_OPTIONS). 형식이 맞지 않으면 ValueError.
+    """
+    name, _, options = spec.partition(":")
+    if name == "osm":
+        return TileCache(
+            os.getenv("GRAPH_TILE_DIR", DEFAULT_TILE_DIR),
+            offline=os.getenv("GRAPH_TILE_OFFLINE") == "1",
+        )
+    if name == "fixture":
+        if not options:
+            raise ValueError("fixture provider needs a path (fixture:<path>)")
+        return FixtureGraphProvider(options)
+    if name == "synthetic":
+        kind, *pairs = options.split(",") if options else ["grid"]
+        settings = {"kind": kind or "grid"}
+        for pair in pairs:
+            key, _, value = pair.partition("=")
+            if key not in SYNTHETIC_OPTIONS:
+                raise ValueError(f"Unknown synthetic option: {key}")
+            settings[SYNTHETIC_ALIASES.get(key, key)] = SYNTHETIC_OPTIONS[key](float(value))
+        if settings["kind"] not in CITY_KINDS:
+            raise ValueError(f"Unknown city kind: {kind} (expected one of {', '.join(CITY_KINDS)})")
+        return SyntheticGraphProvider(**settings)
+    raise ValueError(f"Unknown graph provider: {spec}")
+
+
+def record(provider, path, north, south, east, west):
+    """provider 의 bbox 범위 배열을 fixture 로 저장한다. 저장한 (노드 수, 엣지 수)."""
+    arrays = provider.bbox_arrays(north, south, east, west)
+    np.savez_compressed(path, **arrays)
+    return len(arrays["node_ids"]), len(arrays["edge_u"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="도로 그래프 공급자의 bbox 범위를 fixture(.npz) 로 저장한다.")
+    parser.add_argument("output", help="저장할 .npz 경로")
+    parser.add_argument("north", type=float)
+    parser.add_argument("south", type=float)
+    parser.add_argument("east", type=float)
+    parser.add_argument("west", type=float)
+    parser.add_argument("--provider", default=os.getenv("GRAPH_PROVIDER", "osm"),
+                        help='공급자 설정 (예: "osm", "synthetic:radial,nodes=100000")')
+    args = parser.parse_args()
+
+    nodes, edges = record(make_provider(args.provider), args.output, args.north, args.south, args.east, args.west)
+    print(f"Recorded {nodes} nodes and {edges} edges into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import math
+
+import numpy as np
+
+ROAD_EARTH_RADIUS = 6371009  # osmnx 가 도로 길이를 잴 때 쓰는 지구 반경 (m)
+EARTH_RADIUS = 6371000  # osmnx 의 도로 길이(ROAD_EARTH_RADIUS 기준)보다 작게 잡아 하한을 유지
+METERS_PER_DEGREE = EARTH_RADIUS * math.pi / 180  # 위도 1도의 길이 (m)
+LATITUDE_MARGIN = 0.01  # 대원 경로가 극 쪽으로 휘는 만큼의 여유 (도)
+VECTORIZED_MAX_NODES = 20000  # 이 이하의 그래프는 하한을 모든 노드에 대해 한 번에 numpy 로 계산
+
+
+class NodeBounds(dict):
+    """
+    노드 -> 하한. 처음 조회할 때 bound(node) 로 계산해 기억한다.
+    큰 그래프에서 짧은 경로는 탐색이 닿는 노드가 전체의 일부뿐이라, 모든 노드의 하한 배열을
+    질의마다 만드는 것보다 닿는 노드만 계산하는 편이 훨씬 빠르다.
+    """
+
+    def __init__(self, bound):
+        super().__init__()
+        self.bound = bound
+
+    def __missing__(self, node):
+        value = self[node] = self.bound(node)
+        return value
+
+
+def _scales(graph, lat):
+    """
+    등장방형 거리의 (위도 1도, 경도 1도) 길이 (m). 경도는 그래프와 lat 중 가장 고위도인 지점의
+    cos 로 줄여 대원 거리보다 항상 작거나 같게 한다.
+    """
+    north, south, _, _ = graph.bounds if graph.num_nodes else (0.0, 0.0, 0.0, 0.0)
+    max_lat = max(abs(north), abs(south), abs(lat))
+    return METERS_PER_DEGREE, METERS_PER_DEGREE * math.cos(math.radians(min(max_lat + LATITUDE_MARGIN, 90.0)))
+
+
+def straight_line_bounds(graph, lat, lon):
+    """
+    모든 노드에서 (lat, lon) 까지의 직선거리 하한 배열 (m).
+    위도 차는 그대로, 경도 차는 그래프에서 가장 고위도인 지점의 cos 로 줄인 등장방형 거리로,
+    삼각함수 없이 계산되고 대원 거리보다 항상 작거나 같다.
+    도로 길이의 하한이자 삼각 부등식을 만족하므로 A* 에서 일관된(consistent) 휴리스틱이다.
+    """
+    ky, kx = _scales(graph, lat)
+    dy = (np.asarray(graph.lat) - lat) * ky
+    dx = (np.asarray(graph.lon) - lon) * kx
+    return np.sqrt(dx * dx + dy * dy)
+
+
+def straight_line(graph, seeds, reverse=False):
+    """
+    A* 휴리스틱: 노드 -> seeds (노드, 남은 비용) 까지의 직선거리 하한.
+    seed 마다 직선거리 + 남은 비용 중 가장 작은 값이며, 직선거리는 대칭이라 reverse 와 무관하다.
+    노드가 VECTORIZED_MAX_NODES 이하면 모든 노드의 하한 배열을, 그보다 크면 탐색이 닿는 노드만
+    계산하는 NodeBounds 를 돌려준다.
+    """
+    seeds = [(*graph.position(node), offset) for node, offset in seeds]
+    if graph.num_nodes <= VECTORIZED_MAX_NODES:
+        bounds = np.full(graph.num_nodes, np.inf)
+        for lat, lon, offset in seeds:
+            np.minimum(bounds, straight_line_bounds(graph, lat, lon) + offset, out=bounds)
+        return bounds
+
+    # 모든 seed 에 같은 비율을 써야 삼각 부등식이 유지된다.
+    ky, kx = _scales(graph, max((abs(lat) for lat, _, _ in seeds), default=0.0))
+    lats, lons = graph.lat, graph.lon
+
+    def bound(node):
+        y, x = float(lats[node]), float(lons[node])
+        best = math.inf
+        for lat, lon, offset in seeds:
+            dy, dx = (y - lat) * ky, (x - lon) * kx
+            best = min(best, math.sqrt(dx * dx + dy * dy) + offset)
+        return best
+    return NodeBounds(bound)
+
+
+def travel_time(heuristic=straight_line):
+    """
+    이동 시간(weighted("time") 그래프)용 휴리스틱: 거리 하한 heuristic 을 그래프의 최고 속도
+    graph.max_speed 로 나눈 값. 어떤 경로도 이보다 빨리 갈 수 없으므로 허용 가능하고,
+    거리 하한이 일관되면 이것도 일관된다. seeds 의 남은 비용은 이미 시간이므로 나눈 뒤에 더한다.
+    """
+    def bound(graph, seeds, reverse=False):
+        speed = graph.max_speed
+        lowers = [(heuristic(graph, [(node, 0.0)], reverse), offset) for node, offset in seeds]
+        if all(isinstance(lower, np.ndarray) for lower, _ in lowers):
+            bounds = np.full(graph.num_nodes, np.inf)
+            for lower, offset in lowers:
+                np.minimum(bounds, lower / speed + offset, out=bounds)
+            return bounds
+        return NodeBounds(lambda node: min((lower[node] / speed + offset for lower, offset in lowers),
+                                           default=math.inf))
+    return bound
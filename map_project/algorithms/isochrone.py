@@ -0,0 +1,153 @@
+import math
+from collections import defaultdict
+
+import numpy as np
+
+from algorithms.heuristics import METERS_PER_DEGREE
+from algorithms.path_finder import PhantomNode, _source_seeds, shortest_path_tree
+
+DEFAULT_CELL_SIZE = 100.0  # 격자 칸 한 변 (m)
+MAX_CELLS = 1_000_000  # 한 예산의 격자 칸 수 상한 (넘으면 칸을 키운다)
+
+
+def reached_points(graph, costs, budget, spacing):
+    """
+    비용 budget 안에 닿는 노드와 도로 위 지점의 (lat, lon) 배열.
+    닿은 노드에서 나가는 엣지는 남은 예산만큼의 비율까지 (곧은 선으로 보고) spacing(m) 간격으로 점을 찍는다.
+    """
+    nodes = np.fromiter((node for node, cost in costs.items() if cost <= budget), dtype=np.int64)
+    node_costs = np.fromiter((costs[node] for node in nodes.tolist()), dtype=np.float64, count=len(nodes))
+    starts, ends = graph.fwd_offsets[nodes], graph.fwd_offsets[nodes + 1]
+    counts = (ends - starts).astype(np.int64)
+    edges = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    sources, targets = np.repeat(nodes, counts), graph.fwd_targets[edges]
+    weights = graph.fwd_weights[edges].astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        reach = np.clip((budget - np.repeat(node_costs, counts)) / weights, 0.0, 1.0)
+    reach[~np.isfinite(reach)] = 0.0  # 길이 0 또는 통행 금지 엣지
+
+    dy = (graph.lat[targets] - graph.lat[sources]) * METERS_PER_DEGREE
+    dx = (graph.lon[targets] - graph.lon[sources]) * METERS_PER_DEGREE * np.cos(np.radians(graph.lat[sources]))
+    steps = np.ceil(np.hypot(dx, dy) * reach / spacing).astype(np.int64)  # 엣지마다 찍을 점 수 (노드 제외)
+    edge_of = np.repeat(np.arange(len(edges)), steps)
+    first = np.cumsum(steps) - steps
+    t = (np.arange(steps.sum()) - first[edge_of] + 1) / steps[edge_of] * reach[edge_of]
+    u, v = sources[edge_of], targets[edge_of]
+    lat = graph.lat[u] + (graph.lat[v] - graph.lat[u]) * t
+    lon = graph.lon[u] + (graph.lon[v] - graph.lon[u]) * t
+    return np.concatenate([graph.lat[nodes], lat]), np.concatenate([graph.lon[nodes], lon])
+
+
+def _close(grid):
+    """닫힘 연산 (3x3 팽창 뒤 침식): 칸 하나 크기의 틈을 메운다."""
+    def dilate(mask):
+        padded = np.pad(mask, 1)
+        out = np.zeros_like(mask)
+        for dy in range(3):
+            for dx in range(3):
+                out |= padded[dy:dy + mask.shape[0], dx:dx + mask.shape[1]]
+        return out
+
+    return ~dilate(~dilate(grid))
+
+
+def _rings(grid):
+    """
+    채운 칸들의 경계를 (행, 열) 모서리 좌표의 닫힌 고리 목록으로. 바깥 고리는 반시계,
+    구멍은 시계 방향이며 (칸이 항상 진행 방향 왼쪽), 직선 구간의 중간 모서리는 뺀다.
+    """
+    padded = np.pad(grid, 1)
+    filled = padded[1:-1, 1:-1]
+    rows, cols = np.nonzero(filled & ~padded[:-2, 1:-1])  # 아래쪽 경계 (동쪽으로)
+    edges = [((r, c), (r, c + 1)) for r, c in zip(rows.tolist(), cols.tolist())]
+    rows, cols = np.nonzero(filled & ~padded[1:-1, 2:])  # 오른쪽 경계 (북쪽으로)
+    edges += [((r, c + 1), (r + 1, c + 1)) for r, c in zip(rows.tolist(), cols.tolist())]
+    rows, cols = np.nonzero(filled & ~padded[2:, 1:-1])  # 위쪽 경계 (서쪽으로)
+    edges += [((r + 1, c + 1), (r + 1, c)) for r, c in zip(rows.tolist(), cols.tolist())]
+    rows, cols = np.nonzero(filled & ~padded[1:-1, :-2])  # 왼쪽 경계 (남쪽으로)
+    edges += [((r + 1, c), (r, c)) for r, c in zip(rows.tolist(), cols.tolist())]
+
+    outgoing = defaultdict(list)
+    for start, end in edges:
+        outgoing[start].append(end)
+    rings = []
+    while outgoing:
+        first = next(iter(outgoing))
+        ring = [first]
+        current = first
+        while True:
+            targets = outgoing[current]
+            following = targets.pop()
+            if not targets:
+                del outgoing[current]
+            if following == first:
+                break
+            ring.append(following)
+            current = following
+        # 방향이 바뀌는 모서리만 남긴다.
+        corners = [
+            point for i, point in enumerate(ring)
+            if (point[0] - ring[i - 1][0], point[1] - ring[i - 1][1])
+            != (ring[(i + 1) % len(ring)][0] - point[0], ring[(i + 1) % len(ring)][1] - point[1])
+        ]
+        rings.append(corners)
+    return rings
+
+
+def grid_polygon(lat, lon, cell_size=DEFAULT_CELL_SIZE):
+    """
+    점들이 들어 있는 cell_size(m) 격자 칸을 닫힘 연산으로 메운 영역의 경계 고리 목록.
+    고리는 {"lat", "lng"} 목록이며, 반시계 방향은 바깥 경계, 시계 방향은 구멍이다.
+    격자는 점들의 범위만큼만 만들므로 크기가 닿은 영역에 비례한다.
+    """
+    if not len(lat):
+        return []
+    south, west = float(lat.min()), float(lon.min())
+    cell_lat = cell_size / METERS_PER_DEGREE
+    cell_lon = cell_lat / max(math.cos(math.radians(float(np.abs(lat).max()))), 1e-6)
+    rows = ((lat - south) / cell_lat).astype(np.int64)
+    cols = ((lon - west) / cell_lon).astype(np.int64)
+    height, width = int(rows.max()) + 1, int(cols.max()) + 1
+    if height * width > MAX_CELLS:
+        return grid_polygon(lat, lon, cell_size * math.sqrt(height * width / MAX_CELLS))
+
+    grid = np.zeros((height + 2, width + 2), dtype=bool)  # 닫힘 연산이 가장자리에서 잘리지 않도록 여백
+    grid[rows + 1, cols + 1] = True
+    grid = _close(grid)
+    south -= cell_lat
+    west -= cell_lon
+    return [
+        [{"lat": south + row * cell_lat, "lng": west + col * cell_lon} for row, col in ring]
+        for ring in _rings(grid)
+    ]
+
+
+def reached_costs(origin, graph, budget):
+    """origin(노드 인덱스 또는 PhantomNode) 에서 비용 budget 까지만 확정하는 Dijkstra 의 노드 -> 비용."""
+    costs, _ = shortest_path_tree(graph, _source_seeds(origin, graph), max_cost=budget)
+    return costs
+
+
+def isochrones(origin, graph, budgets, cell_size=DEFAULT_CELL_SIZE, stats=None, costs=None):
+    """
+    origin(노드 인덱스 또는 PhantomNode) 에서 비용 budgets 안에 닿는 영역들.
+    가장 큰 예산까지만 확정하는 Dijkstra 를 한 번 돌려 모든 예산에 같이 쓰므로, 시간은
+    그래프 전체가 아니라 닿은 영역의 크기에 비례한다. 이미 구한 reached_costs(가장 큰 예산 이상)
+    를 costs 로 주면 다시 탐색하지 않는다. budgets 순서대로
+    {"budget", "nodes"(닿은 노드 수), "polygons"(grid_polygon 고리 목록)} 목록을 반환한다.
+    """
+    if costs is None:
+        costs = reached_costs(origin, graph, max(budgets))
+    if stats is not None:
+        stats["settled"] = len(costs)
+    results = []
+    for budget in budgets:
+        lat, lon = reached_points(graph, costs, budget, cell_size / 2)
+        if isinstance(origin, PhantomNode):
+            lat, lon = np.append(lat, origin.lat), np.append(lon, origin.lon)
+        results.append({
+            "budget": budget,
+            "nodes": sum(1 for cost in costs.values() if cost <= budget),
+            "polygons": grid_polygon(lat, lon, cell_size),
+        })
+    return results
@@ -0,0 +1,197 @@
+import argparse
+import math
+import time
+from functools import partial
+
+import numpy as np
+
+from algorithms import heuristics
+from algorithms.graph import RoadGraph, load_arrays
+from algorithms.heuristics import NodeBounds
+from algorithms.path_finder import shortest_path_tree
+
+DEFAULT_LANDMARKS = 16
+SELECTION_METHODS = ("farthest", "avoid")
+ALT_ARRAYS = ("alt_landmarks", "alt_forward", "alt_backward")
+
+
+def _distance_array(graph, source, reverse=False):
+    """source 에서 모든 노드까지(reverse=True 면 모든 노드에서 source 까지)의 거리. 닿지 않으면 inf."""
+    costs, _ = shortest_path_tree(graph, [(source, 0.0)], reverse)
+    distances = np.full(graph.num_nodes, np.inf)
+    distances[list(costs)] = list(costs.values())
+    return distances
+
+
+def _farthest(graph, forward, rng):
+    """이미 고른 랜드마크들에서 가장 먼 노드. 처음에는 임의의 노드에서 가장 먼 노드."""
+    if forward:
+        distances = np.min(forward, axis=0)
+    else:
+        distances = _distance_array(graph, int(rng.integers(graph.num_nodes)))
+    return int(np.argmax(np.where(np.isfinite(distances), distances, -1.0)))
+
+
+def _avoid(graph, landmarks, rng):
+    """
+    avoid 선택 (Goldberg & Harrelson): 임의의 루트에서 최단 경로 트리를 만들고,
+    현재 랜드마크 하한이 실제 거리보다 많이 모자란 노드(가중치 = 거리 - 하한)가 몰린,
+    그리고 이미 랜드마크를 포함하지 않은 서브트리를 따라 잎까지 내려간다.
+    """
+    root = int(rng.integers(graph.num_nodes))
+    costs, came_from = shortest_path_tree(graph, [(root, 0.0)])
+    nodes = list(costs)  # 거리 순으로 확정된 순서
+    distances = np.array([costs[node] for node in nodes])
+    if landmarks is not None:
+        weights = distances - landmarks.bounds_from(root)[nodes]
+    else:
+        weights = distances
+
+    size = dict(zip(nodes, weights.tolist()))
+    has_landmark = dict.fromkeys(nodes, False)
+    if landmarks is not None:
+        for landmark in landmarks.landmarks.tolist():
+            if landmark in has_landmark:
+                has_landmark[landmark] = True
+    # 잎에서 루트 쪽으로 서브트리 합을 모은다.
+    for node in reversed(nodes):
+        parent = came_from[node]
+        if parent is not None:
+            size[parent] += size[node]
+            has_landmark[parent] = has_landmark[parent] or has_landmark[node]
+
+    best_child = {}
+    for node in nodes:
+        parent = came_from[node]
+        if parent is None or has_landmark[node]:
+            continue
+        if parent not in best_child or size[node] > size[best_child[parent]]:
+            best_child[parent] = node
+
+    node = root
+    while node in best_child:
+        node = best_child[node]
+    return node
+
+
+class Landmarks:
+    """
+    ALT (A*, Landmarks, Triangle inequality) 휴리스틱.
+    forward[k, v] = d(L_k, v), backward[k, v] = d(v, L_k) 이고, 삼각 부등식에서
+        d(v, t) >= max(d(L, t) - d(L, v), d(v, L) - d(t, L))
+    를 얻는다. 인스턴스는 straight_line 과 같은 heuristic(graph, seeds, reverse) 함수로 쓴다.
+    """
+
+    def __init__(self, landmarks, forward, backward):
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+
+    @classmethod
+    def build(cls, graph, count=DEFAULT_LANDMARKS, method="avoid", seed=0, verbose=False):
+        """랜드마크 count 개를 고르고 각각에서의 정방향/역방향 거리 배열을 계산한다."""
+        if method not in SELECTION_METHODS:
+            raise ValueError(f"Unknown landmark selection method: {method}")
+        rng = np.random.default_rng(seed)
+        chosen, forward, backward = [], [], []
+        landmarks = None
+
+        began = time.perf_counter()
+        for _ in range(count * 4):
+            if len(chosen) == min(count, graph.num_nodes):
+                break
+            if method == "farthest":
+                node = _farthest(graph, forward, rng)
+            else:
+                node = _avoid(graph, landmarks, rng)
+            if node in chosen:
+                continue  # 이미 고른 노드에 닿으면 다른 루트로 다시 시도
+            chosen.append(node)
+            forward.append(_distance_array(graph, node))
+            backward.append(_distance_array(graph, node, reverse=True))
+            landmarks = cls(np.array(chosen, dtype=np.int32), np.array(forward), np.array(backward))
+            if verbose:
+                print(f"landmark {len(chosen)}/{count}: node {node} ({time.perf_counter() - began:.1f}s)")
+        return landmarks
+
+    def bounds_from(self, source):
+        """모든 노드 v 에 대해 d(source, v) 의 하한 배열."""
+        return self.bound_array([(source, 0.0)], reverse=True)
+
+    def __call__(self, graph, seeds, reverse=False):
+        """
+        heuristic 함수 인터페이스 (graph 는 straight_line 과 맞추기 위한 인자로, 이 랜드마크를
+        만든 그래프여야 한다). reverse=False 면 노드에서 seeds 까지, reverse=True 면 seeds 에서
+        노드까지의 거리 하한이다. 노드가 VECTORIZED_MAX_NODES 이하면 bound_array 를, 그보다 크면
+        탐색이 닿는 노드만 계산하는 NodeBounds 를 돌려준다.
+        """
+        if self.forward.shape[1] <= heuristics.VECTORIZED_MAX_NODES:
+            return self.bound_array(seeds, reverse)
+        seeds = [(self.forward[:, node].tolist(), self.backward[:, node].tolist(), offset) for node, offset in seeds]
+        return NodeBounds(partial(self._node_bound, seeds, -1.0 if reverse else 1.0))
+
+    def bound_array(self, seeds, reverse=False):
+        """모든 노드에 대한 __call__ 의 하한 배열. 둘 다 닿지 않는 랜드마크(inf - inf)는 무시한다."""
+        bounds = np.full(len(self.forward[0]), np.inf)
+        with np.errstate(invalid="ignore"):
+            for node, offset in seeds:
+                to_node = self.forward[:, node, None]  # d(L, node)
+                from_node = self.backward[:, node, None]  # d(node, L)
+                if reverse:
+                    lower = np.fmax(self.forward - to_node, from_node - self.backward)
+                else:
+                    lower = np.fmax(to_node - self.forward, self.backward - from_node)
+                lower = np.fmax(np.fmax.reduce(lower, axis=0), 0.0)
+                np.minimum(bounds, lower + offset, out=bounds)
+        return bounds
+
+    def _node_bound(self, seeds, sign, node):
+        """
+        bound_array 의 한 노드 값. seeds 는 (d(L, seed) 목록, d(seed, L) 목록, 남은 비용) 이고,
+        sign 이 -1 이면 reverse 다. nan(inf - inf) 은 비교에서 거짓이라 저절로 무시된다.
+        """
+        to_node = self.forward[:, node].tolist()
+        from_node = self.backward[:, node].tolist()
+        best = math.inf
+        for to_seed, from_seed, offset in seeds:
+            lower = 0.0
+            for a, b, c, d in zip(to_seed, to_node, from_node, from_seed):
+                lower = max(lower, sign * (a - b), sign * (c - d))
+            best = min(best, lower + offset)
+        return best
+
+    def to_arrays(self):
+        return dict(zip(ALT_ARRAYS, (self.landmarks, self.forward, self.backward)))
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """load_arrays() 결과에 랜드마크 배열이 있으면 Landmarks, 없으면 None."""
+        if not all(name in arrays for name in ALT_ARRAYS):
+            return None
+        return cls(*(arrays[name] for name in ALT_ARRAYS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 그래프에 ALT 랜드마크 거리표를 추가한다.")
+    parser.add_argument("graph", help="RoadGraph.save() 로 저장한 .npz (CH 배열 등 다른 배열은 그대로 둔다)")
+    parser.add_argument("--output", help="저장할 경로 (기본: graph 를 덮어씀)")
+    parser.add_argument("--count", type=int, default=DEFAULT_LANDMARKS)
+    parser.add_argument("--method", choices=SELECTION_METHODS, default="avoid")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    arrays = load_arrays(args.graph)
+    graph = RoadGraph.from_arrays(arrays)
+    began = time.perf_counter()
+    landmarks = Landmarks.build(graph, args.count, args.method, args.seed, verbose=True)
+    print(f"Built {len(landmarks.landmarks)} landmarks for {graph.num_nodes} nodes "
+          f"in {time.perf_counter() - began:.1f}s")
+
+    extra = {name: value for name, value in arrays.items()
+             if name not in RoadGraph.ARRAYS and name != "format_version"}
+    extra.update(landmarks.to_arrays())
+    graph.save(args.output or args.graph, **extra)
+
+
+if __name__ == "__main__":
+    main()
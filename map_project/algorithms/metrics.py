@@ -0,0 +1,155 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# 지연 히스토그램 버킷 상한 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# 탐색 stats 에서 모으는 카운터: 확정한 노드, 완화한 엣지, 우선순위 큐에 넣은 항목
+SEARCH_COUNTERS = {
+    "settled": "Nodes settled by route searches.",
+    "relaxed": "Edges relaxed by route searches.",
+    "pushed": "Priority queue pushes by route searches.",
+}
+
+_current = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """한 요청의 단계별 소요 시간과 탐색 카운터. 같은 단계를 여러 번 거치면 (코리도 재시도 등) 더한다."""
+
+    def __init__(self):
+        self.began = time.perf_counter()
+        self.stages = {}  # 단계 -> [누적 초, 횟수]
+        self.counters = dict.fromkeys(SEARCH_COUNTERS, 0)
+
+    def add(self, stage, seconds):
+        entry = self.stages.setdefault(stage, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def count_search(self, stats):
+        for name in SEARCH_COUNTERS:
+            self.counters[name] += stats.get(name, 0)
+
+    def to_dict(self):
+        """{"totalMs", "stages": {단계: {"ms", "calls"}}, "search": 카운터} (응답 본문과 작업 결과에 싣는 형식)."""
+        return {
+            "totalMs": round((time.perf_counter() - self.began) * 1000, 3),
+            "stages": {
+                stage: {"ms": round(seconds * 1000, 3), "calls": calls}
+                for stage, (seconds, calls) in self.stages.items()
+            },
+            "search": dict(self.counters),
+        }
+
+
+@contextmanager
+def request_timings():
+    """이 블록 안에서 (같은 스레드/컨텍스트로) 부르는 timed, count_search 를 모으는 RequestTimings."""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed(stage):
+    """블록의 소요 시간을 지금 요청의 stage 에 더한다. 요청 밖이면 아무것도 하지 않는다."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    began = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(stage, time.perf_counter() - began)
+
+
+def count_search(stats):
+    """탐색 stats 의 카운터를 지금 요청에 더한다."""
+    timings = _current.get()
+    if timings is not None:
+        timings.count_search(stats)
+
+
+def _labels(labels):
+    return ",".join(f'{name}="{value}"' for name, value in labels)
+
+
+class Metrics:
+    """
+    요청 종류별 요청 수와 지연, 단계별 지연 히스토그램, 탐색 카운터 누적값.
+    작업 프로세스에서 처리한 요청도 결과와 함께 돌아온 RequestTimings.to_dict() 로 이 프로세스에서 센다.
+    render() 는 Prometheus 텍스트 형식이다.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._requests = {}  # (kind, status) -> 수
+        self._histograms = {}  # (이름, 레이블) -> [버킷별 수..., 합, 수]
+        self._counters = {}  # (이름, 레이블) -> 값
+
+    def _observe(self, name, labels, seconds):
+        histogram = self._histograms.setdefault((name, labels), [0] * len(self.buckets) + [0.0, 0])
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                histogram[i] += 1
+        histogram[-2] += seconds
+        histogram[-1] += 1
+
+    def observe_request(self, kind, status, timing):
+        """kind 요청 하나의 결과. timing 은 RequestTimings.to_dict() (없으면 요청 수만 센다)."""
+        with self._lock:
+            key = (kind, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if timing is None:
+                return
+            self._observe("route_request_duration_seconds", (("kind", kind),), timing["totalMs"] / 1000)
+            for stage, entry in timing["stages"].items():
+                self._observe("route_stage_duration_seconds", (("kind", kind), ("stage", stage)), entry["ms"] / 1000)
+            for name, value in timing["search"].items():
+                counter = (f"route_search_{name}_total", (("kind", kind),))
+                self._counters[counter] = self._counters.get(counter, 0) + value
+
+    def observe_stage(self, kind, stage, seconds):
+        """요청을 처리한 뒤의 단계 (응답 직렬화 등)."""
+        with self._lock:
+            self._observe("route_stage_duration_seconds", (("kind", kind), ("stage", stage)), seconds)
+
+    def render(self):
+        with self._lock:
+            lines = [
+                "# HELP route_requests_total Route requests by kind and HTTP status.",
+                "# TYPE route_requests_total counter",
+            ]
+            lines += [
+                f"route_requests_total{{{_labels((('kind', kind), ('status', status)))}}} {count}"
+                for (kind, status), count in sorted(self._requests.items())
+            ]
+            helps = {
+                "route_request_duration_seconds": "Time to handle a route request, excluding serialization.",
+                "route_stage_duration_seconds": "Time spent in each stage of a route request.",
+            }
+            for name, text in helps.items():
+                lines += [f"# HELP {name} {text}", f"# TYPE {name} histogram"]
+                for (metric, labels), histogram in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    for bound, count in zip(self.buckets, histogram):
+                        lines.append(f'{name}_bucket{{{_labels(labels + (("le", f"{bound:g}"),))}}} {count}')
+                    lines.append(f'{name}_bucket{{{_labels(labels + (("le", "+Inf"),))}}} {histogram[-1]}')
+                    lines.append(f"{name}_sum{{{_labels(labels)}}} {histogram[-2]:.6f}")
+                    lines.append(f"{name}_count{{{_labels(labels)}}} {histogram[-1]}")
+            for name, text in SEARCH_COUNTERS.items():
+                metric = f"route_search_{name}_total"
+                lines += [f"# HELP {metric} {text}", f"# TYPE {metric} counter"]
+                lines += [
+                    f"{metric}{{{_labels(labels)}}} {value}"
+                    for (counter, labels), value in sorted(self._counters.items()) if counter == metric
+                ]
+            return "\n".join(lines) + "\n"
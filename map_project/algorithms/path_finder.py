@@ -1,6 +1,24 @@
-import osmnx as ox
 import heapq
 import math
+import time
+from collections import defaultdict, namedtuple
+
+import numpy as np
+
+from algorithms.graph import RoadGraph
+from algorithms.heuristics import NodeBounds, straight_line
+from algorithms.metrics import timed
+from algorithms.speeds import edge_speed
+
+# 도로 구간(u -> v 엣지, 위치 edge) 위 비율 ratio 지점에 놓인 임시 노드.
+# 탐색은 이 노드에서 엣지 양 끝으로 나가는(또는 양 끝에서 들어오는) 비용으로 시작한다.
+PhantomNode = namedtuple("PhantomNode", ["u", "v", "edge", "ratio", "lat", "lon"])
+
+# meeting_point 의 기준: 가장 멀리 가는 사람의 거리 | 모든 사람의 거리 합
+MEETING_OBJECTIVES = ("minmax", "minsum")
+
+# stream_search 가 탐색 과정을 한 번에 넘기는 기록 행 수
+STREAM_BATCH_SIZE = 500
 
 def haversine(lat1, lon1, lat2, lon2):
     """두 지점 간의 대원 거리 계산 (단위: m)."""
@@ -12,79 +30,372 @@ def haversine(lat1, lon1, lat2, lon2):
     return 2 * R * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
 def prepare_graph(graph):
-    """그래프 데이터를 노드와 엣지로 변환."""
-    nodes, edges = ox.graph_to_gdfs(graph)
-    node_positions = {node: (data["y"], data["x"]) for node, data in graph.nodes(data=True)}
-    adjacency_list = {}
-
-    for u, v, data in graph.edges(data=True):
-        distance = data.get("length", 1)
-        if u not in adjacency_list:
-            adjacency_list[u] = []
-        adjacency_list[u].append((v, distance))
-
-    return node_positions, adjacency_list
-
-def get_closest_node(lat, lon, node_positions):
-    """주어진 좌표에서 가장 가까운 노드를 찾는다."""
-    closest_node = None
-    closest_distance = float("inf")
-
-    for node, (n_lat, n_lon) in node_positions.items():
-        distance = haversine(lat, lon, n_lat, n_lon)
-        if distance < closest_distance:
-            closest_node = node
-            closest_distance = distance
-
-    return closest_node
-
-def a_star_search(start, goal, node_positions, adjacency_list):
-    """A* 알고리즘으로 최단 경로 탐색."""
-    frontier = [(0, start)]
-    came_from = {start: None}
-    cost_so_far = {start: 0}
-    explored_nodes = []
+    """도로 그래프를 배열 기반(CSR) RoadGraph 로 변환. 엣지 이동 시간도 이때 한 번 계산한다."""
+    with timed("prepare_graph"):
+        return _prepare_graph(graph)
+
+def _prepare_graph(graph):
+    node_ids, lat, lon = [], [], []
+    for node, data in graph.nodes(data=True):
+        node_ids.append(node)
+        lat.append(data["y"])
+        lon.append(data["x"])
+
+    edge_u, edge_v, edge_key, edge_length, speeds = [], [], [], [], []
+    for u, v, key, data in graph.edges(keys=True, data=True):
+        edge_u.append(u)
+        edge_v.append(v)
+        edge_key.append(key)
+        edge_length.append(data.get("length", 1))
+        # 타일 캐시 그래프는 speed_kph 를, OSM 에서 바로 받은 그래프는 maxspeed/highway 태그를 쓴다.
+        speeds.append(data["speed_kph"] if "speed_kph" in data else edge_speed(data))
+
+    return RoadGraph.from_edges(node_ids, lat, lon, edge_u, edge_v, edge_key, edge_length, speeds)
+
+def get_closest_node(lat, lon, graph):
+    """주어진 좌표에서 가장 가까운 노드의 인덱스를 찾는다."""
+    with timed("snap"):
+        return graph.spatial_index.nearest(lat, lon)
+
+def snap_many(lats, lons, graph):
+    """여러 좌표를 한 번에 가장 가까운 노드 인덱스 배열로 변환."""
+    with timed("snap"):
+        return graph.spatial_index.snap_many(lats, lons)
+
+def snap_to_edge(lat, lon, graph):
+    """주어진 좌표를 가장 가까운 도로 구간에 투영한 PhantomNode 를 만든다 (처음 쓰는 그래프면 색인도 만든다)."""
+    with timed("snap"):
+        edge, ratio, _ = graph.edge_index.nearest(lat, lon)
+    if edge < 0:
+        raise ValueError("Graph has no edges to snap to")
+    u, v = int(graph.edge_index.sources[edge]), int(graph.fwd_targets[edge])
+    return PhantomNode(
+        u, v, edge, ratio,
+        float(graph.lat[u] + (graph.lat[v] - graph.lat[u]) * ratio),
+        float(graph.lon[u] + (graph.lon[v] - graph.lon[u]) * ratio),
+    )
+
+def path_to_coords(path, graph, start=None, goal=None):
+    """노드 인덱스 경로를 {"lat", "lng"} 좌표 목록으로 변환. PhantomNode 끝점은 그 위치를 붙인다."""
+    coords = [{"lat": float(graph.lat[node]), "lng": float(graph.lon[node])} for node in path]
+    if isinstance(start, PhantomNode):
+        coords.insert(0, {"lat": start.lat, "lng": start.lon})
+    if isinstance(goal, PhantomNode):
+        coords.append({"lat": goal.lat, "lng": goal.lon})
+    return coords
+
+def _source_seeds(endpoint, graph):
+    """출발점에서 나가는 (노드, 초기 비용) 목록."""
+    if not isinstance(endpoint, PhantomNode):
+        return [(endpoint, 0.0)]
+    seeds = [(endpoint.v, (1 - endpoint.ratio) * float(graph.fwd_weights[endpoint.edge]))]
+    reverse = graph.find_edge(endpoint.v, endpoint.u)
+    if reverse is not None:
+        seeds.append((endpoint.u, endpoint.ratio * reverse[1]))
+    return seeds
+
+def _target_seeds(endpoint, graph):
+    """도착점으로 들어가는 (노드, 남은 비용) 목록."""
+    if not isinstance(endpoint, PhantomNode):
+        return [(endpoint, 0.0)]
+    seeds = [(endpoint.u, endpoint.ratio * float(graph.fwd_weights[endpoint.edge]))]
+    reverse = graph.find_edge(endpoint.v, endpoint.u)
+    if reverse is not None:
+        seeds.append((endpoint.v, (1 - endpoint.ratio) * reverse[1]))
+    return seeds
+
+def _direct_cost(start, goal, graph):
+    """출발점과 도착점이 같은 도로 구간 위에 있을 때 그 구간만 따라가는 비용."""
+    if not (isinstance(start, PhantomNode) and isinstance(goal, PhantomNode)):
+        return float("inf")
+    if (goal.u, goal.v) == (start.u, start.v):
+        goal_ratio = goal.ratio
+    elif (goal.u, goal.v) == (start.v, start.u):
+        goal_ratio = 1 - goal.ratio
+    else:
+        return float("inf")
+
+    if goal_ratio >= start.ratio:
+        edge = graph.find_edge(start.u, start.v)
+    else:
+        edge = graph.find_edge(start.v, start.u)
+    if edge is None:
+        return float("inf")
+    return abs(goal_ratio - start.ratio) * edge[1]
+
+def path_cost(path, start, goal, graph):
+    """탐색이 반환한 경로(PhantomNode 끝점 포함)의 graph 가중치 기준 비용. 끊긴 구간이 있으면 inf."""
+    if not path:
+        return _direct_cost(start, goal, graph)
+    cost = dict(_source_seeds(start, graph)).get(path[0], float("inf"))
+    cost += dict(_target_seeds(goal, graph)).get(path[-1], float("inf"))
+    for u, v in zip(path, path[1:]):
+        edge = graph.find_edge(u, v)
+        cost += edge[1] if edge is not None else float("inf")
+    return cost
+
+def _out_degree_sum(graph, nodes):
+    """확정된 노드들에서 나가는 엣지 수 (= 완화한 엣지 수)."""
+    nodes = np.fromiter(nodes, dtype=np.int64, count=len(nodes))
+    return int((graph.fwd_offsets[nodes + 1] - graph.fwd_offsets[nodes]).sum())
+
+def _in_degree_sum(graph, nodes):
+    nodes = np.fromiter(nodes, dtype=np.int64, count=len(nodes))
+    return int((graph.rev_offsets[nodes + 1] - graph.rev_offsets[nodes]).sum())
+
+def shortest_path_tree(graph, sources, reverse=False, max_cost=float("inf"), targets=None, deadline=None):
+    """
+    sources 의 (노드, 초기 비용) 에서 닿는 모든 노드까지의 최단 거리 (one-to-many Dijkstra).
+    reverse=True 면 들어오는 엣지를 따라 각 노드에서 sources 까지의 거리를 구한다.
+    max_cost 를 넘는 노드는 확정하지 않고, targets 를 주면 그 노드가 모두 확정되는 즉시 멈춘다.
+    deadline(time.monotonic 기준) 이 지나도 멈추며, 그때까지 확정한 노드만 담는다.
+    (비용, 직전 노드) 딕셔너리를 반환한다.
+    """
+    remaining = set(targets) if targets is not None else None
+    best = {}
+    frontier = []
+    for node, cost in sources:
+        if cost <= max_cost and cost < best.get(node, float("inf")):
+            best[node] = cost
+            heapq.heappush(frontier, (cost, node))
+    costs = {}
+    came_from = dict.fromkeys(best)
+    edges = graph.predecessors if reverse else graph.neighbors
 
     while frontier:
-        _, current = heapq.heappop(frontier)
-        explored_nodes.append(current)
+        cost, current = heapq.heappop(frontier)
+        if current in costs:
+            continue
+        costs[current] = cost
+        if deadline is not None and time.monotonic() > deadline:
+            break
+        if remaining is not None:
+            remaining.discard(current)
+            if not remaining:
+                break
+        for neighbor, weight in edges(current):
+            new_cost = cost + weight
+            if new_cost <= max_cost and new_cost < best.get(neighbor, float("inf")):
+                best[neighbor] = new_cost
+                came_from[neighbor] = current
+                heapq.heappush(frontier, (new_cost, neighbor))
+
+    return costs, {node: came_from[node] for node in costs}
+
+def distance_matrix(origins, destinations, graph, max_cost=float("inf"), stats=None):
+    """
+    origins x destinations 최단 거리 행렬 (m, numpy 배열). 닿지 않거나 max_cost 를 넘으면 inf.
+    출발점마다 한 번씩, 모든 도착점의 끝 노드가 확정되거나 max_cost 에 이르면 멈추는
+    one-to-many Dijkstra 를 돌린다. 출발점/도착점은 노드 인덱스 또는 PhantomNode 이다.
+    stats 딕셔너리를 넘기면 모든 탐색에서 확정한 노드 수(settled)를 채운다.
+    """
+    settled = 0
+    target_seeds = [_target_seeds(goal, graph) for goal in destinations]
+    target_nodes = {node for seeds in target_seeds for node, _ in seeds}
+    matrix = np.full((len(origins), len(destinations)), np.inf)
+
+    for i, start in enumerate(origins):
+        costs, _ = shortest_path_tree(graph, _source_seeds(start, graph), max_cost=max_cost, targets=target_nodes)
+        settled += len(costs)
+        for j, (goal, seeds) in enumerate(zip(destinations, target_seeds)):
+            best = min(
+                [_direct_cost(start, goal, graph)]
+                + [costs[node] + offset for node, offset in seeds if node in costs]
+            )
+            if best <= max_cost:
+                matrix[i, j] = best
+    if stats is not None:
+        stats["settled"] = settled
+    return matrix
+
+def meeting_point(members, graph, objective="minmax", max_cost=float("inf"), stats=None):
+    """
+    여러 사람이 모이기 좋은 노드. 사람마다 한 번씩 max_cost 까지 Dijkstra 를 돌려,
+    모두가 max_cost 안에 닿을 수 있는 노드 중 최대 이동 거리(minmax) 또는 이동 거리 합(minsum)이
+    가장 작은 노드를 고른다 (같으면 다른 기준으로 비교).
+    (노드, 사람별 거리 목록, 사람별 경로 목록) 을 반환하며, 모두가 닿는 노드가 없으면 None.
+    stats 딕셔너리를 넘기면 모든 탐색에서 확정한 노드 수(settled)를 채운다.
+    """
+    if objective not in MEETING_OBJECTIVES:
+        raise ValueError(f"Unknown meeting objective: {objective}")
+    distances = np.full((len(members), graph.num_nodes), np.inf)
+    trees = []
+    for i, member in enumerate(members):
+        costs, came_from = shortest_path_tree(graph, _source_seeds(member, graph), max_cost=max_cost)
+        distances[i, list(costs)] = list(costs.values())
+        trees.append(came_from)
+    if stats is not None:
+        stats["settled"] = sum(len(tree) for tree in trees)
+
+    longest = distances.max(axis=0)
+    total = distances.sum(axis=0)
+    primary, secondary = (longest, total) if objective == "minmax" else (total, longest)
+    candidates = np.nonzero(primary == primary.min())[0]
+    node = int(candidates[np.argmin(secondary[candidates])])
+    if not np.isfinite(primary[node]):
+        return None
+
+    paths = []
+    for came_from in trees:
+        path = []
+        current = node
+        while current is not None:
+            path.append(current)
+            current = came_from[current]
+        paths.append(path[::-1])
+    return node, distances[:, node].tolist(), paths
+
+def _lookup(bounds):
+    """heuristic 의 결과를 bounds[node] 로 빠르게 조회할 수 있게 한다 (배열은 파이썬 목록으로)."""
+    return bounds.tolist() if isinstance(bounds, np.ndarray) else bounds
+
+def _bound_function(bounds):
+    """heuristic 의 결과를 node -> 하한 함수로."""
+    return bounds.bound if isinstance(bounds, NodeBounds) else _lookup(bounds).__getitem__
+
+def a_star_search(start, goal, graph, stats=None, trace=None, heuristic=straight_line):
+    """
+    A* 알고리즘으로 최단 경로 탐색 (start, goal 은 노드 인덱스 또는 PhantomNode).
+    (경로, trace) 를 반환하며, 도달할 수 없으면 경로는 None 이다.
+    stats 딕셔너리를 넘기면 거리와 탐색 수를 채우고, SearchTrace 를 넘기면 탐색 과정을 기록한다.
+    heuristic(graph, seeds, reverse=False) 는 노드에서 seeds 까지의 거리 하한을 돌려주는 함수로,
+    작은 그래프에서는 모든 노드의 배열을, 큰 그래프에서는 탐색이 닿는 노드만 계산하는
+    heuristics.NodeBounds 를 돌려준다. 기본은 직선거리이고 Landmarks 인스턴스를 넘기면 ALT 탐색이 된다.
+    """
+    bounds = _lookup(heuristic(graph, _target_seeds(goal, graph)))
+    return _unidirectional_search(start, goal, graph, bounds, stats, trace)
+
+def dijkstra_search(start, goal, graph, stats=None, trace=None):
+    """휴리스틱 없는 Dijkstra 최단 경로 탐색. 다른 탐색 결과를 검증하는 기준으로 쓴다."""
+    return _unidirectional_search(start, goal, graph, defaultdict(float), stats, trace)
 
-        if current == goal:
+def _unidirectional_search(start, goal, graph, heuristic, stats, trace):
+    """heuristic[node] 는 node 에서 목표까지의 거리 하한."""
+    targets = dict(_target_seeds(goal, graph))
+    frontier = []
+    came_from = {}
+    cost_so_far = {}
+    pushed = 0  # 큐에 넣은 항목 수
+    for node, cost in _source_seeds(start, graph):
+        if node not in cost_so_far or cost < cost_so_far[node]:
+            cost_so_far[node] = cost
+            came_from[node] = None
+            heapq.heappush(frontier, (cost + heuristic[node], node))
+            pushed += 1
+    best_cost = _direct_cost(start, goal, graph)
+    best_node = None
+    settled = set()
+
+    while frontier:
+        priority, current = heapq.heappop(frontier)
+        if priority >= best_cost:
             break
+        if current in settled:
+            continue  # 더 짧은 비용으로 이미 확정된 노드의 오래된 항목
+        settled.add(current)
+        if trace is not None:
+            trace.record(current, cost_so_far[current], came_from[current], 0)
 
-        for neighbor, cost in adjacency_list.get(current, []):
+        if current in targets and cost_so_far[current] + targets[current] < best_cost:
+            best_cost = cost_so_far[current] + targets[current]
+            best_node = current
+
+        for neighbor, cost in graph.neighbors(current):
             new_cost = cost_so_far[current] + cost
             if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
                 cost_so_far[neighbor] = new_cost
-                priority = new_cost + haversine(
-                    node_positions[neighbor][0], node_positions[neighbor][1],
-                    node_positions[goal][0], node_positions[goal][1]
-                )
+                priority = new_cost + heuristic[neighbor]
                 heapq.heappush(frontier, (priority, neighbor))
+                pushed += 1
                 came_from[neighbor] = current
 
+    if stats is not None:
+        stats["distance"] = best_cost
+        stats["settled"] = len(settled)
+        stats["relaxed"] = _out_degree_sum(graph, settled)
+        stats["pushed"] = pushed
+    if trace is not None:
+        trace.finish()
+
+    if best_cost == float("inf"):
+        return None, trace  # 도달할 수 없음
+
     path = []
-    current = goal
+    current = best_node
     while current is not None:
         path.append(current)
         current = came_from[current]
     path.reverse()
 
-    return path, explored_nodes
-
-def bidirectional_a_star(start, goal, node_positions, adjacency_list):
-    """양방향 A* 알고리즘으로 최단 경로 탐색."""
-    frontier_start = [(0, start)]
-    frontier_goal = [(0, goal)]
-    came_from_start = {start: None}
-    came_from_goal = {goal: None}
-    cost_so_far_start = {start: 0}
-    cost_so_far_goal = {goal: 0}
-    explored_nodes = []
-    node_id_map = {}  # 노드 ID 매핑을 위한 딕셔너리
-    node_counter = 0
-    current_best_path = None  # 현재까지의 최단 경로
-    best_cost = float('inf')
+    return path, trace
+
+def bidirectional_a_star(start, goal, graph, stats=None, trace=None, heuristic=straight_line):
+    """
+    양방향 A* 알고리즘으로 최단 경로 탐색 (start, goal 은 노드 인덱스 또는 PhantomNode).
+    역방향 탐색은 들어오는 엣지(rev_*)를 따라가므로 일방통행을 올바르게 다룬다.
+
+    두 방향이 같은 축척의 비용을 쓰도록 평균 포텐셜 p(v) = (h_goal(v) - h_start(v)) / 2 를
+    정방향 키에 더하고 역방향 키에서 뺀다. 지금까지 찾은 최단 경로 길이 mu 에 대해
+    두 큐의 최소 키 합이 mu 이상이면 더 짧은 경로가 없으므로 멈춘다.
+    (경로, trace) 를 반환하며, 도달할 수 없으면 경로는 None 이다. heuristic 은 a_star_search 와 같다.
+    """
+    return run_steps(bidirectional_a_star_steps(start, goal, graph, stats, trace, heuristic, batch_size=None))
+
+def stream_search(start, goal, graph, stats=None, trace=None, heuristic=straight_line,
+                  on_batch=None, batch_size=STREAM_BATCH_SIZE):
+    """
+    bidirectional_a_star 와 같은 탐색이지만, 탐색하는 동안 trace 에 기록된 행을 batch_size 개씩
+    on_batch(묶음) 으로 넘긴다 (SearchTrace.take_batch 참고). on_batch 가 돌아올 때까지 탐색은 멈춘다.
+    """
+    return run_steps(bidirectional_a_star_steps(start, goal, graph, stats, trace, heuristic, batch_size), on_batch)
+
+def run_steps(steps, on_batch=None):
+    """탐색 생성기를 끝까지 돌려 반환값을 돌려준다. on_batch 가 있으면 내놓은 묶음마다 부른다."""
+    while True:
+        try:
+            batch = next(steps)
+        except StopIteration as done:
+            return done.value
+        if on_batch is not None:
+            on_batch(batch)
+
+def bidirectional_a_star_steps(start, goal, graph, stats=None, trace=None, heuristic=straight_line,
+                               batch_size=STREAM_BATCH_SIZE):
+    """
+    bidirectional_a_star 의 생성기 버전. trace 에 기록이 batch_size 행 쌓일 때마다 (그리고 끝날 때
+    남은 행을) trace.take_batch() 묶음으로 내놓고, 끝나면 (경로, trace) 를 반환한다.
+    batch_size 가 None 이면 아무것도 내놓지 않는다.
+    """
+    # 두 하한이 모두 무한대인(양쪽 어디서도 닿지 않는) 노드는 nan 이 되지만 탐색에 쓰이지 않는다.
+    to_goal = heuristic(graph, _target_seeds(goal, graph))
+    from_start = heuristic(graph, _source_seeds(start, graph), reverse=True)
+    if isinstance(to_goal, np.ndarray) and isinstance(from_start, np.ndarray):
+        with np.errstate(invalid="ignore"):
+            potential = ((to_goal - from_start) / 2).tolist()
+    else:
+        # potential 이 노드마다 한 번만 부르므로 양쪽 하한은 따로 기억하지 않는다.
+        to_goal, from_start = _bound_function(to_goal), _bound_function(from_start)
+        potential = NodeBounds(lambda node: (to_goal(node) - from_start(node)) / 2)
+
+    # 방향별 상태: 0 = 출발지에서 정방향, 1 = 도착지에서 역방향
+    costs = [dict(_source_seeds(start, graph)), dict(_target_seeds(goal, graph))]
+    came_from = [dict.fromkeys(costs[0]), dict.fromkeys(costs[1])]
+    frontiers = [
+        [(cost + potential[node], node) for node, cost in costs[0].items()],
+        [(cost - potential[node], node) for node, cost in costs[1].items()],
+    ]
+    heapq.heapify(frontiers[0])
+    heapq.heapify(frontiers[1])
+    settled = [set(), set()]
+    signs = (1, -1)
+    pushed = len(frontiers[0]) + len(frontiers[1])  # 큐에 넣은 항목 수
+
+    best_cost = _direct_cost(start, goal, graph)  # mu
+    meeting_node = None
+    for node in costs[0].keys() & costs[1].keys():
+        if costs[0][node] + costs[1][node] < best_cost:
+            best_cost = costs[0][node] + costs[1][node]
+            meeting_node = node
 
     def reconstruct_path(current, came_from_dict):
         path = []
@@ -93,117 +404,53 @@ def bidirectional_a_star(start, goal, node_positions, adjacency_list):
             current = came_from_dict[current]
         return path
 
-    def add_explored_node(node, cost, previous_node, direction, temp_path=None):
-        nonlocal node_counter
-        node_id = str(node_counter)
-        node_id_map[node] = node_id
-        
-        previous_node_id = None
-        if previous_node is not None and previous_node in node_id_map:
-            previous_node_id = node_id_map[previous_node]
-
-        # 현재 노드까지의 임시 최단 경로가 있다면 포함
-        current_path = None
-        if temp_path:
-            current_path = [
-                {"lat": node_positions[n][0], "lng": node_positions[n][1]}
-                for n in temp_path
-            ]
-
-        explored_nodes.append({
-            "id": node_id,
-            "lat": node_positions[node][0],
-            "lng": node_positions[node][1],
-            "cost": cost,
-            "previousNode": previous_node_id,
-            "direction": direction,
-            "tempPath": current_path  # 임시 최단 경로 추가
-        })
-        node_counter += 1
-        return node_id
-
-    while frontier_start and frontier_goal:
-        # 출발지에서 탐색
-        _, current_start = heapq.heappop(frontier_start)
-        
-        # 현재까지의 경로 복원
-        temp_path_start = reconstruct_path(current_start, came_from_start)[::-1]
-        
-        current_start_id = add_explored_node(
-            current_start,
-            cost_so_far_start[current_start],
-            came_from_start[current_start],
-            "forward",
-            temp_path_start
-        )
-
-        if current_start in cost_so_far_goal:
-            total_cost = cost_so_far_start[current_start] + cost_so_far_goal[current_start]
-            if total_cost < best_cost:
-                best_cost = total_cost
-                meeting_node = current_start
-                current_best_path = temp_path_start
+    while frontiers[0] and frontiers[1]:
+        if frontiers[0][0][0] + frontiers[1][0][0] >= best_cost:
             break
 
-        for neighbor, cost in adjacency_list.get(current_start, []):
-            new_cost = cost_so_far_start[current_start] + cost
-            if neighbor not in cost_so_far_start or new_cost < cost_so_far_start[neighbor]:
-                cost_so_far_start[neighbor] = new_cost
-                priority = new_cost + haversine(
-                    node_positions[neighbor][0], node_positions[neighbor][1],
-                    node_positions[goal][0], node_positions[goal][1]
-                )
-                heapq.heappush(frontier_start, (priority, neighbor))
-                came_from_start[neighbor] = current_start
-
-        # 도착지에서 탐색
-        _, current_goal = heapq.heappop(frontier_goal)
-        
-        # 현재까지의 경로 복원
-        temp_path_goal = reconstruct_path(current_goal, came_from_goal)
-        
-        current_goal_id = add_explored_node(
-            current_goal,
-            cost_so_far_goal[current_goal],
-            came_from_goal[current_goal],
-            "backward",
-            temp_path_goal
-        )
-
-        if current_goal in cost_so_far_start:
-            total_cost = cost_so_far_start[current_goal] + cost_so_far_goal[current_goal]
-            if total_cost < best_cost:
-                best_cost = total_cost
-                meeting_node = current_goal
-                current_best_path = temp_path_goal
-            break
+        # 최소 키가 더 작은 쪽을 먼저 확장
+        side = 0 if frontiers[0][0][0] <= frontiers[1][0][0] else 1
+        _, current = heapq.heappop(frontiers[side])
+        if current in settled[side]:
+            continue
+        settled[side].add(current)
 
-        for neighbor, cost in adjacency_list.get(current_goal, []):
-            new_cost = cost_so_far_goal[current_goal] + cost
-            if neighbor not in cost_so_far_goal or new_cost < cost_so_far_goal[neighbor]:
-                cost_so_far_goal[neighbor] = new_cost
-                priority = new_cost + haversine(
-                    node_positions[neighbor][0], node_positions[neighbor][1],
-                    node_positions[start][0], node_positions[start][1]
-                )
-                heapq.heappush(frontier_goal, (priority, neighbor))
-                came_from_goal[neighbor] = current_goal
+        cost_so_far, other_costs = costs[side], costs[1 - side]
+        if trace is not None:
+            trace.record(current, cost_so_far[current], came_from[side][current], side)
+            if batch_size is not None and trace.unsent >= batch_size:
+                yield trace.take_batch()
+        edges = graph.neighbors(current) if side == 0 else graph.predecessors(current)
 
-    # 최종 경로 재구성
-    path_from_start = []
-    current = meeting_node
-    while current is not None:
-        path_from_start.append(current)
-        current = came_from_start[current]
-    path_from_start.reverse()
+        for neighbor, cost in edges:
+            new_cost = cost_so_far[current] + cost
+            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                cost_so_far[neighbor] = new_cost
+                came_from[side][neighbor] = current
+                heapq.heappush(frontiers[side], (new_cost + signs[side] * potential[neighbor], neighbor))
+                pushed += 1
+                # 반대쪽에서 이미 닿은 노드면 두 탐색을 잇는 경로 후보
+                if neighbor in other_costs and new_cost + other_costs[neighbor] < best_cost:
+                    best_cost = new_cost + other_costs[neighbor]
+                    meeting_node = neighbor
 
-    path_from_goal = []
-    current = meeting_node
-    while current is not None:
-        if current != meeting_node:
-            path_from_goal.append(current)
-        current = came_from_goal[current]
+    if stats is not None:
+        stats["distance"] = best_cost
+        stats["settled"] = len(settled[0]) + len(settled[1])
+        stats["relaxed"] = _out_degree_sum(graph, settled[0]) + _in_degree_sum(graph, settled[1])
+        stats["pushed"] = pushed
+    if trace is not None:
+        trace.finish()
+        if batch_size is not None and trace.unsent:
+            yield trace.take_batch()
+
+    if best_cost == float("inf"):
+        return None, trace  # 도달할 수 없음
+    if meeting_node is None:
+        return [], trace  # 같은 도로 구간을 그대로 따라가는 경로
 
-    final_path = path_from_start + path_from_goal
+    # 최종 경로 재구성
+    path_from_start = reconstruct_path(meeting_node, came_from[0])[::-1]
+    path_from_goal = reconstruct_path(meeting_node, came_from[1])[1:]
 
-    return final_path, explored_nodes
\ No newline at end of file
+    return path_from_start + path_from_goal, trace
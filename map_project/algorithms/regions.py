@@ -0,0 +1,130 @@
+import argparse
+import os
+import time
+from collections import namedtuple
+
+from algorithms.contraction import CH_ARRAYS, ContractionHierarchy, build_contraction_hierarchy
+from algorithms.graph import RoadGraph, load_arrays
+from algorithms.landmarks import ALT_ARRAYS, DEFAULT_LANDMARKS, Landmarks
+
+# 미리 전처리해 둔 지역. graph 는 엣지 갱신마다 with_edge_factors() 로 바꾼 그래프로 교체하고
+# (Region._replace), ch 와 landmarks 는 스냅숏에 저장한 갱신 전 거리 그대로 쓴다.
+# load_ms 는 스냅숏을 여는 데, index_ms 는 (스냅숏에 색인이 없어) 시작할 때 색인을 만드는 데 든 시간이다.
+Region = namedtuple("Region", ["name", "path", "graph", "ch", "landmarks", "load_ms", "index_ms"])
+
+
+def load_region(path, name=None):
+    """
+    python -m algorithms.regions 로 만든 스냅숏(.npz) 을 메모리 매핑으로 연다.
+    배열을 복사하거나 파이썬 객체로 풀지 않으므로 여는 시간은 파일 크기와 거의 무관하고,
+    페이지는 처음 읽을 때 (여러 작업 프로세스가 같은 페이지 캐시를 함께 써서) 올라온다.
+    색인을 저장하지 않은 예전 그래프 파일이면 첫 요청이 기다리지 않도록 여기서 만든다.
+    """
+    began = time.perf_counter()
+    arrays = load_arrays(path, mmap=True)
+    graph = RoadGraph.from_arrays(arrays)
+    ch = ContractionHierarchy.from_arrays(graph, arrays)
+    landmarks = Landmarks.from_arrays(arrays)
+    loaded = time.perf_counter()
+    graph.spatial_index, graph.edge_index
+    indexed = time.perf_counter()
+    return Region(
+        name or os.path.splitext(os.path.basename(path))[0], path, graph, ch, landmarks,
+        (loaded - began) * 1000, (indexed - loaded) * 1000,
+    )
+
+
+def load_regions(paths):
+    """
+    os.pathsep(":") 으로 이은 스냅숏 경로들 (REGION_GRAPH_PATH) 을 모두 연다.
+    이름은 파일 이름이며, 겹치면 뒤에 순번을 붙인다.
+    """
+    regions = []
+    for path in filter(None, (paths or "").split(os.pathsep)):
+        region = load_region(path)
+        names = {other.name for other in regions}
+        if region.name in names:
+            region = region._replace(name=next(
+                f"{region.name}-{i}" for i in range(2, len(regions) + 2) if f"{region.name}-{i}" not in names
+            ))
+        regions.append(region)
+        print(f"Loaded region {region.name}: {region.graph.num_nodes} nodes, {region.graph.num_edges} edges "
+              f"in {region.load_ms:.1f}ms" + (f" (+{region.index_ms:.0f}ms building indexes)"
+                                               if region.index_ms >= 1 else ""))
+    return regions
+
+
+def find_region(regions, points):
+    """points ({"lat", "lng"} 목록) 를 모두 담는 첫 지역. 없으면 None."""
+    for region in regions:
+        if all(region.graph.contains(p["lat"], p["lng"]) for p in points):
+            return region
+    return None
+
+
+def describe(region):
+    """/regions 응답 항목."""
+    graph = region.graph
+    north, south, east, west = graph.bounds
+    return {
+        "name": region.name,
+        "path": region.path,
+        "nodes": graph.num_nodes,
+        "edges": graph.num_edges,
+        "bounds": {"north": north, "south": south, "east": east, "west": west},
+        "contractionHierarchy": region.ch is not None,
+        "landmarks": len(region.landmarks.landmarks) if region.landmarks else 0,
+        "loadMs": round(region.load_ms, 3),
+        "indexMs": round(region.index_ms, 3),
+        "version": graph.version,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="지역 스냅숏을 만든다: 그래프 배열, ALT 랜드마크 거리표, 최근접 노드/도로 구간 색인(--ch 면 CH 도)을 "
+                    "압축하지 않은 .npz 하나에 담아 서버가 시작할 때 메모리 매핑으로 바로 연다 (REGION_GRAPH_PATH).")
+    parser.add_argument("output", help="저장할 .npz 경로")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--graph", help="RoadGraph.save() 로 저장한 그래프 (이미 있는 CH, 랜드마크 배열은 그대로 쓴다)")
+    source.add_argument("--bbox", type=float, nargs=4, metavar=("NORTH", "SOUTH", "EAST", "WEST"),
+                        help="도로 그래프 공급자(GRAPH_PROVIDER)에서 불러올 범위")
+    parser.add_argument("--landmarks", type=int, default=DEFAULT_LANDMARKS, help="랜드마크 수 (0 이면 만들지 않는다)")
+    parser.add_argument("--ch", action="store_true",
+                        help="Contraction Hierarchies 도 만든다. heuristic=\"ch\" 요청에만 쓰이고, 순수 파이썬이라 "
+                             "노드 수보다 빠르게 늘어 4만 교차로에 몇 분 걸린다 (benchmarks.contraction)")
+    args = parser.parse_args()
+
+    if args.graph:
+        arrays = load_arrays(args.graph)
+        graph = RoadGraph.from_arrays(arrays)
+    else:
+        from algorithms.path_finder import prepare_graph
+        from algorithms.road_network import graph_provider
+        arrays = {}
+        graph = prepare_graph(graph_provider.load_bbox(*args.bbox))
+
+    extra = {name: value for name, value in arrays.items()
+             if name not in RoadGraph.ARRAYS and name != "format_version"}
+    if args.ch and not all(name in extra for name in CH_ARRAYS):
+        began = time.perf_counter()
+        ch = build_contraction_hierarchy(graph, verbose=True)
+        print(f"Built contraction hierarchy in {time.perf_counter() - began:.1f}s")
+        extra.update((name, getattr(ch, name[len("ch_"):])) for name in CH_ARRAYS)
+    if args.landmarks and not all(name in extra for name in ALT_ARRAYS):
+        began = time.perf_counter()
+        landmarks = Landmarks.build(graph, args.landmarks, verbose=True)
+        print(f"Built {len(landmarks.landmarks)} landmarks in {time.perf_counter() - began:.1f}s")
+        extra.update(landmarks.to_arrays())
+    began = time.perf_counter()
+    extra.update(graph.index_arrays())
+    print(f"Built spatial and edge indexes in {time.perf_counter() - began:.1f}s")
+    graph.save(args.output, **extra)
+
+    region = load_region(args.output)
+    print(f"Saved {graph.num_nodes} nodes and {graph.num_edges} edges to {args.output} "
+          f"({os.path.getsize(args.output) / 2 ** 20:.1f} MiB); opens in {region.load_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
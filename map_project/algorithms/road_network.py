@@ -1,25 +1,280 @@
-import osmnx as ox
+import math
+import os
+from collections import namedtuple
+from functools import partial
 
-def load_dynamic_graph(start, end):
+import numpy as np
+
+from algorithms.edge_updates import EdgeUpdates
+from algorithms.graph import RoadGraph
+from algorithms.graph_provider import make_provider
+from algorithms.isochrone import reached_costs
+from algorithms.heuristics import LATITUDE_MARGIN, METERS_PER_DEGREE, straight_line, travel_time
+from algorithms.metrics import count_search, timed
+from algorithms.path_finder import bidirectional_a_star, haversine, snap_to_edge
+from algorithms.route_cache import endpoint_key
+from algorithms.single_flight import SingleFlight
+from algorithms.speeds import MAX_SPEED, kph_to_mps
+
+# 도로 그래프 공급자 (GRAPH_PROVIDER, 기본 "osm"). OSM 타일 캐시는 GRAPH_TILE_DIR 에 미리 받아 둔
+# 타일만으로도 요청을 처리할 수 있고, GRAPH_TILE_OFFLINE=1 이면 네트워크 요청 없이 캐시된 타일만 사용한다.
+# "fixture:<경로>" 는 저장해 둔 그래프를, "synthetic:<종류>,..." 는 가상 도로망을 쓴다 (graph_provider.make_provider).
+graph_provider = make_provider(os.getenv("GRAPH_PROVIDER", "osm"))
+
+CORRIDOR_DETOUR = 1.3  # 처음 불러오는 코리도의 경로 길이 한도 (직선거리의 배수)
+CORRIDOR_MIN_SLACK = 1000.0  # 짧은 경로에서도 한도가 직선거리보다 최소 이만큼(m) 크도록
+CORRIDOR_GROWTH = 2.0  # 넓힐 때마다 (한도 - 직선거리) 를 늘리는 배수
+CORRIDOR_MAX_ATTEMPTS = 4
+
+ISOCHRONE_START_SPEED = 40.0  # 이동 시간 등시선에서 처음 불러오는 bbox 의 반지름 = 예산 * 이 속도 (km/h)
+ISOCHRONE_GROWTH = 2.0  # 넓힐 때마다 반지름을 늘리는 배수
+ISOCHRONE_SNAP_MARGIN = 1000.0  # 예산만큼의 반지름에 더하는 여유 (m). 도로에서 떨어진 출발지도 스냅되도록
+
+# 불러올 그래프의 범위. corridor 는 bbox 로 불러오면 None, 타원 코리도면 (start, end, limit, ky, kx).
+GraphArea = namedtuple("GraphArea", ["north", "south", "east", "west", "corridor"])
+
+# 경로 탐색 결과. stats 는 탐색 stats 에 불러온 그래프의 노드/엣지 수(와 코리도 정보)를 더한 것이다.
+Route = namedtuple("Route", ["graph", "start", "goal", "path", "trace", "stats"])
+
+def _covers(held, wanted):
     """
-    주어진 출발지와 도착지 좌표를 기반으로 그래프를 로드.
-    :param start: 출발지 좌표 {"lat": ..., "lng": ...}
-    :param end: 도착지 좌표 {"lat": ..., "lng": ...}
-    :return: 로드된 도로 그래프
+    held 범위로 불러온 그래프가 wanted 범위의 그래프를 모두 포함하는지.
+    포함하면 wanted 대신 써도 된다 (노드가 더 많을 뿐 거리와 최단 경로 보장은 그대로다).
     """
-    north = max(start["lat"], end["lat"]) + 0.01
-    south = min(start["lat"], end["lat"]) - 0.01
-    east = max(start["lng"], end["lng"]) + 0.01
-    west = min(start["lng"], end["lng"]) - 0.01
+    if not (held.north >= wanted.north and held.south <= wanted.south
+            and held.east >= wanted.east and held.west <= wanted.west):
+        return False
+    if held.corridor is None:
+        return True
+    if wanted.corridor is None:
+        return False
+    # 평면 거리 d1 (held 의 축척) 에서 wanted 타원 위의 점 p 는
+    #   d1(p, s1) + d1(p, e1) <= d1(s1, s2) + d1(e1, e2) + scale * L2
+    # 를 만족하므로 이 값이 L1 이하이면 wanted 타원 전체가 held 타원 안에 있다.
+    (s1, e1, l1, ky, kx1), (s2, e2, l2, _, kx2) = held.corridor, wanted.corridor
+    scale = max(1.0, kx1 / kx2)
 
-    print(f"Graph bounding box: north={north}, south={south}, east={east}, west={west}")
+    def distance(a, b):
+        return math.hypot((a["lat"] - b["lat"]) * ky, (a["lng"] - b["lng"]) * kx1)
 
-    # 범위 내 도로 그래프 로드
-    graph = ox.graph_from_bbox(
-        north=north,
-        south=south,
-        east=east,
-        west=west,
-        network_type="drive",
-    )
+    return min(distance(s1, s2) + distance(e1, e2),
+               distance(s1, e2) + distance(e1, s2)) + scale * l2 <= l1
+
+# 실시간 엣지 갱신 (통제, 정체). 타일에서 불러오는 그래프에는 불러올 때 적용한다.
+edge_updates = EdgeUpdates()
+
+def with_edge_updates(graph):
+    """새로 만든 graph 에 지금의 엣지 갱신을 적용한 그래프. version 은 갱신 버전이다."""
+    version, factors = edge_updates.snapshot()
+    if factors:
+        return graph.with_edge_factors(factors, version)
+    graph.version = version
     return graph
+
+def _refresh_edge_updates(graph):
+    """
+    함께 쓰는 graph 가 지금의 엣지 갱신 버전이 아니면 (불러오는 사이에 갱신이 있었으면) 지금
+    갱신을 다시 적용한 그래프. 갱신 전 가중치에서 다시 계산하므로 이전 배수는 남지 않는다.
+    """
+    version, factors = edge_updates.snapshot()
+    if graph.version == version:
+        return graph
+    return graph.with_edge_factors(factors, version)
+
+# 같은 방 참가자들이 동시에 같은 두 위치로 요청하는 경우 등, 같은(또는 이미 불러오는 더 넓은)
+# 범위의 그래프는 한 번만 불러와 함께 쓴다. 돌려주기 전에 엣지 갱신 버전을 맞춘다.
+graph_loads = SingleFlight(_covers, refresh=_refresh_edge_updates)
+
+def _load_bbox_graph(area):
+    with timed("load_graph"):
+        arrays = graph_provider.bbox_arrays(area.north, area.south, area.east, area.west)
+    with timed("prepare_graph"):
+        return with_edge_updates(RoadGraph.from_edges(
+            arrays["node_ids"], arrays["node_lat"], arrays["node_lon"],
+            arrays["edge_u"], arrays["edge_v"], arrays["edge_key"], arrays["edge_length"], arrays["edge_speed"],
+        ))
+
+def load_area_graph(points, padding=0.01):
+    """여러 좌표 {"lat", "lng"} 를 모두 덮는 bbox (+ padding 도) 안의 도로 그래프 (RoadGraph)."""
+    area = GraphArea(
+        max(point["lat"] for point in points) + padding,
+        min(point["lat"] for point in points) - padding,
+        max(point["lng"] for point in points) + padding,
+        min(point["lng"] for point in points) - padding,
+        None,
+    )
+    return graph_loads.load(area, lambda: _load_bbox_graph(area))
+
+def isochrone_area(origin, radius):
+    """origin 에서 네 변까지의 거리가 모두 radius(m) 이상인 bbox (GraphArea)."""
+    dlat = radius / METERS_PER_DEGREE
+    dlng = dlat / max(math.cos(math.radians(min(abs(origin["lat"]) + dlat, 90.0))), 1e-6)
+    return GraphArea(origin["lat"] + dlat, origin["lat"] - dlat, origin["lng"] + dlng, origin["lng"] - dlng, None)
+
+def corridor_area(start, end, limit):
+    """출발지와 도착지를 초점으로 하고 경로 길이 한도가 limit 인 타원 코리도 (GraphArea)."""
+    ky = METERS_PER_DEGREE
+    # 길이 limit 이하의 경로는 어느 한 끝에서 위도로 limit / 2 이상 벗어날 수 없다.
+    max_lat = max(abs(start["lat"]), abs(end["lat"])) + limit / 2 / ky + LATITUDE_MARGIN
+    kx = ky * math.cos(math.radians(min(max_lat, 90.0)))
+
+    # 타원의 모든 점은 두 초점을 잇는 선분에서 단축 반지름 b 이내에 있다.
+    focal = math.hypot((end["lat"] - start["lat"]) * ky, (end["lng"] - start["lng"]) * kx) / 2
+    b = math.sqrt(max((limit / 2) ** 2 - focal ** 2, 0.0))
+    return GraphArea(
+        max(start["lat"], end["lat"]) + b / ky,
+        min(start["lat"], end["lat"]) - b / ky,
+        max(start["lng"], end["lng"]) + b / kx,
+        min(start["lng"], end["lng"]) - b / kx,
+        (start, end, limit, ky, kx),
+    )
+
+def load_corridor_graph(start, end, limit):
+    """
+    출발지와 도착지를 초점으로 하는 타원 코리도 안의 도로 그래프 (RoadGraph).
+    직선거리 하한으로 lb(start, v) + lb(v, end) <= limit 인 노드만 남기므로,
+    길이가 limit 이하인 경로는 모두 이 그래프 안에 있다.
+    같은 코리도를 덮는 그래프를 이미 불러오고 있으면 그 그래프를 함께 쓴다.
+    """
+    area = corridor_area(start, end, limit)
+    return graph_loads.load(area, lambda: _load_corridor_graph(area))
+
+def _load_corridor_graph(area):
+    start, end, limit, ky, kx = area.corridor
+    with timed("load_graph"):
+        arrays = graph_provider.bbox_arrays(area.north, area.south, area.east, area.west)
+
+    with timed("prepare_graph"):
+        lat, lon = arrays["node_lat"], arrays["node_lon"]
+        bound = np.hypot((lat - start["lat"]) * ky, (lon - start["lng"]) * kx) \
+            + np.hypot((lat - end["lat"]) * ky, (lon - end["lng"]) * kx)
+        inside = bound <= limit
+        kept = arrays["node_ids"][inside]
+        edge_mask = np.isin(arrays["edge_u"], kept) & np.isin(arrays["edge_v"], kept)
+        return with_edge_updates(RoadGraph.from_edges(
+            kept, lat[inside], lon[inside],
+            arrays["edge_u"][edge_mask], arrays["edge_v"][edge_mask],
+            arrays["edge_key"][edge_mask], arrays["edge_length"][edge_mask], arrays["edge_speed"][edge_mask],
+        ))
+
+def find_corridor_route(start, end, search=None, make_trace=None, cache=None, weight="distance"):
+    """
+    좁은 타원 코리도에서 시작해 필요할 때만 넓혀 가며 경로를 찾는다.
+    코리도 한도 D 안에서 찾은 최단 거리 mu 에 두 끝점의 스냅 거리를 더한 값이 D 이하이면,
+    그보다 짧은 경로는 모두 코리도 안에 있으므로 전체 도로망에서도 최단 경로다.
+    경로가 없으면 한도를 CORRIDOR_GROWTH 배로 넓히고, 경로는 찾았지만 조건을 만족하지 못하면
+    한도를 mu + 스냅 거리로 넓혀 한 번 더 탐색한다.
+    weight="time" 이면 이동 시간 mu 안에 갈 수 있는 경로의 길이가 mu * MAX_SPEED 이하이므로
+    mu 대신 이 길이로 같은 조건을 확인한다.
+    search 는 bidirectional_a_star 와 같은 인터페이스로, 주지 않으면 weight 에 맞는 휴리스틱의
+    bidirectional_a_star 를 쓴다. make_trace(graph) 는 SearchTrace 를 만든다.
+    cache(RouteCache) 를 주면 첫 코리도에서 스냅한 끝점으로 캐시를 찾고, 최단임이 확인된
+    경로를 (OSM ID 경로, 비용, 코리도 한도) 로 저장한다. 탐색 과정을 기록할 때는 쓰지 않으며,
+    탐색한 그래프보다 새 엣지 갱신이 있으면 저장하지 않는다.
+    """
+    if search is None:
+        search = partial(bidirectional_a_star, heuristic=travel_time() if weight == "time" else straight_line)
+    # 비용 1 에 해당하는 최대 경로 길이 (m)
+    reach = kph_to_mps(MAX_SPEED) if weight == "time" else 1.0
+    direct = haversine(start["lat"], start["lng"], end["lat"], end["lng"])
+    limit = max(direct * CORRIDOR_DETOUR, direct + CORRIDOR_MIN_SLACK)
+    cache_key = None
+
+    for attempt in range(1, CORRIDOR_MAX_ATTEMPTS + 1):
+        graph = load_corridor_graph(start, end, limit).weighted(weight)
+        stats = {"attempts": attempt, "limit": limit, "nodes": graph.num_nodes, "edges": graph.num_edges}
+
+        path = trace = start_node = end_node = None
+        if graph.num_edges:
+            start_node = snap_to_edge(start["lat"], start["lng"], graph)
+            end_node = snap_to_edge(end["lat"], end["lng"], graph)
+            if cache is not None and make_trace is None and cache_key is None:
+                cache_key = (endpoint_key(start_node, graph), endpoint_key(end_node, graph), weight, "tiles")
+                cached = cache.get(cache_key)
+                route = _cached_route(start, end, cached, graph, start_node, end_node, stats) if cached else None
+                if route is not None:
+                    return route
+            trace = make_trace(graph) if make_trace else None
+            with timed("search"):
+                path, trace = search(start_node, end_node, graph, stats=stats, trace=trace)
+            count_search(stats)
+
+        if path is None:
+            limit = direct + (limit - direct) * CORRIDOR_GROWTH
+            continue
+        snap_distance = haversine(start["lat"], start["lng"], start_node.lat, start_node.lon) \
+            + haversine(end["lat"], end["lng"], end_node.lat, end_node.lon)
+        stats["optimal"] = stats["distance"] * reach + snap_distance <= limit
+        if stats["optimal"]:
+            if cache_key is not None and graph.version == edge_updates.version:
+                cache.put(cache_key, (graph.node_ids[path], stats["distance"], limit))
+            break
+        # 찾은 경로보다 짧은 경로가 있다면 모두 이 한도 안에 있으므로 다음 시도에서 확정된다.
+        limit = (stats["distance"] * reach + snap_distance) * (1 + 1e-9)
+
+    return Route(graph, start_node, end_node, path, trace, stats)
+
+def _cached_route(start, end, cached, graph, start_node, end_node, stats):
+    """
+    캐시된 경로를 담은 Route. 지금 코리도가 경로를 담기에 좁으면 저장할 때의 한도로 다시 불러온다.
+    (조금 다른 좌표로 스냅된 요청이라) 그래도 경로 노드가 빠져 있으면 None.
+    """
+    osm_path, distance, limit = cached
+    if limit > stats["limit"]:
+        graph = load_corridor_graph(start, end, limit).weighted(graph.weight)
+        start_node = snap_to_edge(start["lat"], start["lng"], graph)
+        end_node = snap_to_edge(end["lat"], end["lng"], graph)
+    try:
+        path = graph.indices_of(osm_path).tolist()
+    except KeyError:
+        return None
+    stats = dict(stats, limit=max(limit, stats["limit"]), nodes=graph.num_nodes, edges=graph.num_edges,
+                 distance=distance, optimal=True, cached=True)
+    return Route(graph, start_node, end_node, path, None, stats)
+
+def _edge_distance(area, lat, lon):
+    """bbox area 안의 좌표 (lat, lon) 에서 가장 가까운 변까지의 직선거리 하한 (m)."""
+    ky = METERS_PER_DEGREE
+    kx = ky * math.cos(math.radians(min(max(abs(area.north), abs(area.south)) + LATITUDE_MARGIN, 90.0)))
+    return np.minimum(np.minimum(area.north - lat, lat - area.south) * ky,
+                      np.minimum(area.east - lon, lon - area.west) * kx)
+
+def find_isochrone_tree(origin, budget, weight="distance"):
+    """
+    origin 에서 비용 budget 안에 닿는 노드를 모두 확정한 (그래프, 스냅한 출발점, reached_costs, stats).
+    예산을 MAX_SPEED 로 달린 만큼의 bbox 는 이동 시간 예산이면 수십 km 라, ISOCHRONE_START_SPEED
+    로 달린 만큼의 bbox 부터 탐색하고 필요할 때만 반지름을 ISOCHRONE_GROWTH 배씩 넓힌다.
+    bbox 밖의 노드로 가려면 안의 어떤 노드 w 에서 변까지의 직선거리 이상을 더 가야 하므로,
+    예산 안에 닿은 모든 w 에서 cost(w) + (변까지 거리) / 최고 속도 가 budget 을 넘으면 (탐색이
+    변에 닿기 전에 예산을 다 썼으면) bbox 밖에서 더 닿는 노드는 없다. 출발지에서 스냅한 도로까지의
+    거리도 변까지의 거리보다 가까워야 전체 도로망에서 스냅한 것과 같다.
+    도로가 없으면 출발점은 None, reached_costs 는 빈 딕셔너리다.
+    """
+    # 비용 1 에 해당하는 최대 경로 길이 (m)
+    reach = kph_to_mps(MAX_SPEED) if weight == "time" else 1.0
+    max_radius = budget * reach + ISOCHRONE_SNAP_MARGIN
+    radius = budget * (kph_to_mps(ISOCHRONE_START_SPEED) if weight == "time" else 1.0) + ISOCHRONE_SNAP_MARGIN
+    radius = min(radius, max_radius)
+
+    attempt = 0
+    while True:
+        attempt += 1
+        area = isochrone_area(origin, radius)
+        graph = graph_loads.load(area, lambda: _load_bbox_graph(area)).weighted(weight)
+        stats = {"attempts": attempt, "radius": radius, "nodes": graph.num_nodes, "edges": graph.num_edges}
+        start, costs = None, {}
+        if graph.num_edges:
+            start = snap_to_edge(origin["lat"], origin["lng"], graph)
+            with timed("isochrone"):
+                costs = reached_costs(start, graph, budget)
+        if radius >= max_radius:
+            return graph, start, costs, stats
+        if start is not None:
+            nodes = np.fromiter(costs, dtype=np.int64, count=len(costs))
+            node_costs = np.fromiter(costs.values(), dtype=np.float64, count=len(costs))
+            leave = node_costs + _edge_distance(area, graph.lat[nodes], graph.lon[nodes]) / reach
+            snapped = haversine(origin["lat"], origin["lng"], start.lat, start.lon) \
+                < _edge_distance(area, origin["lat"], origin["lng"])
+            if snapped and bool(np.all(leave > budget)):
+                return graph, start, costs, stats
+        radius = min(radius * ISOCHRONE_GROWTH, max_radius)
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+
+from algorithms.path_finder import PhantomNode
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_TTL = 600.0  # 초
+RATIO_DIGITS = 2  # 같은 도로 구간 위의 스냅 위치를 구간 길이의 1% 단위로 반올림해 같은 키로 본다
+
+
+def endpoint_key(endpoint, graph):
+    """
+    캐시 키에 쓰는 끝점 표현. 그래프마다 달라지는 노드 인덱스 대신 OSM ID 를 쓰므로
+    같은 지점을 서로 다른 범위로 불러온 그래프에서도 같은 키가 된다.
+    """
+    if isinstance(endpoint, PhantomNode):
+        return graph.osm_id(endpoint.u), graph.osm_id(endpoint.v), round(endpoint.ratio, RATIO_DIGITS)
+    return graph.osm_id(endpoint)
+
+
+class RouteCache:
+    """
+    경로 결과 LRU 캐시. 키는 (출발 키, 도착 키, 가중치, 그래프 버전) 이고,
+    ttl 초가 지난 항목은 꺼낼 때 버리며 max_size 를 넘으면 가장 오래 쓰지 않은 항목부터 버린다.
+    여러 요청 스레드가 함께 쓰므로 잠금으로 보호한다.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # 키 -> (저장 시각, 값)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """캐시된 값. 없거나 만료되었으면 None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, stale):
+        """stale(키, 값) 이 참인 항목을 버린다 (엣지 가중치 갱신 등). 버린 수."""
+        with self._lock:
+            keys = [key for key, (_, value) in self._entries.items() if stale(key, value)]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxSize": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+def combine_stats(stats):
+    """여러 프로세스의 RouteCache.stats() 를 합친 통계 (크기와 수는 더하고 hitRate 는 다시 계산한다)."""
+    stats = list(stats)
+    total = {
+        name: sum(entry[name] for entry in stats)
+        for name in ("size", "maxSize", "hits", "misses", "evictions", "expirations", "invalidations")
+    }
+    lookups = total["hits"] + total["misses"]
+    total["hitRate"] = total["hits"] / lookups if lookups else 0.0
+    total["ttl"] = stats[0]["ttl"] if stats else DEFAULT_TTL
+    return total
@@ -0,0 +1,145 @@
+import json
+import math
+import struct
+
+import numpy as np
+
+# 경로 응답 형식 (Accept 헤더로 고른다)
+#   json:     기본. 경로는 {"lat", "lng"} 목록, 탐색 기록은 열 단위 숫자 목록
+#   polyline: JSON 이지만 경로("path")를 Google encoded polyline 문자열로
+#   packed:   polyline 경로 + 탐색 기록 열을 리틀 엔디언 배열로 붙인 바이너리
+RESPONSE_FORMATS = {
+    "application/json": "json",
+    "application/vnd.route-polyline+json": "polyline",
+    "application/vnd.route-packed": "packed",
+}
+POLYLINE_PRECISION = 5  # 소수점 아래 자릿수 (1e-5 도, 약 1m)
+
+PACKED_MAGIC = b"RTPK"
+PACKED_VERSION = 1
+_PACKED_PREFIX = struct.Struct("<4sBI")  # magic, version, 헤더 길이
+# 탐색 기록(SearchTrace.to_dict / take_batch) 열의 자료형. 좌표와 비용은 float32 (약 0.5m 정밀도)로 줄인다.
+TRACE_COLUMNS = {
+    "lat": "<f4",
+    "lng": "<f4",
+    "cost": "<f4",
+    "parent": "<i4",
+    "direction": "u1",
+}
+
+
+def encode_polyline(points, precision=POLYLINE_PRECISION):
+    """{"lat", "lng"} 목록을 Google encoded polyline 문자열로."""
+    factor = 10 ** precision
+    chunks = []
+    previous_lat = previous_lng = 0
+    for point in points:
+        lat = math.floor(point["lat"] * factor + 0.5)
+        lng = math.floor(point["lng"] * factor + 0.5)
+        for delta in (lat - previous_lat, lng - previous_lng):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+                value >>= 5
+            chunks.append(chr(value + 63))
+        previous_lat, previous_lng = lat, lng
+    return "".join(chunks)
+
+
+def decode_polyline(text, precision=POLYLINE_PRECISION):
+    """encode_polyline 의 역. {"lat", "lng"} 목록."""
+    factor = 10 ** precision
+    points = []
+    index = lat = lng = 0
+    while index < len(text):
+        deltas = []
+        for _ in range(2):
+            shift = value = 0
+            while True:
+                byte = ord(text[index]) - 63
+                index += 1
+                value |= (byte & 0x1F) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            deltas.append(~(value >> 1) if value & 1 else value >> 1)
+        lat += deltas[0]
+        lng += deltas[1]
+        points.append({"lat": lat / factor, "lng": lng / factor})
+    return points
+
+
+def _is_trace(value):
+    return isinstance(value, dict) and all(isinstance(value.get(name), list) for name in TRACE_COLUMNS)
+
+
+def _transform(value, pack_trace):
+    """본문의 "path" 목록을 polyline 으로, (pack_trace 가 있으면) 탐색 기록 열을 pack_trace(열 이름, 값) 으로 바꾼다."""
+    if isinstance(value, dict):
+        if pack_trace is not None and _is_trace(value):
+            return {
+                key: pack_trace(key, item) if key in TRACE_COLUMNS else _transform(item, pack_trace)
+                for key, item in value.items()
+            }
+        return {
+            key: encode_polyline(item) if key == "path" and isinstance(item, list) else _transform(item, pack_trace)
+            for key, item in value.items()
+        }
+    if isinstance(value, list) and value and isinstance(value[0], (dict, list)):
+        return [_transform(item, pack_trace) for item in value]
+    return value  # 숫자 목록은 그대로
+
+
+def encode_body(body, fmt):
+    """응답 본문을 fmt 형식으로. json/polyline 은 dict, packed 는 bytes."""
+    if fmt == "json":
+        return body
+    if fmt == "polyline":
+        return _transform(body, None)
+    if fmt != "packed":
+        raise ValueError(f"Unknown response format: {fmt}")
+
+    columns, blobs = [], []
+    offset = 0
+
+    def pack_trace(name, values):
+        nonlocal offset
+        data = np.asarray(values, dtype=TRACE_COLUMNS[name]).tobytes()
+        columns.append([TRACE_COLUMNS[name], offset, len(values)])
+        padding = -len(data) % 4  # 다음 열이 4바이트 경계에서 시작하도록
+        blobs.append(data + b"\0" * padding)
+        offset += len(data) + padding
+        return {"$column": len(columns) - 1}
+
+    header = json.dumps(
+        {"body": _transform(body, pack_trace), "columns": columns}, separators=(",", ":")
+    ).encode()
+    header += b" " * (-(_PACKED_PREFIX.size + len(header)) % 4)
+    return b"".join([_PACKED_PREFIX.pack(PACKED_MAGIC, PACKED_VERSION, len(header)), header] + blobs)
+
+
+def decode_packed(data):
+    """
+    encode_body(..., "packed") 의 역. 탐색 기록 열은 숫자 목록으로 되살리고 경로는 polyline
+    문자열 그대로 둔다 (decode_polyline 으로 푼다).
+    """
+    magic, version, header_size = _PACKED_PREFIX.unpack_from(data)
+    if magic != PACKED_MAGIC or version != PACKED_VERSION:
+        raise ValueError("Not a packed route response")
+    start = _PACKED_PREFIX.size + header_size
+    header = json.loads(data[_PACKED_PREFIX.size:start])
+    columns = [
+        np.frombuffer(data, dtype=dtype, count=count, offset=start + offset).tolist()
+        for dtype, offset, count in header["columns"]
+    ]
+
+    def restore(value):
+        if isinstance(value, dict):
+            if "$column" in value:
+                return columns[value["$column"]]
+            return {key: restore(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [restore(item) for item in value]
+        return value
+
+    return restore(header["body"])
@@ -0,0 +1,107 @@
+import math
+import time
+
+from algorithms.heuristics import METERS_PER_DEGREE
+
+TRACE_LEVELS = ("none", "summary", "sampled", "full")
+DIRECTIONS = ("forward", "backward")
+
+
+class SearchTrace:
+    """
+    탐색 과정 기록.
+      summary: 방향별 확정 노드 수와 탐색 시간만
+      sampled: sample_every 번째 노드마다, 같은 격자 셀(cell_size m)에는 하나만
+      full:    확정된 모든 노드
+    노드는 열 단위 배열(lat, lng, cost, parent, direction)로 모은다. parent 는 같은 방향에서
+    직전 노드가 기록된 행 번호이며, 기록되지 않았으면 -1 이다.
+    스트리밍 응답은 take_batch() 로 지난 묶음 이후의 행만 떼어 보낸다.
+    """
+
+    def __init__(self, graph, level="summary", sample_every=10, cell_size=50.0):
+        if level not in TRACE_LEVELS or level == "none":
+            raise ValueError(f"Unsupported trace level: {level}")
+        self.graph = graph
+        self.level = level
+        self.sample_every = sample_every
+        self.cell_size = cell_size
+        self.settled = [0, 0]
+        self.started = time.perf_counter()
+        self.elapsed = None
+
+        self.lat = []
+        self.lng = []
+        self.cost = []
+        self.parent = []
+        self.direction = []
+        self.sent = 0  # take_batch 로 넘긴 행 수
+        self._rows = {}  # (노드, 방향) -> 행 번호
+        self._cells = set()
+
+    def record(self, node, cost, previous_node, direction):
+        """확정된 노드 하나를 기록. direction 은 0(정방향) 또는 1(역방향)."""
+        self.settled[direction] += 1
+        if self.level == "summary":
+            return
+
+        lat, lng = float(self.graph.lat[node]), float(self.graph.lon[node])
+        if self.level == "sampled":
+            if self.settled[direction] % self.sample_every:
+                return
+            cell = (
+                direction,
+                math.floor(lat * METERS_PER_DEGREE / self.cell_size),
+                math.floor(lng * METERS_PER_DEGREE * math.cos(math.radians(lat)) / self.cell_size),
+            )
+            if cell in self._cells:
+                return
+            self._cells.add(cell)
+
+        self._rows[node, direction] = len(self.lat)
+        self.lat.append(lat)
+        self.lng.append(lng)
+        self.cost.append(cost)
+        self.parent.append(self._rows.get((previous_node, direction), -1))
+        self.direction.append(direction)
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    @property
+    def unsent(self):
+        return len(self.lat) - self.sent
+
+    def take_batch(self):
+        """
+        지난 묶음 이후 기록된 행. offset 은 첫 행의 번호로, parent 는 전체 행 번호를 가리킨다.
+        offset 이 0 이면 새 탐색의 첫 묶음이다.
+        """
+        offset, self.sent = self.sent, len(self.lat)
+        return {
+            "offset": offset,
+            "settled": dict(zip(DIRECTIONS, self.settled)),
+            "lat": self.lat[offset:],
+            "lng": self.lng[offset:],
+            "cost": self.cost[offset:],
+            "parent": self.parent[offset:],
+            "direction": self.direction[offset:],
+        }
+
+    def to_dict(self, rows=True):
+        """JSON 응답용 열 단위 표현. rows=False 면 (이미 묶음으로 보낸) 행은 빼고 요약만."""
+        elapsed = self.elapsed if self.elapsed is not None else time.perf_counter() - self.started
+        result = {
+            "level": self.level,
+            "settled": dict(zip(DIRECTIONS, self.settled)),
+            "elapsedMs": round(elapsed * 1000, 3),
+        }
+        if self.level != "summary" and rows:
+            result.update(
+                lat=self.lat,
+                lng=self.lng,
+                cost=self.cost,
+                parent=self.parent,
+                direction=self.direction,
+            )
+        return result
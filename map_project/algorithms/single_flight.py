@@ -0,0 +1,115 @@
+import threading
+import time
+from concurrent.futures import Future
+
+DEFAULT_KEEP = 8  # 끝난 뒤에도 잠시 나눠 쓰는 결과 수
+DEFAULT_TTL = 10.0  # 초
+
+
+class SingleFlight:
+    """
+    같은 (또는 더 넓은 범위가 덮는) 불러오기를 한 번만 실행한다.
+    load(spec, loader) 를 부를 때 진행 중인 불러오기나 ttl 초 안에 끝난 불러오기 중
+    covers(held, spec) 가 참인 것이 있으면 그 결과를 기다려 함께 쓰고, 없으면 loader() 를
+    부른 스레드에서 직접 실행한다. loader 가 예외를 내면 기다리던 요청도 같은 예외를 받는다.
+    결과는 여러 요청이 함께 쓰므로 바꾸지 않아야 한다.
+    refresh(result) 를 주면 결과를 돌려주기 전에 지금 상태에 맞춘 결과(이미 맞으면 result 그대로)로
+    바꾸고, 끝난 결과도 맞춘 것으로 바꿔 둔다. 불러오는 동안 바뀐 상태(엣지 갱신 등)를 놓치지 않는다.
+    """
+
+    def __init__(self, covers, keep=DEFAULT_KEEP, ttl=DEFAULT_TTL, refresh=None):
+        self.covers = covers
+        self.keep = keep
+        self.ttl = ttl
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._in_flight = []  # (spec, Future)
+        self._recent = []  # (끝난 시각, spec, Future), 오래된 것부터
+        self.loads = 0
+        self.shared = 0  # 진행 중인 불러오기를 기다려 받은 수
+        self.reused = 0  # 막 끝난 불러오기 결과를 받은 수
+        self.refreshed = 0  # refresh 로 바꾼 결과 수
+        self.failed = 0
+
+    def _find(self, spec):
+        """spec 을 덮는 (Future, 진행 중 여부). 없으면 (None, False)."""
+        for held, future in self._in_flight:
+            if self.covers(held, spec):
+                return future, True
+        now = time.monotonic()
+        self._recent = [entry for entry in self._recent if now - entry[0] <= self.ttl]
+        for _, held, future in reversed(self._recent):
+            if self.covers(held, spec):
+                return future, False
+        return None, False
+
+    def load(self, spec, loader):
+        with self._lock:
+            future, in_flight = self._find(spec)
+            if future is not None:
+                if in_flight:
+                    self.shared += 1
+                else:
+                    self.reused += 1
+                owner = False
+            else:
+                future = Future()
+                self._in_flight.append((spec, future))
+                self.loads += 1
+                owner = True
+        if not owner:
+            return self._fresh(future)
+
+        try:
+            future.set_result(loader())
+        except Exception as e:
+            future.set_exception(e)
+        with self._lock:
+            self._in_flight = [entry for entry in self._in_flight if entry[1] is not future]
+            if future.exception() is None:
+                self._recent.append((time.monotonic(), spec, future))
+                while len(self._recent) > self.keep:
+                    self._recent.pop(0)
+            else:
+                self.failed += 1
+        return self._fresh(future)
+
+    def _fresh(self, future):
+        """future 의 결과를 refresh 로 맞춘 것. 바뀌었으면 끝난 결과 목록의 future 도 바꾼다."""
+        result = future.result()
+        if self.refresh is None:
+            return result
+        fresh = self.refresh(result)
+        if fresh is not result:
+            done = Future()
+            done.set_result(fresh)
+            with self._lock:
+                self.refreshed += 1
+                self._recent = [(finished, spec, done if held is future else held)
+                                for finished, spec, held in self._recent]
+        return fresh
+
+    def clear(self):
+        """끝난 결과를 버린다 (진행 중인 불러오기는 그대로 끝난다)."""
+        with self._lock:
+            self._recent.clear()
+
+    def discard(self, stale):
+        """끝난 결과 중 stale(결과) 가 참인 것을 버린다. 버린 수."""
+        with self._lock:
+            kept = [entry for entry in self._recent if not stale(entry[2].result())]
+            dropped = len(self._recent) - len(kept)
+            self._recent = kept
+            return dropped
+
+    def stats(self):
+        with self._lock:
+            return {
+                "inFlight": len(self._in_flight),
+                "kept": len(self._recent),
+                "loads": self.loads,
+                "shared": self.shared,
+                "reused": self.reused,
+                "refreshed": self.refreshed,
+                "failed": self.failed,
+            }
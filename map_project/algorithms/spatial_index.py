@@ -0,0 +1,232 @@
+import math
+
+import numpy as np
+
+from algorithms.heuristics import METERS_PER_DEGREE
+
+ITEMS_PER_CELL = 4  # 셀 하나에 들어가는 평균 항목 수
+MIN_CELL_SIZE = 20.0  # m
+
+
+class _Grid:
+    """
+    균일 격자 색인의 공통 부분.
+    좌표를 중심 위도 기준 등장방형(equirectangular) 평면(m)으로 투영하고,
+    항목을 셀 번호 순으로 정렬해 셀마다 CSR 오프셋(cell_offsets, items)을 둔다.
+    to_arrays() 로 격자 설정과 ARRAYS 를 PREFIX 를 붙인 이름의 배열로 내보내 그래프와 함께 저장하면
+    from_arrays() 가 다시 계산하지 않고 (메모리 매핑한 배열 그대로) 색인을 되살린다.
+    """
+
+    PREFIX = None
+    ARRAYS = ("items", "cell_offsets")
+
+    def to_arrays(self):
+        grid = np.array([self.cos_lat, self.x0, self.y0, self.cell_size, self.cols, self.rows], dtype=np.float64)
+        arrays = {f"{self.PREFIX}_grid": grid}
+        arrays.update((f"{self.PREFIX}_{name}", getattr(self, name)) for name in self.ARRAYS)
+        return arrays
+
+    @classmethod
+    def stored_in(cls, arrays):
+        return all(f"{cls.PREFIX}_{name}" in arrays for name in ("grid",) + cls.ARRAYS)
+
+    @classmethod
+    def _restore(cls, arrays):
+        index = cls.__new__(cls)
+        cos_lat, x0, y0, cell_size, cols, rows = np.asarray(arrays[f"{cls.PREFIX}_grid"]).tolist()
+        index.cos_lat, index.x0, index.y0, index.cell_size = cos_lat, x0, y0, cell_size
+        index.cols, index.rows = int(cols), int(rows)
+        for name in cls.ARRAYS:
+            setattr(index, name, arrays[f"{cls.PREFIX}_{name}"])
+        return index
+
+    def _init_grid(self, lat, lon, count):
+        self.cos_lat = math.cos(math.radians(float(lat.mean()))) if len(lat) else 1.0
+        x, y = self._project(lat, lon)
+
+        self.x0 = float(x.min()) if len(x) else 0.0
+        self.y0 = float(y.min()) if len(y) else 0.0
+        width = float(x.max()) - self.x0 if len(x) else 0.0
+        height = float(y.max()) - self.y0 if len(y) else 0.0
+        area = max(width * height, MIN_CELL_SIZE ** 2)
+        self.cell_size = max(math.sqrt(area * ITEMS_PER_CELL / max(count, 1)), MIN_CELL_SIZE)
+        self.cols = int(width // self.cell_size) + 1
+        self.rows = int(height // self.cell_size) + 1
+        return x, y
+
+    def _fill_cells(self, cells, items):
+        """(셀 번호, 항목) 쌍으로 CSR 셀 목록을 만든다."""
+        order = np.argsort(cells, kind="stable")
+        self.items = items[order].astype(np.int32)
+        self.cell_offsets = np.zeros(self.cols * self.rows + 1, dtype=np.int32)
+        np.cumsum(np.bincount(cells, minlength=self.cols * self.rows), out=self.cell_offsets[1:])
+
+    def _project(self, lat, lon):
+        return lon * (METERS_PER_DEGREE * self.cos_lat), lat * METERS_PER_DEGREE
+
+    def _cell_xy(self, x, y):
+        cx = np.floor((x - self.x0) / self.cell_size).astype(np.int64)
+        cy = np.floor((y - self.y0) / self.cell_size).astype(np.int64)
+        return cx, cy
+
+    def _rings(self, x, y):
+        """질의점 셀을 중심으로 (고리 번호, 고리 안 셀 번호 배열) 을 차례로 내놓는다."""
+        cx = int(math.floor((x - self.x0) / self.cell_size))
+        cy = int(math.floor((y - self.y0) / self.cell_size))
+        # 격자 밖의 점이면 격자까지의 셀 거리만큼 먼저 건너뛴다.
+        ring = max(0, -cx, cx - self.cols + 1, -cy, cy - self.rows + 1)
+        max_ring = ring + max(self.cols, self.rows)
+        while ring <= max_ring:
+            yield ring, self._ring_cells(cx, cy, ring)
+            ring += 1
+
+    def _ring_cells(self, cx, cy, ring):
+        """(cx, cy) 를 중심으로 한 체비셰프 거리 ring 의 셀 중 격자 안에 있는 셀 번호."""
+        if ring == 0:
+            cols, rows = np.array([cx]), np.array([cy])
+        else:
+            side = np.arange(-ring, ring + 1)
+            inner = side[1:-1]
+            cols = cx + np.concatenate([side, side, np.full(len(inner), -ring), np.full(len(inner), ring)])
+            rows = cy + np.concatenate([np.full(len(side), -ring), np.full(len(side), ring), inner, inner])
+        inside = (cols >= 0) & (cols < self.cols) & (rows >= 0) & (rows < self.rows)
+        return rows[inside] * self.cols + cols[inside]
+
+    def _members(self, cells):
+        """셀 번호 배열에 속한 항목을 하나의 배열로 모은다."""
+        starts = self.cell_offsets[cells].astype(np.int64)
+        counts = self.cell_offsets[cells + 1] - starts
+        total = int(counts.sum())
+        group_start = np.repeat(np.cumsum(counts) - counts, counts)
+        return self.items[np.repeat(starts, counts) + np.arange(total) - group_start]
+
+
+class SpatialIndex(_Grid):
+    """균일 격자 기반 최근접 노드 색인."""
+
+    PREFIX = "spatial_index"
+    ARRAYS = _Grid.ARRAYS + ("x", "y")
+
+    def __init__(self, lat, lon):
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        self.x, self.y = self._init_grid(lat, lon, len(lat))
+        cx, cy = self._cell_xy(self.x, self.y)
+        self._fill_cells(cy * self.cols + cx, np.arange(len(lat)))
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """to_arrays() 로 저장한 색인."""
+        return cls._restore(arrays)
+
+    def nearest(self, lat, lon):
+        """가장 가까운 노드 인덱스. 셀 고리를 넓혀 가며 찾고, 남은 고리가 더 멀면 멈춘다."""
+        x, y = self._project(lat, lon)
+        best_node, best_dist = -1, float("inf")
+
+        for ring, cells in self._rings(x, y):
+            members = self._members(cells)
+            if len(members):
+                dist = (self.x[members] - x) ** 2 + (self.y[members] - y) ** 2
+                i = int(np.argmin(dist))
+                if dist[i] < best_dist:
+                    best_node, best_dist = int(members[i]), float(dist[i])
+            # 다음 고리의 셀은 모두 ring * cell_size 보다 멀다.
+            if best_dist <= (ring * self.cell_size) ** 2:
+                break
+        return best_node
+
+    def snap_many(self, lats, lons):
+        """
+        여러 좌표를 한 번에 최근접 노드로 스냅.
+        주변 3x3 셀을 벡터 연산으로 검사하고, 최근접 거리가 셀 크기보다 커서
+        3x3 범위 밖에 더 가까운 노드가 있을 수 있는 점만 nearest() 로 다시 찾는다.
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        x, y = self._project(lats, lons)
+        cx, cy = self._cell_xy(x, y)
+        best_node = np.full(len(x), -1, dtype=np.int64)
+        best_dist = np.full(len(x), np.inf)
+
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                col, row = cx + dx, cy + dy
+                queries = np.nonzero((col >= 0) & (col < self.cols) & (row >= 0) & (row < self.rows))[0]
+                cells = row[queries] * self.cols + col[queries]
+                counts = self.cell_offsets[cells + 1] - self.cell_offsets[cells]
+                # 질의별 후보 노드를 하나의 배열로 펼친다.
+                query_of = np.repeat(queries, counts)
+                nodes = self._members(cells)
+                dist = (self.x[nodes] - x[query_of]) ** 2 + (self.y[nodes] - y[query_of]) ** 2
+
+                np.minimum.at(best_dist, query_of, dist)
+                hit = dist == best_dist[query_of]
+                best_node[query_of[hit]] = nodes[hit]
+
+        for i in np.nonzero(best_dist > self.cell_size ** 2)[0]:
+            best_node[i] = self.nearest(lats[i], lons[i])
+        return best_node
+
+
+class EdgeIndex(_Grid):
+    """
+    균일 격자 기반 최근접 도로 구간(엣지) 색인.
+    엣지는 양 끝 노드를 잇는 선분으로 보고, 선분의 bbox 가 걸치는 모든 셀에 등록한다.
+    """
+
+    PREFIX = "edge_index"
+    ARRAYS = _Grid.ARRAYS + ("sources", "ax", "ay", "bx", "by")
+
+    def __init__(self, graph):
+        sources = np.repeat(np.arange(graph.num_nodes, dtype=np.int32), np.diff(graph.fwd_offsets))
+        targets = np.asarray(graph.fwd_targets)
+        self.sources = sources
+        self.targets = targets
+
+        node_x, node_y = self._init_grid(np.asarray(graph.lat), np.asarray(graph.lon), graph.num_edges)
+        self.ax, self.ay = node_x[sources], node_y[sources]
+        self.bx, self.by = node_x[targets], node_y[targets]
+
+        # 엣지 bbox 가 덮는 셀 (cx0..cx1, cy0..cy1) 을 엣지별로 펼친다.
+        cx0, cy0 = self._cell_xy(np.minimum(self.ax, self.bx), np.minimum(self.ay, self.by))
+        cx1, cy1 = self._cell_xy(np.maximum(self.ax, self.bx), np.maximum(self.ay, self.by))
+        widths = cx1 - cx0 + 1
+        counts = widths * (cy1 - cy0 + 1)
+        edges = np.repeat(np.arange(len(sources)), counts)
+        local = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+        cols = cx0[edges] + local % widths[edges]
+        rows = cy0[edges] + local // widths[edges]
+        self._fill_cells(rows * self.cols + cols, edges)
+
+    @classmethod
+    def from_arrays(cls, arrays, graph):
+        """to_arrays() 로 저장한 색인. targets 는 graph 의 fwd_targets 를 함께 쓴다."""
+        index = cls._restore(arrays)
+        index.targets = np.asarray(graph.fwd_targets)
+        return index
+
+    def nearest(self, lat, lon):
+        """
+        가장 가까운 엣지에 수직 투영한 결과 (엣지 위치, 비율 0..1, 거리 m).
+        등록되지 않은 엣지는 지금까지 본 고리 밖에 있으므로 ring * cell_size 보다 멀다.
+        """
+        x, y = self._project(lat, lon)
+        best = (-1, 0.0, float("inf"))
+
+        for ring, cells in self._rings(x, y):
+            edges = np.unique(self._members(cells))
+            if len(edges):
+                ax, ay, bx, by = self.ax[edges], self.ay[edges], self.bx[edges], self.by[edges]
+                dx, dy = bx - ax, by - ay
+                length_sq = dx * dx + dy * dy
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    t = np.where(length_sq > 0, ((x - ax) * dx + (y - ay) * dy) / length_sq, 0.0)
+                t = np.clip(t, 0.0, 1.0)
+                dist = (ax + t * dx - x) ** 2 + (ay + t * dy - y) ** 2
+                i = int(np.argmin(dist))
+                if dist[i] < best[2]:
+                    best = (int(edges[i]), float(t[i]), float(dist[i]))
+            if best[2] <= (ring * self.cell_size) ** 2:
+                break
+        return best[0], best[1], math.sqrt(best[2])
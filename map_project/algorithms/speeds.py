@@ -0,0 +1,63 @@
+import re
+
+# OSM maxspeed 태그가 없을 때 쓰는 도로 등급(highway)별 기본 속도 (km/h)
+HIGHWAY_SPEEDS = {
+    "motorway": 100.0,
+    "motorway_link": 60.0,
+    "trunk": 80.0,
+    "trunk_link": 50.0,
+    "primary": 60.0,
+    "primary_link": 40.0,
+    "secondary": 50.0,
+    "secondary_link": 40.0,
+    "tertiary": 40.0,
+    "tertiary_link": 30.0,
+    "unclassified": 30.0,
+    "residential": 30.0,
+    "road": 30.0,
+    "service": 20.0,
+    "living_street": 10.0,
+}
+DEFAULT_SPEED = 30.0  # 등급도 모를 때 (km/h)
+MIN_SPEED = 5.0
+MAX_SPEED = 120.0  # 이보다 빠른 태그 값은 잘라낸다. 이동 시간 하한(코리도 한도 등)의 기준이다.
+MPH = 1.609344
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def kph_to_mps(speed):
+    return speed / 3.6
+
+
+def _first(value):
+    """osmnx 가 여러 값을 목록으로 합친 태그는 첫 값을 쓴다."""
+    if isinstance(value, (list, tuple)):
+        return value[0] if value else None
+    return value
+
+
+def parse_maxspeed(value):
+    """
+    OSM maxspeed 태그 값을 km/h 로. "50", "30 mph", "60;80"(첫 값) 을 읽고,
+    숫자가 없는 값("KR:urban", "none", "signals" 등)은 None.
+    """
+    value = _first(value)
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).split(";")[0].strip().lower()
+    match = _NUMBER.match(text)
+    if not match:
+        return None
+    speed = float(match.group())
+    return speed * MPH if "mph" in text else speed
+
+
+def edge_speed(data):
+    """엣지 속성(maxspeed, highway) 으로 정한 주행 속도 (km/h, MIN_SPEED..MAX_SPEED)."""
+    speed = parse_maxspeed(data.get("maxspeed"))
+    if not speed:
+        speed = HIGHWAY_SPEEDS.get(_first(data.get("highway")), DEFAULT_SPEED)
+    return min(max(speed, MIN_SPEED), MAX_SPEED)
@@ -0,0 +1,185 @@
+import math
+
+import numpy as np
+
+from algorithms.heuristics import METERS_PER_DEGREE, ROAD_EARTH_RADIUS
+from algorithms.speeds import HIGHWAY_SPEEDS
+
+DEFAULT_SPACING = 100.0  # 교차로 간격 (m)
+ARTERIAL_EVERY = 10  # 이 간격(격자 줄, 방사형 고리)마다 간선도로
+ARTERIAL_SPEED = HIGHWAY_SPEEDS["primary"]
+LOCAL_SPEED = HIGHWAY_SPEEDS["residential"]
+
+
+def _orient(a, b, rng, oneway_ratio, missing_ratio):
+    """
+    무방향 도로 (a[i], b[i]) 중 일부는 없애고 일부는 (임의 방향의) 일방통행으로 만든 유향 엣지.
+    (u, v, 원래 도로 번호) 를 반환한다.
+    """
+    keep = np.flatnonzero(rng.random(len(a)) >= missing_ratio)
+    a, b = a[keep], b[keep]
+    flip = rng.random(len(a)) < 0.5
+    a, b = np.where(flip, b, a), np.where(flip, a, b)
+    two_way = rng.random(len(a)) >= oneway_ratio
+    return (np.concatenate([a, b[two_way]]), np.concatenate([b, a[two_way]]),
+            np.concatenate([keep, keep[two_way]]))
+
+
+def _road_arrays(lat, lon, edge_u, edge_v, edge_speed, rng):
+    """노드 인덱스로 만든 도로망을 TileCache.bbox_arrays() 와 같은 형식의 배열로."""
+    # 도로 길이는 직선거리보다 길거나 같다 (휴리스틱이 허용 가능하도록).
+    phi1, phi2 = np.radians(lat[edge_u]), np.radians(lat[edge_v])
+    a = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(lon[edge_v] - lon[edge_u]) / 2) ** 2
+    length = 2 * ROAD_EARTH_RADIUS * np.arcsin(np.sqrt(a)) * (1 + rng.random(len(edge_u)) * 0.3)
+
+    node_ids = np.arange(len(lat), dtype=np.int64) + 1
+    return {
+        "node_ids": node_ids,
+        "node_lat": lat,
+        "node_lon": lon,
+        "edge_u": node_ids[edge_u],
+        "edge_v": node_ids[edge_v],
+        "edge_key": np.zeros(len(edge_u), dtype=np.int32),
+        "edge_length": length,
+        "edge_speed": edge_speed.astype(np.float32),
+    }
+
+
+def grid_city(size, spacing=DEFAULT_SPACING, oneway_ratio=0.2, missing_ratio=0.05, seed=0, south=37.5, west=127.0):
+    """
+    격자 도로망 (size x size 교차로, 간격 spacing m, 남서쪽 모서리 (south, west)).
+    좌표를 조금씩 흔들고, 일부 도로는 없애거나 일방통행으로 만든다. ARTERIAL_EVERY 줄마다 간선도로다.
+    """
+    rng = np.random.default_rng(seed)
+    count = size * size
+    rows, cols = np.divmod(np.arange(count), size)
+    step = spacing / METERS_PER_DEGREE
+    lat = south + rows * step + rng.normal(0, step * 0.2, count)
+    lon = west + cols * step / np.cos(np.radians(south)) + rng.normal(0, step * 0.2, count)
+
+    grid = np.arange(count).reshape(size, size)
+    edge_u, edge_v, edge_speed = [], [], []
+    for a, b, line in ((grid[:, :-1], grid[:, 1:], rows), (grid[:-1, :], grid[1:, :], cols)):
+        a, b = a.ravel(), b.ravel()
+        u, v, road = _orient(a, b, rng, oneway_ratio, missing_ratio)
+        edge_u.append(u)
+        edge_v.append(v)
+        edge_speed.append(np.where(line[a[road]] % ARTERIAL_EVERY == 0, ARTERIAL_SPEED, LOCAL_SPEED))
+    return _road_arrays(lat, lon, np.concatenate(edge_u), np.concatenate(edge_v), np.concatenate(edge_speed), rng)
+
+
+def radial_city(rings, spacing=DEFAULT_SPACING, oneway_ratio=0.2, missing_ratio=0.05, seed=0, south=37.5, west=127.0,
+                spokes=8):
+    """
+    방사형 도로망: 중심에서 spacing m 간격의 고리 rings 개. 고리 위 교차로도 약 spacing 간격이라
+    바깥 고리일수록 교차로가 많고, 고리 사이는 한 교차로 걸러 하나씩 안쪽 고리와 잇는다.
+    spokes 개의 방사 도로와 ARTERIAL_EVERY 번째 고리는 간선도로이며 없애지 않는다.
+    """
+    rng = np.random.default_rng(seed)
+    ring_of = np.arange(1, rings + 1)
+    per_ring = spokes * np.maximum(1, np.rint(2 * np.pi * ring_of / spokes)).astype(np.int64)  # spokes 의 배수
+    first = np.concatenate([[1], 1 + np.cumsum(per_ring)[:-1]])  # 0 번 노드는 중심
+    count = 1 + int(per_ring.sum())
+
+    ring = np.concatenate([[0], np.repeat(ring_of, per_ring)])
+    index = np.arange(count) - np.concatenate([[0], np.repeat(first, per_ring)])  # 고리 안에서의 번호
+    size = np.concatenate([[1], np.repeat(per_ring, per_ring)])
+    angle = 2 * np.pi * index / size
+    radius = ring * spacing + rng.normal(0, spacing * 0.1, count) * (ring > 0)
+    step = 1 / METERS_PER_DEGREE
+    center_lat = south + rings * spacing * step
+    lat = center_lat + radius * np.sin(angle) * step
+    lon = west + (rings * spacing + radius * np.cos(angle)) * step / np.cos(np.radians(center_lat))
+
+    # 고리를 따라 이웃한 교차로
+    nodes = np.arange(1, count)
+    following = np.where(index[nodes] + 1 < size[nodes], nodes + 1, nodes + 1 - size[nodes])
+    ring_arterial = ring[nodes] % ARTERIAL_EVERY == 0
+    # 안쪽 고리로: 각도가 가장 가까운 교차로
+    inner = np.zeros(count, dtype=np.int64)
+    outer = ring > 1
+    inner_size = np.where(outer, per_ring[np.maximum(ring - 2, 0)], 1)
+    inner[outer] = first[ring[outer] - 2] + np.rint(index[outer] * inner_size[outer] / size[outer]).astype(np.int64) % inner_size[outer]
+    spoke = index % (size // spokes).clip(min=1) == 0
+    radial = (ring > 0) & ((index % 2 == 0) | spoke)
+
+    a = np.concatenate([nodes, np.flatnonzero(radial)])
+    b = np.concatenate([following, inner[radial]])
+    arterial = np.concatenate([ring_arterial, spoke[radial]])
+    edge_u, edge_v, edge_speed = [], [], []
+    for main in (True, False):
+        u, v, road = _orient(a[arterial == main], b[arterial == main], rng, oneway_ratio,
+                             0.0 if main else missing_ratio)
+        edge_u.append(u)
+        edge_v.append(v)
+        edge_speed.append(np.full(len(u), ARTERIAL_SPEED if main else LOCAL_SPEED))
+    return _road_arrays(lat, lon, np.concatenate(edge_u), np.concatenate(edge_v), np.concatenate(edge_speed), rng)
+
+
+def random_city(size, spacing=DEFAULT_SPACING, oneway_ratio=0.2, missing_ratio=0.05, seed=0, south=37.5, west=127.0,
+                radius=1.4, empty_ratio=0.1):
+    """
+    임의 기하 그래프 도로망: spacing m 칸 size x size 개에 교차로를 하나씩 임의 위치에 두고
+    (empty_ratio 만큼의 칸은 비움) 거리 radius * spacing 이내의 교차로끼리 모두 잇는다.
+    한 칸에 교차로가 하나뿐이라 이웃은 ceil(radius) 칸 안에서만 찾으면 된다.
+    ARTERIAL_EVERY 번째 줄(행 또는 열) 안에서 잇는 도로는 간선도로다.
+    """
+    rng = np.random.default_rng(seed)
+    occupied = rng.random((size, size)) >= empty_ratio
+    rows, cols = np.nonzero(occupied)
+    count = len(rows)
+    cell = np.full((size, size), -1, dtype=np.int64)
+    cell[rows, cols] = np.arange(count)
+    y = (rows + rng.random(count)) * spacing
+    x = (cols + rng.random(count)) * spacing
+
+    reach = math.ceil(radius)
+    a, b = [], []
+    for dr in range(reach + 1):
+        for dc in range(-reach, reach + 1):
+            if dr == 0 and dc <= 0:
+                continue
+            here = cell[:size - dr, max(-dc, 0):size - max(dc, 0)].ravel()
+            there = cell[dr:, max(dc, 0):size - max(-dc, 0)].ravel()
+            pair = (here >= 0) & (there >= 0)
+            here, there = here[pair], there[pair]
+            close = np.hypot(y[there] - y[here], x[there] - x[here]) <= radius * spacing
+            a.append(here[close])
+            b.append(there[close])
+    a, b = np.concatenate(a), np.concatenate(b)
+    arterial = ((rows[a] == rows[b]) & (rows[a] % ARTERIAL_EVERY == 0)) \
+        | ((cols[a] == cols[b]) & (cols[a] % ARTERIAL_EVERY == 0))
+    edge_u, edge_v, road = _orient(a, b, rng, oneway_ratio, missing_ratio)
+
+    lat = south + y / METERS_PER_DEGREE
+    lon = west + x / METERS_PER_DEGREE / np.cos(np.radians(south))
+    edge_speed = np.where(arterial[road], ARTERIAL_SPEED, LOCAL_SPEED)
+    return _road_arrays(lat, lon, edge_u, edge_v, edge_speed, rng)
+
+
+CITY_KINDS = ("grid", "radial", "random")
+
+
+def city_arrays(kind="grid", nodes=40000, seed=0, spacing=DEFAULT_SPACING, oneway_ratio=0.2, missing_ratio=0.05,
+                lat=None, lng=None):
+    """
+    교차로가 약 nodes 개인 kind(CITY_KINDS) 도로망 배열. lat/lng 를 주면 도로망의 중심이
+    그 좌표가 되고, 없으면 남서쪽 모서리가 (37.5, 127.0) 이다. 교차로당 (유향) 엣지는 2.5~4 개 정도다.
+    """
+    if kind == "grid":
+        size = max(2, round(math.sqrt(nodes)))
+        generate, extent = grid_city, size * spacing
+    elif kind == "radial":
+        size = max(1, round(math.sqrt(nodes / math.pi)))
+        generate, extent = radial_city, 2 * size * spacing
+    elif kind == "random":
+        size = max(2, round(math.sqrt(nodes)))
+        generate, extent = random_city, size * spacing
+    else:
+        raise ValueError(f"Unknown city kind: {kind} (expected one of {', '.join(CITY_KINDS)})")
+
+    south, west = 37.5, 127.0
+    if lat is not None and lng is not None:
+        south = lat - extent / 2 / METERS_PER_DEGREE
+        west = lng - extent / 2 / METERS_PER_DEGREE / math.cos(math.radians(south))
+    return generate(size, spacing, oneway_ratio, missing_ratio, seed, south, west)
@@ -0,0 +1,225 @@
+import argparse
+import math
+import os
+
+import networkx as nx
+import numpy as np
+import osmnx as ox
+
+from algorithms.speeds import edge_speed
+
+TILE_SIZE = 0.02  # 타일 한 변의 크기 (도 단위, 약 2km)
+TILE_BUFFER = 0.002  # 타일 경계를 넘는 도로를 잇기 위한 여유 범위
+FORMAT_VERSION = 2  # 2: 엣지 주행 속도(edge_speed, km/h) 추가
+
+DEFAULT_TILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "tiles")
+
+
+class TileNotCachedError(Exception):
+    """오프라인 모드에서 캐시에 없는 타일을 요청한 경우."""
+
+
+def graph_from_arrays(arrays):
+    """bbox_arrays() 형식의 배열을 networkx MultiDiGraph 로."""
+    graph = nx.MultiDiGraph(crs="epsg:4326")
+    graph.add_nodes_from(
+        (int(node), {"y": float(lat), "x": float(lon)})
+        for node, lat, lon in zip(arrays["node_ids"], arrays["node_lat"], arrays["node_lon"])
+    )
+    graph.add_edges_from(
+        (int(u), int(v), int(k), {"length": float(length), "speed_kph": float(speed)})
+        for u, v, k, length, speed in zip(
+            arrays["edge_u"], arrays["edge_v"], arrays["edge_key"], arrays["edge_length"],
+            arrays["edge_speed"],
+        )
+    )
+    return graph
+
+
+class TileCache:
+    """
+    도로 그래프를 고정 크기 타일로 나누어 디스크에 캐시한다.
+    타일은 단순화하지 않은(simplify=False) OSM 그래프로 저장하므로 노드 ID가 타일 간에
+    일관되고, 엣지는 시작 노드가 속한 타일에만 저장되어 이어 붙일 때 중복이 없다.
+    """
+
+    def __init__(self, directory=DEFAULT_TILE_DIR, tile_size=TILE_SIZE, network_type="drive", offline=False):
+        self.directory = os.path.join(directory, f"{network_type}_{tile_size:g}")
+        self.tile_size = tile_size
+        self.network_type = network_type
+        self.offline = offline
+
+    def tile_of(self, lat, lon):
+        """좌표가 속한 타일의 (row, col) 키."""
+        return int(math.floor(lat / self.tile_size)), int(math.floor(lon / self.tile_size))
+
+    def tile_keys(self, north, south, east, west):
+        """bbox를 덮는 모든 타일 키."""
+        row_min, col_min = self.tile_of(south, west)
+        row_max, col_max = self.tile_of(north, east)
+        return [
+            (row, col)
+            for row in range(row_min, row_max + 1)
+            for col in range(col_min, col_max + 1)
+        ]
+
+    def tile_bounds(self, key):
+        """타일의 (north, south, east, west)."""
+        row, col = key
+        south = row * self.tile_size
+        west = col * self.tile_size
+        return south + self.tile_size, south, west + self.tile_size, west
+
+    def tile_path(self, key):
+        row, col = key
+        return os.path.join(self.directory, f"{row}_{col}.npz")
+
+    def has_tile(self, key):
+        """지금 형식(FORMAT_VERSION)으로 캐시된 타일이 있는지. 이전 형식 타일은 다시 받는다."""
+        if not os.path.exists(self.tile_path(key)):
+            return False
+        with np.load(self.tile_path(key)) as data:
+            return int(data["version"]) == FORMAT_VERSION
+
+    def load_tile(self, key):
+        """디스크에서 타일 배열을 읽는다."""
+        tile = self._read_tile(key)
+        if tile is None:
+            raise ValueError(f"Unsupported tile format in {self.tile_path(key)}")
+        return tile
+
+    def _read_tile(self, key):
+        """캐시된 타일 배열. 이전 형식이면 None."""
+        with np.load(self.tile_path(key)) as data:
+            if int(data["version"]) != FORMAT_VERSION:
+                return None
+            return {name: data[name] for name in data.files if name != "version"}
+
+    def fetch_tile(self, key):
+        """OSM에서 타일을 내려받아 저장하고 배열을 반환한다."""
+        if self.offline:
+            raise TileNotCachedError(f"Tile {key} is not cached (or is in an old format) and offline mode is on")
+
+        north, south, east, west = self.tile_bounds(key)
+        print(f"Fetching tile {key}: north={north}, south={south}, east={east}, west={west}")
+        try:
+            graph = ox.graph_from_bbox(
+                north=north + TILE_BUFFER,
+                south=south - TILE_BUFFER,
+                east=east + TILE_BUFFER,
+                west=west - TILE_BUFFER,
+                network_type=self.network_type,
+                simplify=False,
+                retain_all=True,
+                truncate_by_edge=True,
+            )
+        except (ox._errors.EmptyOverpassResponse, ValueError):
+            # 도로가 없는 타일(바다, 산 등)도 빈 타일로 저장해 다시 요청하지 않는다.
+            graph = nx.MultiDiGraph()
+
+        tile = self._tile_arrays(graph, key)
+        self._save_tile(key, tile)
+        return tile
+
+    def get_tile(self, key):
+        if os.path.exists(self.tile_path(key)):
+            tile = self._read_tile(key)
+            if tile is not None:
+                return tile
+        return self.fetch_tile(key)
+
+    def bbox_arrays(self, north, south, east, west):
+        """
+        bbox를 덮는 타일을 이어 붙여 범위 안의 노드와 그 노드끼리 잇는 엣지 배열을 만든다.
+        없는 타일만 새로 받는다.
+        """
+        tiles = [self.get_tile(key) for key in self.tile_keys(north, south, east, west)]
+
+        node_ids, first = np.unique(np.concatenate([t["node_ids"] for t in tiles]), return_index=True)
+        node_lat = np.concatenate([t["node_lat"] for t in tiles])[first]
+        node_lon = np.concatenate([t["node_lon"] for t in tiles])[first]
+        edge_u = np.concatenate([t["edge_u"] for t in tiles])
+        edge_v = np.concatenate([t["edge_v"] for t in tiles])
+        edge_key = np.concatenate([t["edge_key"] for t in tiles])
+        edge_length = np.concatenate([t["edge_length"] for t in tiles])
+        edge_speed = np.concatenate([t["edge_speed"] for t in tiles])
+
+        # 요청 범위 밖의 노드와 그 노드에 닿는 엣지는 제외
+        inside = (node_lat <= north) & (node_lat >= south) & (node_lon <= east) & (node_lon >= west)
+        kept = node_ids[inside]
+        edge_mask = np.isin(edge_u, kept) & np.isin(edge_v, kept)
+        return {
+            "node_ids": kept,
+            "node_lat": node_lat[inside],
+            "node_lon": node_lon[inside],
+            "edge_u": edge_u[edge_mask],
+            "edge_v": edge_v[edge_mask],
+            "edge_key": edge_key[edge_mask],
+            "edge_length": edge_length[edge_mask],
+            "edge_speed": edge_speed[edge_mask],
+        }
+
+    def load_bbox(self, north, south, east, west):
+        """bbox 안의 도로 그래프 (networkx MultiDiGraph)."""
+        return graph_from_arrays(self.bbox_arrays(north, south, east, west))
+
+    def describe(self):
+        return {"provider": "osm", "directory": self.directory, "offline": self.offline}
+
+    def prefetch(self, north, south, east, west):
+        """bbox를 덮는 타일을 미리 받아 둔다. 받은 타일 수를 반환."""
+        missing = [key for key in self.tile_keys(north, south, east, west) if not self.has_tile(key)]
+        for key in missing:
+            self.fetch_tile(key)
+        return len(missing)
+
+    def _tile_arrays(self, graph, key):
+        """타일 내부에서 출발하는 엣지와 그 엣지가 닿는 노드만 배열로 추출."""
+        edges = [
+            (u, v, k, data.get("length", 1), edge_speed(data))
+            for u, v, k, data in graph.edges(keys=True, data=True)
+            if self.tile_of(graph.nodes[u]["y"], graph.nodes[u]["x"]) == key
+        ]
+        nodes = {
+            node for node, data in graph.nodes(data=True)
+            if self.tile_of(data["y"], data["x"]) == key
+        }
+        nodes.update(v for _, v, _, _, _ in edges)
+        nodes = sorted(nodes)
+
+        return {
+            "node_ids": np.array(nodes, dtype=np.int64),
+            "node_lat": np.array([graph.nodes[n]["y"] for n in nodes], dtype=np.float64),
+            "node_lon": np.array([graph.nodes[n]["x"] for n in nodes], dtype=np.float64),
+            "edge_u": np.array([e[0] for e in edges], dtype=np.int64),
+            "edge_v": np.array([e[1] for e in edges], dtype=np.int64),
+            "edge_key": np.array([e[2] for e in edges], dtype=np.int32),
+            "edge_length": np.array([e[3] for e in edges], dtype=np.float64),
+            "edge_speed": np.array([e[4] for e in edges], dtype=np.float32),
+        }
+
+    def _save_tile(self, key, tile):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.tile_path(key)
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(tmp_path, version=FORMAT_VERSION, **tile)
+        os.replace(tmp_path, path)  # 동시에 읽는 요청이 반쯤 쓰인 파일을 보지 않도록
+
+
+def main():
+    parser = argparse.ArgumentParser(description="bbox를 덮는 도로 그래프 타일을 미리 내려받는다.")
+    parser.add_argument("north", type=float)
+    parser.add_argument("south", type=float)
+    parser.add_argument("east", type=float)
+    parser.add_argument("west", type=float)
+    parser.add_argument("--dir", default=os.getenv("GRAPH_TILE_DIR", DEFAULT_TILE_DIR))
+    parser.add_argument("--network-type", default="drive")
+    args = parser.parse_args()
+
+    cache = TileCache(args.dir, network_type=args.network_type)
+    fetched = cache.prefetch(args.north, args.south, args.east, args.west)
+    print(f"Fetched {fetched} tiles into {cache.directory}")
+
+
+if __name__ == "__main__":
+    main()
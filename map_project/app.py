@@ -1,20 +1,22 @@
-from flask import Flask, jsonify, request, render_template, session
+from flask import Flask, Response, jsonify, request, render_template, session
 from flask_socketio import SocketIO, emit, join_room, leave_room
-from algorithms.path_finder import (
-    a_star_search,
-    bidirectional_a_star,
-    prepare_graph,
-    get_closest_node,
-)
-from algorithms.road_network import load_dynamic_graph
 from dotenv import load_dotenv
 import os
 import secrets
-import math
+import threading
+import time
 
-# 환경 변수 로드
+# 환경 변수 로드 (routing 이 모듈을 불러올 때 환경 변수를 읽으므로 먼저 로드)
 load_dotenv()
 
+from algorithms.road_network import edge_updates, graph_loads, graph_provider
+from algorithms.route_cache import combine_stats
+from algorithms.route_encoding import RESPONSE_FORMATS, encode_body
+from routing import (
+    STREAM_REQUESTS, metrics, region_summaries, route_cache, run_route_request, update_edges_result,
+)
+from route_jobs import DEFAULT_WORKERS, QueueFullError, RouteJobPool
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 socketio = SocketIO(app, cors_allowed_origins="*")
@@ -25,17 +27,86 @@ GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
 # 채팅방 정보를 저장할 딕셔너리
 rooms = {}
 
-def haversine(lat1, lon1, lat2, lon2):
-    """두 지점 간의 대원 거리 계산 (단위: m)"""
-    R = 6371000  # 지구 반경 (미터)
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-    
-    a = math.sin(dphi/2)**2 + \
-        math.cos(phi1) * math.cos(phi2) * math.sin(dlambda/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    return R * c
+def notify_route_job(job):
+    """끝난 경로 작업을 요청한 클라이언트에게 Socket.IO 로 알린다 (결과는 요청한 형식으로)."""
+    if job["sid"]:
+        payload = public_job(job)
+        if job["httpStatus"] < 400:
+            began = time.perf_counter()
+            payload["result"] = encode_body(job["result"], job["format"])
+            metrics.observe_stage(job["type"], "encode", time.perf_counter() - began)
+        socketio.emit("route_job", payload, to=job["sid"])
+
+def notify_route_batch(job, batch, ack):
+    """스트리밍 작업의 탐색 기록 묶음을 보낸다. 클라이언트가 받았다고 응답하면 ack() 를 부른다."""
+    socketio.emit("route_batch", encode_body(batch, job["format"]), to=job["sid"],
+                  callback=lambda *args: ack())
+
+def public_job(job):
+    return {key: value for key, value in job.items() if key != "sid"}
+
+def response_format():
+    """Accept 헤더로 고른 응답 형식 (RESPONSE_FORMATS 의 값). 지정하지 않으면 json."""
+    media_type = request.accept_mimetypes.best_match(list(RESPONSE_FORMATS), default="application/json")
+    return RESPONSE_FORMATS[media_type]
+
+def body_response(body, status=200, fmt="json"):
+    """응답 본문을 fmt 형식으로 보낸다. 오류 응답은 항상 JSON 이다."""
+    if fmt == "json" or status >= 400:
+        return jsonify(body), status
+    media_type = next(key for key, value in RESPONSE_FORMATS.items() if value == fmt)
+    if fmt == "packed":
+        return Response(encode_body(body, fmt), status, mimetype=media_type)
+    response = jsonify(encode_body(body, fmt))
+    response.mimetype = media_type
+    return response, status
+
+# 경로 탐색은 별도 프로세스 풀에서 실행한다. 작업 프로세스는 spawn 으로 뜨면서 python app.py 로 실행한
+# 이 모듈을 (__mp_main__ 으로) 다시 실행하므로, 풀은 모듈을 불러올 때가 아니라 처음 쓸 때 만든다.
+route_jobs = None
+_route_jobs_lock = threading.Lock()
+
+def route_job_pool():
+    """경로 작업 풀 (RouteJobPool). 처음 부를 때 만든다."""
+    global route_jobs
+    with _route_jobs_lock:
+        if route_jobs is None:
+            route_jobs = RouteJobPool(
+                notify_route_job,
+                workers=int(os.getenv("ROUTE_JOB_WORKERS", DEFAULT_WORKERS)),
+                max_pending=int(os.getenv("ROUTE_JOB_MAX_PENDING", 0)) or None,
+                notify_batch=notify_route_batch,
+                metrics=metrics,
+            )
+        return route_jobs
+
+def route_response(kind, data):
+    """
+    경로 요청 응답. Socket.IO 연결 ID(sid)를 함께 보내면 작업 풀에 넣고 바로 작업 ID 를
+    돌려주며(202), 결과는 'route_job' 이벤트로 보낸다. sid 가 없으면 요청 스레드에서 처리한다.
+    stream 을 함께 켜면 탐색 중에 기록 묶음을 'route_batch' 이벤트로 먼저 보낸다.
+    결과 형식은 Accept 헤더로 고르며 (response_format), 작업 결과와 기록 묶음에도 같은 형식을 쓴다.
+    "timing": true 를 함께 보내면 결과에 단계별 처리 시간과 탐색 카운터를 싣는다 (직렬화 시간은 빠진다).
+    """
+    sid = data.get("sid") if data else None
+    stream = bool(data.get("stream")) if data else False
+    fmt = response_format()
+    if stream and not sid:
+        return jsonify({"error": "Streaming requires a Socket.IO sid"}), 400
+    if not sid:
+        body, status, timing = run_route_request(kind, data or {})
+        metrics.observe_request(kind, status, timing)
+        began = time.perf_counter()
+        response = body_response(body, status, fmt)
+        metrics.observe_stage(kind, "encode", time.perf_counter() - began)
+        return response
+    if stream and kind not in STREAM_REQUESTS:
+        return jsonify({"error": f"Streaming is not supported for {kind}"}), 400
+    try:
+        job = route_job_pool().submit(kind, data, sid, stream=stream, format=fmt)
+    except QueueFullError as e:
+        return jsonify({"error": str(e)}), 503
+    return jsonify(public_job(job)), 202
 
 @app.route("/")
 def index():
@@ -115,113 +186,80 @@ def handle_message(data):
 
 @app.route("/find-path", methods=["POST"])
 def find_path():
-    try:
-        data = request.json
-        start = data.get("start")
-        end = data.get("end")
-
-        if not start or not end:
-            return jsonify({"error": "Start or End coordinates are missing"}), 400
-
-        # 선택된 좌표를 기준으로 그래프 로드
-        graph = load_dynamic_graph(start, end)
-        node_positions, adjacency_list = prepare_graph(graph)
-
-        # 가장 가까운 노드 찾기
-        start_node = get_closest_node(start["lat"], start["lng"], node_positions)
-        end_node = get_closest_node(end["lat"], end["lng"], node_positions)
-
-        # 양방향 A* 경로 탐색
-        path, explored_nodes = bidirectional_a_star(
-            start_node, end_node, node_positions, adjacency_list
-        )
-
-        # 경로를 좌표로 변환
-        path_coords = [
-            {"lat": node_positions[node][0], "lng": node_positions[node][1]}
-            for node in path
-        ]
-
-        return jsonify({
-            "path": path_coords,
-            "exploredNodes": explored_nodes
-        })
-
-    except Exception as e:
-        print("Error in /find-path:", str(e))
-        return jsonify({"error": str(e)}), 500
+    return route_response("find-path", request.json)
 
 @app.route("/find-midpoint", methods=["POST"])
 def find_midpoint():
-    try:
-        data = request.json
-        start = data.get("start")
-        end = data.get("end")
-
-        if not start or not end:
-            return jsonify({"error": "두 위치 정보가 필요합니다"}), 400
-
-        # 그래프 로드
-        graph = load_dynamic_graph(start, end)
-        node_positions, adjacency_list = prepare_graph(graph)
-
-        # 가장 가까운 노드 찾기
-        start_node = get_closest_node(start["lat"], start["lng"], node_positions)
-        end_node = get_closest_node(end["lat"], end["lng"], node_positions)
-
-        # 최단 경로 찾기
-        path, _ = bidirectional_a_star(start_node, end_node, node_positions, adjacency_list)
-
-        # 경로를 좌표로 변환
-        path_coords = [
-            {"lat": node_positions[node][0], "lng": node_positions[node][1]}
-            for node in path
-        ]
-
-        # 경로의 중간지점 찾기 (전체 경로 길이의 50% 지점)
-        total_distance = 0
-        distances = []
-        
-        for i in range(len(path_coords) - 1):
-            point1 = path_coords[i]
-            point2 = path_coords[i + 1]
-            segment_distance = haversine(
-                point1["lat"], point1["lng"],
-                point2["lat"], point2["lng"]
-            )
-            total_distance += segment_distance
-            distances.append(segment_distance)
-
-        half_distance = total_distance / 2
-        current_distance = 0
-
-        # 중간지점이 있는 세그먼트 찾기
-        for i, distance in enumerate(distances):
-            current_distance += distance
-            if current_distance >= half_distance:
-                # 해당 세그먼트에서의 정확한 위치 계산
-                remaining = current_distance - half_distance
-                ratio = remaining / distance
-                midpoint = {
-                    "lat": path_coords[i]["lat"] + (path_coords[i+1]["lat"] - path_coords[i]["lat"]) * (1-ratio),
-                    "lng": path_coords[i]["lng"] + (path_coords[i+1]["lng"] - path_coords[i]["lng"]) * (1-ratio)
-                }
-                return jsonify({
-                    "path": path_coords,
-                    "midpoint": midpoint,
-                    "total_distance": total_distance
-                })
-
-        # 경로가 너무 짧은 경우
-        return jsonify({
-            "path": path_coords,
-            "midpoint": path_coords[len(path_coords)//2],
-            "total_distance": total_distance
-        })
-
-    except Exception as e:
-        print("Error in /find-midpoint:", str(e))
-        return jsonify({"error": str(e)}), 500
+    return route_response("find-midpoint", request.json)
+
+@app.route("/isochrone", methods=["POST"])
+def find_isochrone():
+    return route_response("isochrone", request.json)
+
+@app.route("/route-jobs/<job_id>", methods=["GET"])
+def get_route_job(job_id):
+    job = route_job_pool().get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown route job"}), 404
+    return jsonify(public_job(job))
+
+@app.route("/route-jobs", methods=["GET"])
+def get_route_job_stats():
+    return jsonify(route_job_pool().stats())
+
+@app.route("/route-cache", methods=["GET"])
+def get_route_cache_stats():
+    """
+    경로 캐시 통계. 작업 프로세스는 각자 캐시를 두므로 이 프로세스(sid 없이 바로 처리한 요청)와 작업
+    프로세스별 통계 (마지막으로 작업을 끝냈을 때의 값) 를 processes 에 싣고, 위에는 그 합계를 싣는다.
+    """
+    processes = {"server": route_cache.stats()}
+    if route_jobs is not None:
+        processes.update((f"worker-{pid}", stats) for pid, stats in route_jobs.cache_stats().items())
+    return jsonify(dict(combine_stats(processes.values()), processes=processes))
+
+@app.route("/graph-loads", methods=["GET"])
+def get_graph_load_stats():
+    return jsonify(graph_loads.stats())
+
+@app.route("/graph-provider", methods=["GET"])
+def get_graph_provider():
+    return jsonify(graph_provider.describe())
+
+@app.route("/regions", methods=["GET"])
+def get_regions():
+    """시작할 때 불러 둔 지역 스냅숏과 각각을 여는 데 걸린 시간."""
+    return jsonify(region_summaries())
+
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    """Prometheus 텍스트 형식의 경로 요청 지연 히스토그램과 탐색 카운터."""
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+@app.route("/edge-updates", methods=["GET"])
+def get_edge_updates():
+    return jsonify(edge_updates.stats())
+
+@app.route("/edge-updates", methods=["POST"])
+def post_edge_updates():
+    """통제/정체 갱신 {"updates": [{"u", "v", "key", "factor" | "closed"}]} 을 적용한다."""
+    body, status = update_edges_result(request.json)
+    return jsonify(body), status
+
+@app.route("/distance-matrix", methods=["POST"])
+def find_distance_matrix():
+    return route_response("distance-matrix", request.json)
+
+@app.route("/meeting-point", methods=["POST"])
+def find_meeting_point():
+    data = request.json or {}
+    room = data.get("room")
+    if room not in rooms:
+        return jsonify({"error": "잘못된 방 코드입니다"}), 404
+    # 작업 프로세스는 방 정보를 모르므로 방 참가자들이 공유한 위치를 요청에 담아 넘긴다.
+    members = [{"username": name, "location": entry["location"]}
+               for name, entry in rooms[room]["locations"].items()]
+    return route_response("meeting-point", dict(data, members=members))
 
 if __name__ == "__main__":
     socketio.run(app, debug=True, host='0.0.0.0',port = 5001)
\ No newline at end of file
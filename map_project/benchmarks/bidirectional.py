@@ -0,0 +1,67 @@
+"""
+양방향 A* 검증 및 비교.
+    python -m benchmarks.bidirectional [--graph graph.npz] [--size 200] [--pairs 50] [--landmarks 16]
+
+각 (출발, 도착) 쌍에 대해 Dijkstra 와 거리가 정확히 같은지 확인하고,
+a_star_search / bidirectional_a_star 가 확정(settle)한 노드 수와 시간을 비교한다.
+--landmarks 가 0 보다 크면 ALT 휴리스틱(avoid 선택)으로 돌린 결과도 함께 비교한다.
+"""
+import argparse
+import statistics
+import time
+from functools import partial
+
+from algorithms.landmarks import Landmarks
+from algorithms.path_finder import a_star_search, bidirectional_a_star, dijkstra_search
+from benchmarks.graphs import load_graph, random_pairs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--graph", help="RoadGraph.save() 로 저장한 .npz (없으면 격자 도로망)")
+    parser.add_argument("--size", type=int, default=200, help="격자 도로망 한 변의 교차로 수")
+    parser.add_argument("--pairs", type=int, default=50)
+    parser.add_argument("--min-distance", type=float, default=10000.0, help="긴 경로만 고르기 위한 최소 직선거리(m)")
+    parser.add_argument("--landmarks", type=int, default=16, help="ALT 랜드마크 수 (0 이면 ALT 비교 생략)")
+    args = parser.parse_args()
+
+    graph = load_graph(args.graph, args.size)
+    pairs = random_pairs(graph, args.pairs, args.min_distance)
+    print(f"graph: {graph.num_nodes} nodes, {graph.num_edges} edges, {len(pairs)} pairs")
+
+    searches = {
+        "dijkstra": dijkstra_search,
+        "a_star": a_star_search,
+        "bidirectional_a_star": bidirectional_a_star,
+    }
+    if args.landmarks:
+        began = time.perf_counter()
+        landmarks = Landmarks.build(graph, args.landmarks)
+        print(f"landmarks: {args.landmarks} in {time.perf_counter() - began:.1f}s")
+        searches["alt"] = partial(a_star_search, heuristic=landmarks)
+        searches["bidirectional_alt"] = partial(bidirectional_a_star, heuristic=landmarks)
+
+    settled = {name: [] for name in searches}
+    elapsed = {name: [] for name in searches}
+    mismatches = 0
+    for start, goal in pairs:
+        distances = {}
+        for name, search in searches.items():
+            stats = {}
+            began = time.perf_counter()
+            search(start, goal, graph, stats=stats)
+            elapsed[name].append(time.perf_counter() - began)
+            settled[name].append(stats["settled"])
+            distances[name] = stats["distance"]
+        if any(abs(d - distances["dijkstra"]) > 1e-6 for d in distances.values()):
+            mismatches += 1
+            print(f"distance mismatch {start}->{goal}: {distances}")
+
+    print(f"{'search':<22}{'median settled':>16}{'median ms':>12}")
+    for name in searches:
+        print(f"{name:<22}{statistics.median(settled[name]):>16.0f}{statistics.median(elapsed[name]) * 1000:>12.2f}")
+    print(f"distance mismatches vs dijkstra: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
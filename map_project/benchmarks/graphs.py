@@ -0,0 +1,48 @@
+import numpy as np
+
+from algorithms.graph import RoadGraph
+from algorithms.graph_provider import ARRAY_NAMES
+from algorithms.heuristics import METERS_PER_DEGREE
+from algorithms.synthetic import city_arrays, grid_city
+
+
+def _road_graph(arrays):
+    return RoadGraph.from_edges(*(arrays[name] for name in ARRAY_NAMES))
+
+
+def grid_graph(size, spacing=100.0, oneway_ratio=0.2, missing_ratio=0.05, seed=0):
+    """
+    벤치마크용 격자 도로망 (size x size 교차로, 간격 spacing m).
+    좌표를 조금씩 흔들고, 일부 도로는 없애거나 일방통행으로 만든다 (synthetic.grid_city).
+    """
+    return _road_graph(grid_city(size, spacing, oneway_ratio, missing_ratio, seed))
+
+
+def city_graph(kind, nodes, seed=0):
+    """교차로가 약 nodes 개인 kind(grid | radial | random) 가상 도로망 (synthetic.city_arrays)."""
+    return _road_graph(city_arrays(kind, nodes, seed))
+
+
+def load_graph(path=None, size=200, seed=0, kind="grid"):
+    """
+    저장된 RoadGraph(.npz) 가 있으면 읽고, 없으면 가상 도로망을 만든다.
+    격자는 size x size 교차로, 다른 종류는 교차로가 약 size * size 개다.
+    """
+    if path:
+        return RoadGraph.load(path)
+    if kind == "grid":
+        return grid_graph(size, seed=seed)
+    return city_graph(kind, size * size, seed)
+
+
+def random_pairs(graph, count, min_distance=0.0, seed=0, max_distance=np.inf):
+    """직선거리가 min_distance(m) 이상 max_distance(m) 이하인 임의의 (출발, 도착) 노드 쌍."""
+    rng = np.random.default_rng(seed)
+    pairs = []
+    while len(pairs) < count:
+        s, t = rng.integers(0, graph.num_nodes, 2)
+        dy = (graph.lat[t] - graph.lat[s]) * METERS_PER_DEGREE
+        dx = (graph.lon[t] - graph.lon[s]) * METERS_PER_DEGREE * np.cos(np.radians(graph.lat[s]))
+        if min_distance <= np.hypot(dx, dy) <= max_distance:
+            pairs.append((int(s), int(t)))
+    return pairs
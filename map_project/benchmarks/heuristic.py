@@ -0,0 +1,61 @@
+"""
+A* 휴리스틱 계산 방식별 초당 엣지 완화(relaxation) 수 비교.
+    python -m benchmarks.heuristic [--graph graph.npz] [--size 200] [--pairs 30]
+
+before: 엣지를 완화할 때마다 haversine 으로 목표까지 거리를 계산
+after:  질의마다 straight_line_bounds 로 전체 노드의 하한 배열을 한 번 계산하고 조회
+"""
+import argparse
+import time
+
+from algorithms.heuristics import straight_line_bounds
+from algorithms.path_finder import _unidirectional_search, haversine
+from benchmarks.graphs import load_graph, random_pairs
+
+
+class HaversineHeuristic:
+    """heuristic[node] 를 조회할 때마다 haversine 을 계산 (이전 방식)."""
+
+    def __init__(self, graph, goal):
+        self.lat, self.lon = graph.lat, graph.lon
+        self.goal_lat, self.goal_lon = graph.position(goal)
+
+    def __getitem__(self, node):
+        return haversine(self.lat[node], self.lon[node], self.goal_lat, self.goal_lon)
+
+
+def run(graph, pairs, make_heuristic):
+    relaxed = 0
+    elapsed = 0.0
+    for start, goal in pairs:
+        stats = {}
+        began = time.perf_counter()
+        heuristic = make_heuristic(graph, goal)
+        _unidirectional_search(start, goal, graph, heuristic, stats, None)
+        elapsed += time.perf_counter() - began
+        relaxed += stats["relaxed"]
+    return relaxed, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--graph", help="RoadGraph.save() 로 저장한 .npz (없으면 격자 도로망)")
+    parser.add_argument("--size", type=int, default=200, help="격자 도로망 한 변의 교차로 수")
+    parser.add_argument("--pairs", type=int, default=30)
+    args = parser.parse_args()
+
+    graph = load_graph(args.graph, args.size)
+    pairs = random_pairs(graph, args.pairs, min_distance=5000.0)
+    print(f"graph: {graph.num_nodes} nodes, {graph.num_edges} edges, {len(pairs)} pairs")
+
+    variants = {
+        "before (haversine per relaxation)": HaversineHeuristic,
+        "after (precomputed array)": lambda g, goal: straight_line_bounds(g, *g.position(goal)).tolist(),
+    }
+    for name, make_heuristic in variants.items():
+        relaxed, elapsed = run(graph, pairs, make_heuristic)
+        print(f"{name:<36}{relaxed / elapsed:>14,.0f} relaxations/s  ({relaxed} relaxed, {elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+/find-path 응답 형식별 크기와 직렬화 시간 비교.
+    python -m benchmarks.payload [--graph graph.npz] [--size 200] [--pairs 10] [--trace full]
+
+json:     지금의 jsonify 출력 (경로는 {"lat", "lng"} 목록, 탐색 기록은 숫자 목록)
+polyline: 경로만 encoded polyline 으로 바꾼 JSON
+packed:   polyline 경로 + float32/int32 탐색 기록 열 바이너리
+gzip 열은 같은 출력을 gzip(6) 으로 압축한 크기다 (Content-Encoding 을 쓰는 경우).
+"""
+import argparse
+import gzip
+import time
+
+from flask import Flask, jsonify
+
+from algorithms.path_finder import bidirectional_a_star, path_to_coords
+from algorithms.route_encoding import decode_packed, decode_polyline, encode_body
+from algorithms.search_trace import SearchTrace
+from benchmarks.graphs import load_graph, random_pairs
+
+
+def route_bodies(graph, pairs, level):
+    """find_path_result 와 같은 모양의 응답 본문."""
+    bodies = []
+    for start, goal in pairs:
+        path, trace = bidirectional_a_star(start, goal, graph, trace=SearchTrace(graph, level))
+        bodies.append({
+            "path": path_to_coords(path, graph),
+            "exploredNodes": trace.to_dict(),
+            "loadedGraph": {"nodes": graph.num_nodes, "edges": graph.num_edges},
+            "cached": False,
+        })
+    return bodies
+
+
+def serialize(body, fmt):
+    if fmt == "packed":
+        return encode_body(body, fmt)
+    return jsonify(encode_body(body, fmt)).get_data()
+
+
+def check_round_trip(body):
+    """packed 로 보냈다가 되살린 경로/탐색 기록의 최대 오차 (도, m)."""
+    decoded = decode_packed(encode_body(body, "packed"))
+    path = decode_polyline(decoded["path"])
+    path_error = max(
+        (max(abs(a["lat"] - b["lat"]), abs(a["lng"] - b["lng"])) for a, b in zip(path, body["path"])),
+        default=0.0,
+    )
+    trace, original = decoded["exploredNodes"], body["exploredNodes"]
+    coord_error = max((abs(a - b) for name in ("lat", "lng") for a, b in zip(trace[name], original[name])), default=0.0)
+    cost_error = max((abs(a - b) for a, b in zip(trace["cost"], original["cost"])), default=0.0)
+    assert trace["parent"] == original["parent"] and trace["direction"] == original["direction"]
+    return path_error, coord_error, cost_error
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--graph", help="RoadGraph.save() 로 저장한 .npz (없으면 격자 도로망)")
+    parser.add_argument("--size", type=int, default=200, help="격자 도로망 한 변의 교차로 수")
+    parser.add_argument("--pairs", type=int, default=10)
+    parser.add_argument("--trace", choices=("sampled", "full"), default="full")
+    parser.add_argument("--repeat", type=int, default=5, help="직렬화 시간을 잴 때 반복 횟수 (가장 빠른 값)")
+    args = parser.parse_args()
+
+    graph = load_graph(args.graph, args.size)
+    pairs = random_pairs(graph, args.pairs, min_distance=5000.0)
+    bodies = route_bodies(graph, pairs, args.trace)
+    rows = sum(len(body["exploredNodes"]["lat"]) for body in bodies)
+    points = sum(len(body["path"]) for body in bodies)
+    print(f"graph: {graph.num_nodes} nodes, {len(pairs)} routes, {points} path points, {rows} trace rows")
+
+    with Flask(__name__).app_context():
+        baseline = None
+        print(f"{'format':<10}{'bytes':>14}{'ratio':>8}{'gzip':>14}{'serialize ms':>15}")
+        for fmt in ("json", "polyline", "packed"):
+            outputs = [serialize(body, fmt) for body in bodies]
+            size = sum(len(output) for output in outputs)
+            compressed = sum(len(gzip.compress(output, 6)) for output in outputs)
+            elapsed = float("inf")
+            for _ in range(args.repeat):
+                began = time.perf_counter()
+                for body in bodies:
+                    serialize(body, fmt)
+                elapsed = min(elapsed, time.perf_counter() - began)
+            baseline = baseline or size
+            print(f"{fmt:<10}{size:>14,}{size / baseline:>8.2f}{compressed:>14,}{elapsed * 1000:>15.1f}")
+
+    errors = [check_round_trip(body) for body in bodies]
+    print(f"packed round trip: path <= {max(e[0] for e in errors):.1e} deg, "
+          f"trace coords <= {max(e[1] for e in errors):.1e} deg, cost <= {max(e[2] for e in errors):.2f} m")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+경로 탐색 벤치마크 모음: 크기를 키워 가며 만든 가상 도로망에서 같은 (출발, 도착) 쌍으로
+a_star_search, bidirectional_a_star, study 의 PathFinder.find_shortest_path 를 비교한다.
+    python -m benchmarks.suite [--kinds grid radial] [--nodes 2500 10000 40000] [--pairs 50]
+                               [--short-nodes 250000] [--output results.json] [--compare baseline.json]
+
+그래프마다 networkx 그래프 구성(load), prepare_graph, 색인 생성 시간과 snap_to_edge /
+get_closest_node 지연을 재고, 탐색마다 지연의 중앙값/p99, 확정(settle)한 노드 수, 질의 중
+최대 메모리(tracemalloc, 별도 실행)를 잰다. PathFinder 는 탐색 통계를 내지 않아 settled 가 없다.
+--short-nodes 크기의 도로망에서는 직선거리 --short-distance 이하의 짧은 경로도 따로 잰다. 탐색이
+닿는 노드는 몇백 개뿐이라, 질의마다 모든 노드에 대해 하는 일(휴리스틱 배열 등)이 지연을 좌우한다.
+--output 의 JSON 을 다른 커밋에서 만든 결과와 --compare 로 비교하면 지연이 늘어난 항목을 보여준다.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from algorithms.path_finder import a_star_search, bidirectional_a_star, get_closest_node, prepare_graph, snap_to_edge
+from algorithms.synthetic import CITY_KINDS, city_arrays
+from algorithms.tile_cache import graph_from_arrays
+from benchmarks.graphs import random_pairs
+
+STUDY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                         "study", "main_project")
+
+
+def _ms(seconds):
+    return [value * 1000 for value in seconds]
+
+
+def summarize(values):
+    """중앙값, p99, 평균, 최댓값."""
+    if not values:
+        return None
+    values = np.asarray(values, dtype=np.float64)
+    return {
+        "median": float(np.median(values)),
+        "p99": float(np.percentile(values, 99)),
+        "mean": float(values.mean()),
+        "max": float(values.max()),
+    }
+
+
+def study_path_finder(graph):
+    """RoadGraph 를 study 의 PathFinder 노드 사전으로 옮긴다 (병렬 엣지는 짧은 것)."""
+    sys.path.insert(0, STUDY_DIR)
+    try:
+        from pathfinder import PathFinder
+        from pathfinder.models import Coordinate, Node
+    finally:
+        sys.path.remove(STUDY_DIR)
+
+    finder = PathFinder()
+    offsets, targets, weights = graph.fwd_offsets.tolist(), graph.fwd_targets.tolist(), graph.fwd_weights.tolist()
+    for node, (lat, lon) in enumerate(zip(graph.lat.tolist(), graph.lon.tolist())):
+        connections = {}
+        for edge in range(offsets[node], offsets[node + 1]):
+            target = targets[edge]
+            connections[target] = min(weights[edge], connections.get(target, float("inf")))
+        finder.nodes[node] = Node(node, Coordinate(lat, lon), connections, "intersection")
+    return finder
+
+
+def searches(graph, study_max_nodes):
+    """이름 -> search(start, goal, stats) -> 거리. PathFinder 는 노드 수가 study_max_nodes 이하일 때만."""
+    def road_search(search):
+        def run(start, goal, stats):
+            search(start, goal, graph, stats=stats)
+            return stats["distance"]
+        return run
+
+    runs = {
+        "a_star_search": road_search(a_star_search),
+        "bidirectional_a_star": road_search(bidirectional_a_star),
+    }
+    build = None
+    if graph.num_nodes <= study_max_nodes:
+        began = time.perf_counter()
+        finder = study_path_finder(graph)
+        build = time.perf_counter() - began
+        runs["study_path_finder"] = lambda start, goal, stats: finder.find_shortest_path(start, goal)[1]
+    return runs, build
+
+
+def measure_graph(kind, nodes, seed):
+    """가상 도로망을 만들어 (RoadGraph, 준비 단계별 측정값)."""
+    arrays = city_arrays(kind, nodes, seed)
+    began = time.perf_counter()
+    network = graph_from_arrays(arrays)
+    loaded = time.perf_counter()
+    graph = prepare_graph(network)
+    prepared = time.perf_counter()
+    graph.spatial_index, graph.edge_index  # 처음 쓸 때 만드는 색인
+    indexed = time.perf_counter()
+    return graph, {
+        "load_ms": (loaded - began) * 1000,
+        "prepare_ms": (prepared - loaded) * 1000,
+        "index_ms": (indexed - prepared) * 1000,
+        "graph_bytes": int(sum(getattr(graph, name).nbytes for name in graph.ARRAYS)),
+    }
+
+
+def measure_snapping(graph, count, seed):
+    """도로망 범위 안의 임의 좌표 count 개를 snap 하는 지연 (ms)."""
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(graph.lat.min(), graph.lat.max(), count).tolist()
+    lons = rng.uniform(graph.lon.min(), graph.lon.max(), count).tolist()
+    snap_edge, closest = [], []
+    for lat, lon in zip(lats, lons):
+        began = time.perf_counter()
+        snap_to_edge(lat, lon, graph)
+        snap_edge.append(time.perf_counter() - began)
+        began = time.perf_counter()
+        get_closest_node(lat, lon, graph)
+        closest.append(time.perf_counter() - began)
+    return {"snap_to_edge_ms": summarize(_ms(snap_edge)), "get_closest_node_ms": summarize(_ms(closest))}
+
+
+def measure_searches(runs, pairs, repeat=3):
+    """
+    탐색별 지연/settled 와 (tracemalloc 을 켠 별도 실행의) 질의당 최대 메모리.
+    지연은 쌍마다 repeat 번 돌린 것 중 가장 짧은 시간이다 (다른 프로세스 등으로 인한 흔들림을 줄인다).
+    """
+    results = {}
+    distances = {}
+    for name, run in runs.items():
+        elapsed, settled = [], []
+        distances[name] = []
+        for start, goal in pairs:
+            best = float("inf")
+            for _ in range(repeat):
+                stats = {}
+                began = time.perf_counter()
+                distance = run(start, goal, stats)
+                best = min(best, time.perf_counter() - began)
+            elapsed.append(best)
+            distances[name].append(distance)
+            if "settled" in stats:
+                settled.append(stats["settled"])
+
+        peaks = []
+        tracemalloc.start()
+        for start, goal in pairs:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            run(start, goal, {})
+            peaks.append((tracemalloc.get_traced_memory()[1] - before) / 1024)
+        tracemalloc.stop()
+        results[name] = {
+            "latency_ms": summarize(_ms(elapsed)),
+            "settled": summarize(settled),
+            "peak_kib": summarize(peaks),
+        }
+
+    reference = np.asarray(distances["a_star_search"])
+    for name, values in distances.items():
+        values = np.asarray(values)
+        same = np.isclose(values, reference, rtol=1e-9, atol=1e-6) | (np.isinf(values) & np.isinf(reference))
+        results[name]["mismatches"] = int((~same).sum())
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """
+    baseline 과 같은 (종류, 노드 수, 경로, 탐색) 의 지연과 settled 중앙값 비율을 출력한다.
+    중앙값 지연이 tolerance 배보다 느려진 항목 수를 반환한다. settled 는 시간과 달리 흔들리지 않으므로
+    비율이 1 이 아니면 탐색 동작이 바뀐 것이다.
+    """
+    previous = {
+        (entry["kind"], entry["requested_nodes"], entry.get("routes", "random"), name): search
+        for entry in baseline["results"] for name, search in entry["searches"].items()
+    }
+    regressions = 0
+    print(f"\ncompared with {baseline['meta'].get('commit')} (ratio = now / before)")
+    print(f"{'graph':<22}{'search':<22}{'median':>9}{'p99':>9}{'settled':>9}")
+    for entry in results:
+        for name, search in entry["searches"].items():
+            before = previous.get((entry["kind"], entry["requested_nodes"], entry["routes"], name))
+            if before is None:
+                continue
+            ratios = [search["latency_ms"][key] / before["latency_ms"][key] for key in ("median", "p99")]
+            settled = f"{search['settled']['median'] / before['settled']['median']:.2f}" \
+                if search["settled"] and before["settled"] else "-"
+            slower = ratios[0] > tolerance
+            regressions += slower
+            print(f"{label(entry):<22}{name:<22}"
+                  f"{ratios[0]:>9.2f}{ratios[1]:>9.2f}{settled:>9}{'  slower' if slower else ''}")
+    return regressions
+
+
+def label(entry):
+    """결과 항목의 이름 (짧은 경로만 잰 항목은 short 를 붙인다)."""
+    name = f"{entry['kind']} {entry['requested_nodes']}"
+    return name if entry["routes"] == "random" else f"{name} {entry['routes']}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--kinds", nargs="+", choices=CITY_KINDS, default=["grid"], help="가상 도로망 종류")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[2500, 10000, 40000], help="도로망의 교차로 수 (대략)")
+    parser.add_argument("--pairs", type=int, default=50)
+    parser.add_argument("--min-distance", type=float, default=0.0, help="(출발, 도착) 쌍의 최소 직선거리(m)")
+    parser.add_argument("--short-nodes", type=int, default=250000, help="짧은 경로를 잴 도로망의 교차로 수 (0 이면 생략)")
+    parser.add_argument("--short-distance", type=float, default=1000.0, help="짧은 경로의 최대 직선거리(m)")
+    parser.add_argument("--repeat", type=int, default=3, help="쌍마다 반복해 가장 짧은 시간을 쓴다")
+    parser.add_argument("--seed", type=int, default=0, help="도로망과 (출발, 도착) 쌍의 seed")
+    parser.add_argument("--study-max-nodes", type=int, default=50000,
+                        help="PathFinder 를 돌릴 최대 노드 수 (질의마다 전체 노드를 초기화해 큰 그래프에서 느리다)")
+    parser.add_argument("--output", help="결과를 저장할 JSON 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=1.2, help="이 비율보다 느려진 중앙값 지연을 회귀로 본다")
+    args = parser.parse_args()
+
+    # (노드 수, 경로 종류, 최소 직선거리, 최대 직선거리)
+    cases = [(nodes, "random", args.min_distance, np.inf) for nodes in args.nodes]
+    if args.short_nodes:
+        cases.append((args.short_nodes, "short", 0.0, args.short_distance))
+
+    results = []
+    for kind in args.kinds:
+        for nodes, routes, min_distance, max_distance in cases:
+            graph, prepare = measure_graph(kind, nodes, args.seed)
+            pairs = random_pairs(graph, args.pairs, min_distance, args.seed, max_distance)
+            runs, study_build = searches(graph, args.study_max_nodes)
+            entry = {
+                "kind": kind,
+                "requested_nodes": nodes,
+                "routes": routes,
+                "nodes": graph.num_nodes,
+                "edges": graph.num_edges,
+                "pairs": len(pairs),
+                "prepare": dict(prepare, study_build_ms=study_build * 1000 if study_build is not None else None),
+                "snapping": measure_snapping(graph, args.pairs, args.seed),
+                "searches": measure_searches(runs, pairs, args.repeat),
+                "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            }
+            results.append(entry)
+
+            print(f"\n{label(entry)}: {graph.num_nodes} nodes, {graph.num_edges} edges, {len(pairs)} pairs | "
+                  f"load {prepare['load_ms']:.0f}ms, prepare_graph {prepare['prepare_ms']:.0f}ms, "
+                  f"index {prepare['index_ms']:.0f}ms, snap_to_edge median "
+                  f"{entry['snapping']['snap_to_edge_ms']['median'] * 1000:.0f}us")
+            print(f"{'search':<22}{'median ms':>11}{'p99 ms':>10}{'settled':>10}{'peak KiB':>10}{'mismatch':>10}")
+            for name, search in entry["searches"].items():
+                settled = f"{search['settled']['median']:.0f}" if search["settled"] else "-"
+                print(f"{name:<22}{search['latency_ms']['median']:>11.2f}{search['latency_ms']['p99']:>10.2f}"
+                      f"{settled:>10}{search['peak_kib']['max']:>10.0f}{search['mismatches']:>10}")
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+import json
+import multiprocessing
+import os
+import queue
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from routing import edge_updates, route_cache, run_route_request, run_route_stream
+
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) - 1)  # 하나는 Flask/Socket.IO 서버 몫으로 남긴다
+PENDING_PER_WORKER = 8  # 작업자 하나당 대기열에 쌓을 수 있는 작업 수
+MAX_FINISHED_JOBS = 1000  # 결과 조회용으로 남겨 두는 끝난 작업 수
+STREAM_WINDOW = 4  # 클라이언트가 받았다고 알리지 않은 채로 보낼 수 있는 탐색 기록 묶음 수
+STREAM_QUEUE_SIZE = 4  # 작업 프로세스가 미리 만들어 둘 수 있는 묶음 수 (넘으면 탐색을 멈춘다)
+STREAM_ACK_TIMEOUT = 30.0  # 이 시간(초) 동안 받았다는 응답이 없으면 스트리밍을 그만둔다
+STREAM_POLL_INTERVAL = 0.5
+
+
+class QueueFullError(Exception):
+    """대기 중인 경로 작업이 너무 많은 경우."""
+
+
+def _run_request(kind, data, updates):
+    """작업 프로세스에서 run_route_request 를 실행해 (결과, (프로세스 ID, 이 프로세스의 경로 캐시 통계))."""
+    return run_route_request(kind, data, updates), (os.getpid(), route_cache.stats())
+
+
+def _run_stream(kind, data, batches, updates):
+    """run_route_stream 을 실행한다. 반환값은 _run_request 와 같다."""
+    return run_route_stream(kind, data, batches, updates), (os.getpid(), route_cache.stats())
+
+
+class RouteJobPool:
+    """
+    경로 탐색 작업을 별도 프로세스 풀에서 실행한다.
+    탐색은 CPU 를 오래 쓰므로 요청 스레드(와 GIL)를 잡고 있으면 Socket.IO 채팅까지 멈춘다.
+    작업 상태가 바뀌면 notify(job) 를 부르며, 끝난 작업은 MAX_FINISHED_JOBS 개까지 조회할 수 있다.
+    같은 요청(sid 제외)이 이미 대기 중이거나 실행 중이면 새로 실행하지 않고 그 결과를 함께 받는다.
+
+    stream=True 로 넣은 작업은 탐색 기록 묶음을 notify_batch(job, batch, ack) 로 하나씩 넘기고,
+    모든 묶음을 넘긴 뒤에 notify(job) 를 부른다. 받는 쪽은 묶음을 받았을 때 ack() 를 불러야 하며,
+    ack 되지 않은 묶음이 stream_window 개이면 다음 묶음을 넘기지 않는다. 그동안 작업 프로세스는
+    크기가 STREAM_QUEUE_SIZE 인 큐가 차면 탐색을 멈추므로, 느린 클라이언트 때문에 쌓이는 묶음은
+    작업마다 stream_window + STREAM_QUEUE_SIZE 개를 넘지 않는다.
+    metrics(Metrics) 를 주면 작업 프로세스가 결과와 함께 돌려준 처리 시간을 실행마다 기록한다.
+    작업 프로세스는 각자 경로 캐시를 두므로, 결과와 함께 돌려준 캐시 통계를 프로세스별로 모아 둔다 (cache_stats).
+    """
+
+    def __init__(self, notify, workers=DEFAULT_WORKERS, max_pending=None, notify_batch=None,
+                 stream_window=STREAM_WINDOW, metrics=None):
+        self.notify = notify
+        self.metrics = metrics
+        self.notify_batch = notify_batch
+        self.stream_window = stream_window
+        self.workers = workers
+        self.max_pending = max_pending or workers * PENDING_PER_WORKER
+        # Socket.IO 서버 스레드가 있는 프로세스를 fork 하지 않도록 spawn 으로 작업자를 띄운다.
+        self._context = multiprocessing.get_context("spawn")
+        self._executor = ProcessPoolExecutor(workers, mp_context=self._context)
+        self._manager = None  # 스트리밍 큐를 작업 프로세스와 나누는 Manager (처음 스트리밍할 때 띄운다)
+        self._lock = threading.Lock()
+        self._active = {}  # 작업 ID -> (작업, Future)
+        self._finished = OrderedDict()
+        self._pending = {}  # 요청 키 -> 대기/실행 중인 Future
+        self._cache_stats = {}  # 작업 프로세스 ID -> 마지막으로 끝낸 작업 때의 RouteCache.stats()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.coalesced = 0
+        self.streamed_batches = 0
+        self.stalled_streams = 0
+
+    def submit(self, kind, data, sid=None, stream=False, format="json"):
+        """
+        작업을 대기열에 넣고 작업 정보를 반환한다. 대기열이 차 있으면 QueueFullError.
+        format 은 결과를 보낼 형식으로 작업 정보에 담아 둔다 (notify 에서 쓴다).
+        작업 프로세스는 넣을 때의 엣지 갱신 버전으로 맞춘 뒤 탐색하며, 버전이 다르면 합치지 않는다.
+        """
+        updates = edge_updates.snapshot()
+        key = (kind, json.dumps({k: v for k, v in data.items() if k != "sid"}, sort_keys=True), updates[0])
+        with self._lock:
+            # 스트리밍 작업은 클라이언트마다 묶음을 따로 받아야 하므로 합치지 않는다.
+            future = None if stream else self._pending.get(key)
+            if future is None and len(self._pending) >= self.max_pending:
+                self.rejected += 1
+                raise QueueFullError(f"Too many pending route jobs ({self.max_pending})")
+            job = {
+                "jobId": secrets.token_urlsafe(8),
+                "type": kind,
+                "status": "queued",
+                "sid": sid,
+                "format": format,
+                "submittedAt": time.time(),
+            }
+            if stream:
+                job["stream"] = True
+            coalesced = future is not None
+            if coalesced:
+                self.coalesced += 1
+            elif stream:
+                if self._manager is None:
+                    self._manager = self._context.Manager()
+                batches = self._manager.Queue(STREAM_QUEUE_SIZE)
+                future = self._executor.submit(_run_stream, kind, data, batches, updates)
+                key = (key, job["jobId"])
+                self._pending[key] = future
+            else:
+                future = self._executor.submit(_run_request, kind, data, updates)
+                self._pending[key] = future
+            self._active[job["jobId"]] = (job, future)
+            self.submitted += 1
+        if not coalesced:
+            future.add_done_callback(lambda future: self._forget(key, future))
+            future.add_done_callback(lambda future: self._observe(kind, future))
+        if stream:
+            threading.Thread(target=self._relay, args=(job, future, batches), daemon=True).start()
+        else:
+            future.add_done_callback(lambda future: self._finish(job, future))
+        return job
+
+    def _relay(self, job, future, batches):
+        """작업 프로세스가 큐에 넣은 묶음을 ack 창 안에서 notify_batch 로 넘기고, 끝나면 작업을 마친다."""
+        window = threading.Semaphore(self.stream_window)
+        index = 0
+        while True:
+            try:
+                batch = batches.get(timeout=STREAM_POLL_INTERVAL)
+            except queue.Empty:
+                if future.done():
+                    break
+                continue
+            if batch is None:
+                break
+            if not window.acquire(timeout=STREAM_ACK_TIMEOUT):
+                # 더 읽지 않으면 큐가 차서 작업 프로세스도 곧 탐색을 그만둔다.
+                with self._lock:
+                    self.stalled_streams += 1
+                break
+            self.notify_batch(job, dict(batch, jobId=job["jobId"], index=index), window.release)
+            index += 1
+            with self._lock:
+                self.streamed_batches += 1
+        job["batches"] = index
+        # 작업 프로세스가 끝나야 결과를 알 수 있다 (멈춘 경우 STREAM_PUT_TIMEOUT 뒤에 끝난다).
+        self._finish(job, future)
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def _observe(self, kind, future):
+        """
+        실행 하나의 처리 시간을 metrics 에, 작업 프로세스의 경로 캐시 통계를 cache_stats 에 기록한다
+        (결과를 함께 받은 작업은 한 번만 센다).
+        """
+        try:
+            (_, status, timing), (pid, cache_stats) = future.result()
+        except Exception:
+            status, timing = 500, None
+        else:
+            with self._lock:
+                self._cache_stats[pid] = cache_stats
+        if self.metrics is not None:
+            self.metrics.observe_request(kind, status, timing)
+
+    def _finish(self, job, future):
+        try:
+            (body, status, _), _ = future.result()
+        except Exception as e:  # 작업 프로세스가 죽은 경우 등
+            body, status = {"error": str(e)}, 500
+        job.update(
+            status="done" if status < 500 else "failed",
+            httpStatus=status,
+            result=body,
+            elapsedMs=round((time.time() - job["submittedAt"]) * 1000, 1),
+        )
+        with self._lock:
+            self._active.pop(job["jobId"], None)
+            self._finished[job["jobId"]] = job
+            while len(self._finished) > MAX_FINISHED_JOBS:
+                self._finished.popitem(last=False)
+            if job["status"] == "done":
+                self.completed += 1
+            else:
+                self.failed += 1
+        self.notify(job)
+
+    def get(self, job_id):
+        """작업 정보. 모르는 작업이면 None."""
+        with self._lock:
+            if job_id in self._active:
+                job, future = self._active[job_id]
+                return dict(job, status="running" if future.running() else "queued")
+            return self._finished.get(job_id)
+
+    def stats(self):
+        """
+        대기열 길이와 작업자 사용률. running/queued 는 작업자에게 넘어간/기다리는 실행 수이고,
+        coalesced 는 같은 요청의 실행 결과를 함께 받은 작업 수다.
+        """
+        with self._lock:
+            running = sum(1 for future in self._pending.values() if future.running())
+            return {
+                "workers": self.workers,
+                "running": min(running, self.workers),
+                "queued": len(self._pending) - min(running, self.workers),
+                "maxPending": self.max_pending,
+                "utilisation": min(running, self.workers) / self.workers,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "coalesced": self.coalesced,
+                "streamedBatches": self.streamed_batches,
+                "stalledStreams": self.stalled_streams,
+            }
+
+    def cache_stats(self):
+        """작업 프로세스 ID -> 그 프로세스가 마지막으로 작업을 끝냈을 때의 경로 캐시 통계."""
+        with self._lock:
+            return dict(self._cache_stats)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
@@ -0,0 +1,615 @@
+import math
+import os
+import queue
+import threading
+from functools import partial
+
+from algorithms.alternatives import DEFAULT_MAX_OVERLAP, DEFAULT_MAX_STRETCH, MAX_ALTERNATIVES, alternative_routes
+from algorithms.edge_updates import changed_edges, parse_edge_updates
+from algorithms.graph import WEIGHTS
+from algorithms.isochrone import DEFAULT_CELL_SIZE, isochrones
+from algorithms.heuristics import straight_line, travel_time
+from algorithms.metrics import Metrics, count_search, request_timings, timed
+from algorithms.regions import describe, find_region, load_regions
+from algorithms.path_finder import (
+    MEETING_OBJECTIVES, STREAM_BATCH_SIZE, bidirectional_a_star, distance_matrix, meeting_point, path_cost,
+    path_to_coords, snap_to_edge, stream_search,
+)
+from algorithms.road_network import (
+    Route, edge_updates, find_corridor_route, find_isochrone_tree, graph_loads, load_area_graph,
+    load_corridor_graph,
+)
+from algorithms.route_cache import DEFAULT_MAX_SIZE, DEFAULT_TTL, RouteCache, endpoint_key
+from algorithms.search_trace import TRACE_LEVELS, SearchTrace
+
+# 경로 탐색 요청 처리. Flask 에 의존하지 않으므로 요청 스레드에서 바로 부르거나
+# route_jobs 의 작업 프로세스에서 불러 쓸 수 있다.
+
+# 미리 전처리한 지역들. python -m algorithms.regions 로 만든 스냅숏(그래프, ALT 랜드마크 거리표, 색인,
+# --ch 로 만들었으면 CH) 을 시작할 때 메모리 매핑으로 열어 두며, 여러 지역은 REGION_GRAPH_PATH 에 os.pathsep(":") 으로
+# 이어 준다. 좌표가 모두 한 지역 안에 있는 요청은 그래프를 불러오지 않고 그 지역에서 처리한다.
+# contraction, landmarks 로 만든 예전 그래프 파일도 열 수 있다 (색인은 시작할 때 만든다).
+REGION_GRAPH_PATH = os.getenv("REGION_GRAPH_PATH")
+regions = load_regions(REGION_GRAPH_PATH)
+
+# 요청별로 고를 수 있는 탐색: straight(직선거리 A*) | landmarks(ALT) | ch(Contraction Hierarchies)
+HEURISTICS = ("straight", "landmarks", "ch")
+
+# 탐색 과정 스트리밍: 한 묶음의 최대 행 수, 작업 프로세스가 묶음을 넘기지 못하고 기다리는 최대 시간(초)
+MAX_STREAM_BATCH_SIZE = 5000
+STREAM_PUT_TIMEOUT = 60.0
+
+# 대안 경로 요청에서 받을 수 있는 최대 stretch (최단 경로 비용의 배수)
+MAX_ALTERNATIVE_STRETCH = 2.0
+
+# /isochrone: 한 요청의 최대 예산 수, weight 별 예산 상한 (m | 초), 격자 칸 크기 범위 (m)
+MAX_ISOCHRONE_BUDGETS = 5
+MAX_ISOCHRONE_BUDGET = {"distance": 20000.0, "time": 1200.0}
+ISOCHRONE_CELL_SIZES = (20.0, 1000.0)
+
+# /distance-matrix: 한 요청의 최대 출발지/도착지 수, 찾는 최대 거리 (m, maxDistance 의 기본값이자 상한)
+MAX_MATRIX_POINTS = 25
+MAX_MATRIX_DISTANCE = 50000.0
+
+# /meeting-point: 최대 참가자 수, 참가자마다 만남 장소를 찾는 최대 거리 (m)
+MAX_MEETING_MEMBERS = 10
+MAX_MEETING_DISTANCE = 30000.0
+
+# 같은 지점으로 스냅되는 반복 요청(같은 만남 장소를 보는 방 참가자 등)을 위한 경로 캐시
+route_cache = RouteCache(
+    int(os.getenv("ROUTE_CACHE_SIZE", DEFAULT_MAX_SIZE)),
+    float(os.getenv("ROUTE_CACHE_TTL", DEFAULT_TTL)),
+)
+
+# 요청 종류별 처리 시간, 단계별 시간, 탐색 카운터 (/metrics). 작업 프로세스에서 처리한 요청은
+# 결과와 함께 돌아온 시간으로 route_jobs 가 이 프로세스에서 기록한다.
+metrics = Metrics()
+
+# 엣지 갱신을 한 번에 하나씩 적용한다 (지역 그래프를 갱신 순서대로 바꾸도록).
+_edge_update_lock = threading.Lock()
+
+def haversine(lat1, lon1, lat2, lon2):
+    """두 지점 간의 대원 거리 계산 (단위: m)"""
+    R = 6371000  # 지구 반경 (미터)
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    
+    a = math.sin(dphi/2)**2 + \
+        math.cos(phi1) * math.cos(phi2) * math.sin(dlambda/2)**2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+    return R * c
+
+def find_route(start, end, heuristic=None, make_trace=None, on_batch=None, batch_size=STREAM_BATCH_SIZE,
+               weight="distance"):
+    """
+    두 좌표 사이의 경로 탐색 결과 (Route).
+    두 좌표가 모두 전처리한 지역 안에 있으면 그 그래프에서, heuristic 을 지정하지 않았으면
+    ALT > 직선거리 A* 순으로 쓸 수 있는 것을 쓴다. 지역 밖이면 출발지/도착지 주변의
+    타원 코리도만 불러와 직선거리 양방향 A* 를 쓴다 (랜드마크 거리표는 전처리한 지역에만 있다).
+    CH 는 순수 파이썬이라 ALT 보다 2배 남짓 빠를 뿐이어서 (benchmarks.contraction) heuristic="ch"
+    로 요청할 때만 쓰고, 쓸 수 없으면 기본 탐색으로 찾는다.
+    weight="time" 이면 이동 시간(초)이 가장 짧은 경로를 찾는다. CH 는 거리로만 전처리했으므로
+    쓰지 않고, 거리 휴리스틱을 최고 속도로 나눈 travel_time 휴리스틱을 쓴다.
+    make_trace(graph) 를 넘기면 탐색 과정을 기록하며, 이때는 경로 캐시를 쓰지 않는다.
+    on_batch 를 함께 넘기면 CH 대신 양방향 A* 로 탐색하며 기록을 batch_size 행씩 넘긴다
+    (코리도를 넓혀 다시 탐색하면 offset 0 묶음부터 다시 시작한다).
+    """
+    bidirectional = bidirectional_a_star
+    if on_batch is not None:
+        bidirectional = partial(stream_search, on_batch=on_batch, batch_size=batch_size)
+
+    scale = travel_time if weight == "time" else (lambda h: h)
+
+    # 탐색 중에 엣지 갱신으로 지역 그래프가 바뀌어도 이 요청은 처음 본 그래프를 끝까지 쓴다.
+    region = find_region(regions, (start, end))
+    if region is None:
+        search = partial(bidirectional, heuristic=scale(straight_line))
+        return find_corridor_route(start, end, search=search, make_trace=make_trace, cache=route_cache, weight=weight)
+
+    graph = region.graph.weighted(weight)
+    fallback = None
+    if heuristic != "straight" and region.landmarks:
+        search = partial(bidirectional, graph=graph, heuristic=scale(region.landmarks))
+    else:
+        search = partial(bidirectional, graph=graph, heuristic=scale(straight_line))
+    if heuristic == "ch" and region.ch and on_batch is None and weight == "distance":
+        search, fallback = region.ch.search, search
+
+    # 가장 가까운 도로 구간 위의 지점에서 출발/도착
+    start_node = snap_to_edge(start["lat"], start["lng"], graph)
+    end_node = snap_to_edge(end["lat"], end["lng"], graph)
+    stats = {"nodes": graph.num_nodes, "edges": graph.num_edges}
+
+    cache_key = None
+    if make_trace is None:
+        cache_key = (endpoint_key(start_node, graph), endpoint_key(end_node, graph), weight, "region:" + region.name)
+        cached = route_cache.get(cache_key)
+        if cached is not None:
+            stats.update(distance=cached[1], cached=True)
+            return Route(graph, start_node, end_node, cached[0], None, stats)
+
+    trace = make_trace(graph) if make_trace else None
+    with timed("search"):
+        path, trace = search(start_node, end_node, stats=stats, trace=trace)
+    count_search(stats)
+    if fallback is not None and graph.version != region.ch.graph.version and path is not None \
+            and path_cost(path, start_node, end_node, graph) > stats["distance"] * (1 + 1e-6):
+        # CH 는 갱신 전 거리로 만들었다. 갱신은 가중치를 늘리기만 하므로 CH 경로가 통제된 엣지를
+        # 지나지 않으면 그대로 최단이고, 지나면 지금 가중치로 다시 찾는다.
+        trace = make_trace(graph) if make_trace else None
+        with timed("search"):
+            path, trace = fallback(start_node, end_node, stats=stats, trace=trace)
+        count_search(stats)
+    if cache_key is not None and path is not None and graph.version == edge_updates.version:
+        route_cache.put(cache_key, (path, stats["distance"]))
+    return Route(graph, start_node, end_node, path, trace, stats)
+
+def region_summaries():
+    """불러 둔 지역들의 범위, 전처리 여부, 여는 데 걸린 시간 (/regions)."""
+    return [describe(region) for region in regions]
+
+def valid_point(point):
+    """point 가 위도/경도 범위 안의 숫자로 된 {"lat", "lng"} 좌표인지."""
+    if not isinstance(point, dict):
+        return False
+    lat, lng = point.get("lat"), point.get("lng")
+    if not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in (lat, lng)):
+        return False
+    return -90 <= lat <= 90 and -180 <= lng <= 180
+
+def area_graph(points):
+    """여러 좌표를 모두 덮는 그래프. 전처리한 지역 안이면 그 그래프를, 아니면 bbox 를 불러온다."""
+    region = find_region(regions, points)
+    if region is not None:
+        return region.graph
+    return load_area_graph(points)
+
+def route_alternatives(route, start, end, k, max_stretch, max_overlap):
+    """
+    route 외의 대안 경로 최대 k 개 ({"path", "cost", "stretch", "overlap"} 목록) 와 탐색 stats.
+    코리도는 최단 경로가 들어갈 만큼만 불러왔으므로 한도를 max_stretch 배로 넓혀 다시 불러온다
+    (코리도 한도 D >= mu + 스냅 거리 이므로 max_stretch * D 안에 비용 max_stretch * mu 이하의 경로가 모두 있다).
+    """
+    graph, start_node, goal = route.graph, route.start, route.goal
+    if "limit" in route.stats:
+        graph = load_corridor_graph(start, end, route.stats["limit"] * max_stretch).weighted(graph.weight)
+        start_node = snap_to_edge(start["lat"], start["lng"], graph)
+        goal = snap_to_edge(end["lat"], end["lng"], graph)
+    stats = {}
+    with timed("alternatives"):
+        routes = alternative_routes(start_node, goal, graph, route.stats["distance"], k, max_stretch, max_overlap,
+                                    stats=stats)
+    return [
+        {
+            "path": path_to_coords(alternative.path, graph, start_node, goal),
+            "cost": alternative.cost,
+            "stretch": alternative.stretch,
+            "overlap": alternative.overlap,
+        }
+        for alternative in routes[1:]
+    ], stats
+
+def loaded_graph_info(route):
+    """요청에 쓴 그래프 크기 (코리도로 불러왔으면 시도 횟수와 최단 경로 보장 여부 포함)."""
+    info = {"nodes": route.stats["nodes"], "edges": route.stats["edges"]}
+    if "attempts" in route.stats:
+        info.update(attempts=route.stats["attempts"], optimal=route.stats.get("optimal", False))
+    return info
+
+def find_path_result(data, on_batch=None):
+    """
+    /find-path 요청 처리. (응답 본문, 상태 코드) 를 반환한다.
+    on_batch 를 넘기면 탐색 기록을 batchSize 행씩 넘기고, 응답에는 기록 요약만 담는다.
+    """
+    try:
+        start = data.get("start")
+        end = data.get("end")
+        # 탐색 과정 기록 수준: none(기본) | summary | sampled | full
+        trace_level = data.get("trace", "none")
+        try:
+            sample_every = int(data.get("sampleEvery", 10))
+        except (TypeError, ValueError):
+            return {"error": "sampleEvery must be an integer"}, 400
+        heuristic = data.get("heuristic")
+        try:
+            batch_size = int(data.get("batchSize", STREAM_BATCH_SIZE))
+        except (TypeError, ValueError):
+            return {"error": "batchSize must be an integer"}, 400
+        # 경로 비용: distance(m, 기본) | time(초)
+        weight = data.get("weight", "distance")
+        # 대안 경로 수와 조건 (최단 경로 비용의 배수, 먼저 고른 경로와 겹치는 비용 비율)
+        try:
+            alternatives = int(data.get("alternatives", 0))
+            max_stretch = float(data.get("maxStretch", DEFAULT_MAX_STRETCH))
+            max_overlap = float(data.get("maxOverlap", DEFAULT_MAX_OVERLAP))
+        except (TypeError, ValueError):
+            return {"error": "alternatives, maxStretch and maxOverlap must be numbers"}, 400
+
+        if not start or not end:
+            return {"error": "Start or End coordinates are missing"}, 400
+        if trace_level not in TRACE_LEVELS:
+            return {"error": f"trace must be one of {', '.join(TRACE_LEVELS)}"}, 400
+        if sample_every < 1:
+            return {"error": "sampleEvery must be at least 1"}, 400
+        if heuristic is not None and heuristic not in HEURISTICS:
+            return {"error": f"heuristic must be one of {', '.join(HEURISTICS)}"}, 400
+        if weight not in WEIGHTS:
+            return {"error": f"weight must be one of {', '.join(WEIGHTS)}"}, 400
+        if on_batch is not None and trace_level not in ("sampled", "full"):
+            return {"error": "Streaming requires trace to be sampled or full"}, 400
+        if not 1 <= batch_size <= MAX_STREAM_BATCH_SIZE:
+            return {"error": f"batchSize must be between 1 and {MAX_STREAM_BATCH_SIZE}"}, 400
+        if not 0 <= alternatives <= MAX_ALTERNATIVES:
+            return {"error": f"alternatives must be between 0 and {MAX_ALTERNATIVES}"}, 400
+        if not 1 <= max_stretch <= MAX_ALTERNATIVE_STRETCH:
+            return {"error": f"maxStretch must be between 1 and {MAX_ALTERNATIVE_STRETCH}"}, 400
+        if not 0 <= max_overlap <= 1:
+            return {"error": "maxOverlap must be between 0 and 1"}, 400
+
+        # 요청한 경우에만 탐색 과정 기록
+        make_trace = None
+        if trace_level != "none":
+            make_trace = lambda graph: SearchTrace(graph, trace_level, sample_every=sample_every)
+        route = find_route(start, end, heuristic, make_trace, on_batch, batch_size, weight)
+
+        if route.path is None:
+            return {"error": "No route found between the two points"}, 404
+
+        # 경로를 좌표로 변환
+        with timed("path_coords"):
+            path_coords = path_to_coords(route.path, route.graph, route.start, route.goal)
+
+        body = {
+            "path": path_coords,
+            "exploredNodes": route.trace.to_dict(rows=on_batch is None) if route.trace else None,
+            "loadedGraph": loaded_graph_info(route),
+            "weight": weight,
+            "cost": route.stats.get("distance"),
+            "cached": route.stats.get("cached", False),
+        }
+        if alternatives:
+            body["alternatives"], stats = route_alternatives(route, start, end, alternatives, max_stretch, max_overlap)
+            body["alternativesTimedOut"] = stats["timedOut"]
+        return body, 200
+
+    except Exception as e:
+        print("Error in /find-path:", str(e))
+        return {"error": str(e)}, 500
+
+def find_midpoint_result(data):
+    """/find-midpoint 요청 처리. (응답 본문, 상태 코드) 를 반환한다."""
+    try:
+        start = data.get("start")
+        end = data.get("end")
+
+        if not start or not end:
+            return {"error": "두 위치 정보가 필요합니다"}, 400
+
+        # 최단 경로 찾기
+        route = find_route(start, end)
+
+        if route.path is None:
+            return {"error": "두 위치 사이의 경로를 찾을 수 없습니다"}, 404
+
+        # 경로를 좌표로 변환
+        path_coords = path_to_coords(route.path, route.graph, route.start, route.goal)
+
+        # 경로의 중간지점 찾기 (전체 경로 길이의 50% 지점)
+        total_distance = 0
+        distances = []
+        
+        for i in range(len(path_coords) - 1):
+            point1 = path_coords[i]
+            point2 = path_coords[i + 1]
+            segment_distance = haversine(
+                point1["lat"], point1["lng"],
+                point2["lat"], point2["lng"]
+            )
+            total_distance += segment_distance
+            distances.append(segment_distance)
+
+        half_distance = total_distance / 2
+        current_distance = 0
+
+        # 중간지점이 있는 세그먼트 찾기
+        for i, distance in enumerate(distances):
+            current_distance += distance
+            if current_distance >= half_distance:
+                # 해당 세그먼트에서의 정확한 위치 계산
+                remaining = current_distance - half_distance
+                ratio = remaining / distance
+                midpoint = {
+                    "lat": path_coords[i]["lat"] + (path_coords[i+1]["lat"] - path_coords[i]["lat"]) * (1-ratio),
+                    "lng": path_coords[i]["lng"] + (path_coords[i+1]["lng"] - path_coords[i]["lng"]) * (1-ratio)
+                }
+                return {
+                    "path": path_coords,
+                    "midpoint": midpoint,
+                    "total_distance": total_distance
+                }, 200
+
+        # 경로가 너무 짧은 경우
+        return {
+            "path": path_coords,
+            "midpoint": path_coords[len(path_coords)//2],
+            "total_distance": total_distance
+        }, 200
+
+    except Exception as e:
+        print("Error in /find-midpoint:", str(e))
+        return {"error": str(e)}, 500
+
+def isochrone_tree(origin, budget, weight):
+    """
+    (그래프, 스냅한 출발점, reached_costs 또는 None). 전처리한 지역 안이면 그 그래프를 쓰고
+    (지역 밖으로 나가는 부분은 잘린다, 탐색은 isochrones 가 한다), 아니면 find_isochrone_tree 로
+    예산 안의 노드가 모두 들어올 때까지 넓혀 가며 불러온 bbox 에서 탐색한다.
+    """
+    region = find_region(regions, (origin,))
+    if region is None:
+        graph, start, costs, _ = find_isochrone_tree(origin, budget, weight)
+        return graph, start, costs
+    graph = region.graph.weighted(weight)
+    start = snap_to_edge(origin["lat"], origin["lng"], graph) if graph.num_edges else None
+    return graph, start, None
+
+def isochrone_result(data):
+    """
+    /isochrone 요청 처리. (응답 본문, 상태 코드) 를 반환한다.
+    origin 에서 budgets(weight 단위) 안에 닿는 영역을 cellSize 격자 다각형으로 돌려준다.
+    """
+    try:
+        origin = data.get("origin")
+        budgets = data.get("budgets")
+        weight = data.get("weight", "distance")
+
+        if not origin:
+            return {"error": "origin coordinates are missing"}, 400
+        if weight not in WEIGHTS:
+            return {"error": f"weight must be one of {', '.join(WEIGHTS)}"}, 400
+        if not isinstance(budgets, list) or not 1 <= len(budgets) <= MAX_ISOCHRONE_BUDGETS:
+            return {"error": f"budgets must be a list of 1 to {MAX_ISOCHRONE_BUDGETS} numbers"}, 400
+        try:
+            budgets = [float(budget) for budget in budgets]
+            cell_size = float(data.get("cellSize", DEFAULT_CELL_SIZE))
+        except (TypeError, ValueError):
+            return {"error": "budgets and cellSize must be numbers"}, 400
+        if not all(0 < budget <= MAX_ISOCHRONE_BUDGET[weight] for budget in budgets):
+            return {"error": f"budgets must be between 0 and {MAX_ISOCHRONE_BUDGET[weight]:g} for {weight}"}, 400
+        if not ISOCHRONE_CELL_SIZES[0] <= cell_size <= ISOCHRONE_CELL_SIZES[1]:
+            return {"error": "cellSize must be between {:g} and {:g}".format(*ISOCHRONE_CELL_SIZES)}, 400
+
+        graph, start, costs = isochrone_tree(origin, max(budgets), weight)
+        if start is None:
+            return {"error": "No roads near origin"}, 404
+        stats = {}
+        with timed("isochrone"):
+            areas = isochrones(start, graph, budgets, cell_size, stats, costs)
+        count_search(stats)
+        return {
+            "origin": {"lat": start.lat, "lng": start.lon},
+            "weight": weight,
+            "isochrones": areas,
+            "loadedGraph": {"nodes": graph.num_nodes, "edges": graph.num_edges},
+            "settled": stats["settled"],
+        }, 200
+
+    except Exception as e:
+        print("Error in /isochrone:", str(e))
+        return {"error": str(e)}, 500
+
+def distance_matrix_result(data):
+    """/distance-matrix 요청 처리. (응답 본문, 상태 코드) 를 반환한다."""
+    try:
+        origins = data.get("origins")
+        destinations = data.get("destinations")
+        # 이 거리(m)보다 먼 쌍은 찾지 않고 닿지 않는 것으로 표시
+        try:
+            max_distance = float(data.get("maxDistance", MAX_MATRIX_DISTANCE))
+        except (TypeError, ValueError):
+            return {"error": "maxDistance must be a number"}, 400
+
+        if not origins or not destinations or not isinstance(origins, list) or not isinstance(destinations, list):
+            return {"error": "origins and destinations are required"}, 400
+        if len(origins) > MAX_MATRIX_POINTS or len(destinations) > MAX_MATRIX_POINTS:
+            return {"error": f"At most {MAX_MATRIX_POINTS} origins and destinations are allowed"}, 400
+        if not all(valid_point(point) for point in origins + destinations):
+            return {"error": "origins and destinations must be {lat, lng} coordinates"}, 400
+        if not 0 < max_distance <= MAX_MATRIX_DISTANCE:
+            return {"error": f"maxDistance must be between 0 and {MAX_MATRIX_DISTANCE:g}"}, 400
+
+        # 모든 좌표를 덮는 그래프를 한 번만 불러와 함께 쓴다.
+        graph = area_graph(origins + destinations)
+        origin_nodes = [snap_to_edge(p["lat"], p["lng"], graph) for p in origins]
+        destination_nodes = [snap_to_edge(p["lat"], p["lng"], graph) for p in destinations]
+        stats = {}
+        with timed("distance_matrix"):
+            matrix = distance_matrix(origin_nodes, destination_nodes, graph, max_distance, stats)
+        count_search(stats)
+
+        # 닿지 않는 쌍은 null
+        return {
+            "distances": [[d if math.isfinite(d) else None for d in row] for row in matrix.tolist()],
+            "loadedGraph": {"nodes": graph.num_nodes, "edges": graph.num_edges},
+        }, 200
+
+    except Exception as e:
+        print("Error in /distance-matrix:", str(e))
+        return {"error": str(e)}, 500
+
+def meeting_point_result(data):
+    """
+    /meeting-point 요청 처리. (응답 본문, 상태 코드) 를 반환한다.
+    members 는 방 참가자들이 공유한 위치 [{"username", "location"}] 로, app 이 방 정보에서 채운다.
+    """
+    try:
+        members = data.get("members")
+        objective = data.get("objective", "minmax")
+
+        if objective not in MEETING_OBJECTIVES:
+            return {"error": f"objective must be one of {', '.join(MEETING_OBJECTIVES)}"}, 400
+        if not isinstance(members, list) or len(members) < 2:
+            return {"error": "두 명 이상의 위치 정보가 필요합니다"}, 400
+        if len(members) > MAX_MEETING_MEMBERS:
+            return {"error": f"최대 {MAX_MEETING_MEMBERS}명의 위치로 만남 장소를 찾을 수 있습니다"}, 400
+        if not all(isinstance(member, dict) and valid_point(member.get("location")) for member in members):
+            return {"error": "위치 정보가 {lat, lng} 좌표가 아닙니다"}, 400
+
+        locations = [member["location"] for member in members]
+        graph = area_graph(locations)
+        nodes = [snap_to_edge(p["lat"], p["lng"], graph) for p in locations]
+        stats = {}
+        with timed("meeting_point"):
+            result = meeting_point(nodes, graph, objective, MAX_MEETING_DISTANCE, stats)
+        count_search(stats)
+        if result is None:
+            return {"error": "모두가 갈 수 있는 만남 장소를 찾을 수 없습니다"}, 404
+
+        node, distances, paths = result
+        with timed("path_coords"):
+            member_paths = [path_to_coords(path, graph, start=start) for start, path in zip(nodes, paths)]
+        return {
+            "meetingPoint": {"lat": float(graph.lat[node]), "lng": float(graph.lon[node])},
+            "objective": objective,
+            "members": [
+                {"username": member.get("username"), "distance": distance, "path": path}
+                for member, distance, path in zip(members, distances, member_paths)
+            ],
+            "total_distance": sum(distances),
+            "max_distance": max(distances),
+            "loadedGraph": {"nodes": graph.num_nodes, "edges": graph.num_edges},
+        }, 200
+
+    except Exception as e:
+        print("Error in /meeting-point:", str(e))
+        return {"error": str(e)}, 500
+
+def _route_edges(key, value):
+    """캐시된 경로가 지나는 (u, v) OSM 엣지. 끝점이 놓인 도로 구간은 양방향 모두 넣는다."""
+    if key[3] == "tiles":
+        nodes = value[0]
+    else:
+        graph = next(region.graph for region in regions if key[3] == "region:" + region.name)
+        nodes = graph.node_ids[value[0]]
+    nodes = [int(node) for node in nodes]
+    edges = set(zip(nodes, nodes[1:]))
+    for endpoint in key[:2]:
+        if isinstance(endpoint, tuple):
+            u, v, _ = endpoint
+            edges.update(((u, v), (v, u)))
+    return edges
+
+def _stale_route(changes, key, value):
+    """
+    엣지 갱신 뒤에 캐시된 경로를 버려야 하는지. 가중치가 늘기만 했다면 그 엣지를 지나지 않는
+    최단 경로는 그대로 최단이다. 줄어든 엣지(통제 해제, 정체 완화)가 있으면 어느 경로든 더 짧은
+    경로가 생길 수 있으므로 같은 가중치의 경로를 모두 버린다.
+    """
+    increased, decreased = changes[key[2]]
+    return decreased or (bool(increased) and not increased.isdisjoint(_route_edges(key, value)))
+
+def _apply_edge_delta(delta):
+    """
+    edge_updates 의 지금 버전으로 지역 그래프들을 바꾸고, 바뀐 엣지(delta)가 있는 불러 둔 그래프와
+    영향을 받는 캐시된 경로만 버린다. (버린 그래프 수, 버린 경로 수).
+    CH 와 ALT 랜드마크는 갱신 전 거리로 만든 그대로 쓴다 (find_route 참고).
+    """
+    global regions
+    version, factors = edge_updates.snapshot()
+    regions = [region._replace(graph=region.graph.with_edge_factors(factors, version)) for region in regions]
+    if not delta:
+        return 0, 0
+    dropped = graph_loads.discard(lambda graph: any(graph.edge_position(*edge) is not None for edge in delta))
+    changes = {weight: changed_edges(delta, weight) for weight in WEIGHTS}
+    return dropped, route_cache.invalidate(partial(_stale_route, changes))
+
+def update_edges(changes):
+    """엣지 갱신 [(u, v, key, 배수)] 을 한 번에 적용하고 결과 요약을 반환한다."""
+    with _edge_update_lock:
+        delta = edge_updates.apply(changes)
+        dropped = invalidated = 0
+        if delta:
+            dropped, invalidated = _apply_edge_delta(delta)
+        return {
+            "version": edge_updates.version,
+            "changed": len(delta),
+            "droppedGraphs": dropped,
+            "invalidatedRoutes": invalidated,
+        }
+
+def sync_edge_updates(state):
+    """작업 프로세스에서 서버 프로세스의 edge_updates.snapshot() 을 따라간다."""
+    version, factors = state
+    with _edge_update_lock:
+        if version != edge_updates.version:
+            _apply_edge_delta(edge_updates.replace(version, factors))
+
+def update_edges_result(data):
+    """/edge-updates 요청 처리. (응답 본문, 상태 코드) 를 반환한다."""
+    try:
+        changes = parse_edge_updates((data or {}).get("updates"))
+    except (TypeError, ValueError) as e:
+        return {"error": str(e)}, 400
+    return update_edges(changes), 200
+
+# 작업 프로세스에서 실행할 수 있는 요청 종류
+ROUTE_REQUESTS = {
+    "find-path": find_path_result,
+    "find-midpoint": find_midpoint_result,
+    "isochrone": isochrone_result,
+    "distance-matrix": distance_matrix_result,
+    "meeting-point": meeting_point_result,
+}
+
+def _timed_result(data, handle):
+    """
+    handle() 의 (응답 본문, 상태 코드) 에 처리 시간 (RequestTimings.to_dict()) 을 더한 세 값.
+    요청에 "timing": true 가 있으면 응답 본문에도 "timing" 으로 싣는다.
+    """
+    with request_timings() as timings:
+        body, status = handle()
+    timing = timings.to_dict()
+    if data.get("timing") and isinstance(body, dict):
+        body["timing"] = timing
+    return body, status, timing
+
+def run_route_request(kind, data, updates=None):
+    """
+    kind 요청을 처리한 (응답 본문, 상태 코드, 처리 시간). 처리 시간은 metrics.observe_request 에 넘긴다.
+    updates 는 작업을 넣을 때의 edge_updates.snapshot() 으로, 주면 먼저 그 버전으로 맞춘다.
+    """
+    if updates is not None:
+        sync_edge_updates(updates)
+    return _timed_result(data, lambda: ROUTE_REQUESTS[kind](data))
+
+# 탐색 과정을 스트리밍할 수 있는 요청 종류
+STREAM_REQUESTS = {
+    "find-path": find_path_result,
+}
+
+def run_route_stream(kind, data, batches, updates=None):
+    """
+    kind 요청을 처리하며 탐색 기록 묶음을 batches 큐(크기 제한이 있는 multiprocessing 큐)에 넣는다.
+    큐가 가득 차면 탐색을 멈추고 기다리며, STREAM_PUT_TIMEOUT 초 안에 자리가 나지 않으면
+    (받는 쪽이 멈춘 것으로 보고) 탐색을 그만두고 오류 응답을 반환한다.
+    updates 와 반환값은 run_route_request 와 같다.
+    """
+    if updates is not None:
+        sync_edge_updates(updates)
+    stalled = []
+
+    def put(batch):
+        try:
+            batches.put(batch, timeout=STREAM_PUT_TIMEOUT)
+        except queue.Full:
+            stalled.append(True)
+            raise TimeoutError("Streaming client stopped receiving search batches") from None
+
+    result = _timed_result(data, lambda: STREAM_REQUESTS[kind](data, put))
+    if not stalled:
+        try:
+            batches.put(None, timeout=STREAM_PUT_TIMEOUT)  # 끝 표시
+        except queue.Full:
+            pass
+    return result
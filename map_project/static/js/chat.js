@@ -172,45 +172,31 @@ findMidpointBtn.addEventListener('click', async () => {
     }
 
     try {
-        // 모든 위치 쌍에 대해 중간지점 찾기
-        const locations = Array.from(userLocations.values()).map(data => data.location);
-        let allMidpoints = [];
-        let totalDistance = 0;
-
-        for (let i = 0; i < locations.length; i++) {
-            for (let j = i + 1; j < locations.length; j++) {
-                const response = await fetch("/find-midpoint", {
-                    method: "POST",
-                    headers: { "Content-Type": "application/json" },
-                    body: JSON.stringify({
-                        start: locations[i],
-                        end: locations[j]
-                    })
-                });
-
-                const data = await response.json();
-                if (!data.error) {
-                    allMidpoints.push(data.midpoint);
-                    totalDistance += data.total_distance;
-
-                    // 경로 표시
-                    new google.maps.Polyline({
-                        path: data.path,
-                        geodesic: true,
-                        strokeColor: "#FF0000",
-                        strokeOpacity: 0.5,
-                        strokeWeight: 2,
-                        map: window.map
-                    });
-                }
-            }
+        // 방 참가자 모두의 위치에서, 가장 멀리 이동하는 사람의 거리가 가장 짧은 만남 장소 찾기
+        // (다른 경로 요청처럼 연결되어 있으면 작업으로 맡긴다)
+        const data = await requestRoute("/meeting-point", {
+            room: currentRoom,
+            objective: "minmax"
+        });
+        if (data.error) {
+            alert(data.error);
+            return;
         }
 
-        // 모든 중간지점의 평균 계산
-        const centerPoint = {
-            lat: allMidpoints.reduce((sum, point) => sum + point.lat, 0) / allMidpoints.length,
-            lng: allMidpoints.reduce((sum, point) => sum + point.lng, 0) / allMidpoints.length
-        };
+        // 참가자별 경로 표시
+        data.members.forEach(member => {
+            new google.maps.Polyline({
+                path: member.path,
+                geodesic: true,
+                strokeColor: "#FF0000",
+                strokeOpacity: 0.5,
+                strokeWeight: 2,
+                map: window.map
+            });
+        });
+
+        const centerPoint = data.meetingPoint;
+        const totalDistance = data.total_distance;
 
         // 최종 중간지점 마커 표시
         const midpointMarker = new google.maps.Marker({
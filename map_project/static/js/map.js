@@ -102,6 +102,91 @@ function setupEventListeners() {
     });
 }
 
+// 서버 작업 풀에서 처리 중인 경로 작업 (작업 ID -> resolve), 먼저 도착한 결과
+const pendingRouteJobs = new Map();
+const finishedRouteJobs = new Map();
+let routeJobListener = false;
+
+// 스트리밍 중인 탐색 기록 (작업 ID -> 열 단위 trace). 'route_batch' 묶음을 이어 붙인다.
+const streamedTraces = new Map();
+
+function isSocketConnected() {
+    return typeof socket !== "undefined" && socket.connected;
+}
+
+// 경로 요청. Socket.IO 로 연결되어 있으면 작업으로 맡기고 'route_job' 이벤트로 결과를 받는다.
+// onJob(jobId) 를 넘기면 작업 ID 를 받자마자 부른다.
+async function requestRoute(url, body, onJob) {
+    const connected = isSocketConnected();
+    if (connected) {
+        listenForRouteJobs();
+    }
+    const response = await fetch(url, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(connected ? { ...body, sid: socket.id } : body),
+    });
+    const data = await response.json();
+    if (!connected || data.error) {
+        return data;
+    }
+    if (onJob) {
+        onJob(data.jobId);
+    }
+    return waitForRouteJob(data.jobId);
+}
+
+function streamedTrace(jobId) {
+    if (!streamedTraces.has(jobId)) {
+        streamedTraces.set(jobId, { lat: [], lng: [], cost: [], parent: [], direction: [], streaming: true });
+    }
+    return streamedTraces.get(jobId);
+}
+
+// 묶음을 받았다고 바로 응답(ack)해야 서버가 다음 묶음을 보낸다.
+function appendTraceBatch(batch, ack) {
+    const trace = streamedTrace(batch.jobId);
+    if (batch.offset === 0 && trace.lat.length) {
+        // 코리도를 넓혀 다시 탐색하면 기록도 처음부터 다시 온다.
+        ["lat", "lng", "cost", "parent", "direction"].forEach(column => { trace[column].length = 0; });
+        trace.restarted = true;
+    }
+    ["lat", "lng", "cost", "parent", "direction"].forEach(column => trace[column].push(...batch[column]));
+    trace.settled = batch.settled;
+    if (ack) {
+        ack();
+    }
+}
+
+function listenForRouteJobs() {
+    if (routeJobListener) {
+        return;
+    }
+    socket.on("route_batch", appendTraceBatch);
+    socket.on("route_job", (job) => {
+        const resolve = pendingRouteJobs.get(job.jobId);
+        if (resolve) {
+            pendingRouteJobs.delete(job.jobId);
+            resolve(job.result);
+        } else {
+            finishedRouteJobs.set(job.jobId, job.result);
+        }
+    });
+    routeJobListener = true;
+}
+
+function waitForRouteJob(jobId) {
+    return new Promise((resolve) => {
+        // HTTP 응답보다 결과 이벤트가 먼저 도착했을 수 있다.
+        if (finishedRouteJobs.has(jobId)) {
+            resolve(finishedRouteJobs.get(jobId));
+            finishedRouteJobs.delete(jobId);
+        } else {
+            pendingRouteJobs.set(jobId, resolve);
+        }
+    });
+}
+
 async function handleFindPath() {
     if (!startCoords || !endCoords) {
         alert("출발지와 목적지를 모두 선택하세요.");
@@ -112,18 +197,28 @@ async function handleFindPath() {
     document.getElementById("visualization-controls").classList.remove("hidden");
 
     try {
-        const response = await fetch("/find-path", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ start: startCoords, end: endCoords }),
+        // Socket.IO 로 연결되어 있으면 탐색하는 동안 기록을 묶음으로 받아 바로 그리기 시작한다.
+        const stream = isSocketConnected();
+        let streamJobId = null;
+        let trace = null;
+        const request = { start: startCoords, end: endCoords, trace: "full", stream: stream };
+        pathData = await requestRoute("/find-path", request, (jobId) => {
+            streamJobId = jobId;
+            trace = streamedTrace(jobId);
+            visualizeExplorationStep(trace);
         });
 
-        pathData = await response.json();
-
+        if (trace) {
+            trace.streaming = false;
+            streamedTraces.delete(streamJobId);
+        }
         if (pathData.error) {
             alert(pathData.error);
             return;
         }
+        if (trace) {
+            pathData.exploredNodes = Object.assign(trace, pathData.exploredNodes);
+        }
 
         showFinalPath(true);
     } catch (error) {
@@ -158,22 +253,37 @@ function createExplorationLine(from, to, isForward = true) {
     return line;
 }
 
-function visualizeExplorationStep(nodes, nodeIndex = 0) {
-    if (!nodes || nodeIndex >= nodes.length) return;
+// 탐색 기록(trace)은 열 단위 배열: lat[i], lng[i], cost[i], parent[i], direction[i]
+function traceNode(trace, index) {
+    return {
+        lat: trace.lat[index],
+        lng: trace.lng[index],
+        cost: trace.cost[index],
+        parent: trace.parent[index],
+        isForward: trace.direction[index] === 0
+    };
+}
 
-    const node = nodes[nodeIndex];
-    const isForward = node.direction === "forward";
-    
-    // 현재 노드 마커 생성
+// parent 를 따라가며 해당 노드까지의 임시 최단 경로 복원
+function tracePath(trace, index) {
+    const path = [];
+    for (let i = index; i >= 0; i = trace.parent[i]) {
+        path.push({ lat: trace.lat[i], lng: trace.lng[i] });
+    }
+    return path;
+}
+
+function createNodeMarker(node) {
+    const color = node.isForward ? "#4444FF" : "#44FF44";
     const marker = new google.maps.Marker({
         position: { lat: node.lat, lng: node.lng },
         map: window.map,
         icon: {
             path: google.maps.SymbolPath.CIRCLE,
             scale: 5,
-            fillColor: isForward ? "#4444FF" : "#44FF44",
+            fillColor: color,
             fillOpacity: 0.7,
-            strokeColor: isForward ? "#4444FF" : "#44FF44",
+            strokeColor: color,
             strokeWeight: 1,
         },
     });
@@ -186,41 +296,54 @@ function visualizeExplorationStep(nodes, nodeIndex = 0) {
     marker.addListener("click", () => {
         infoWindow.open(window.map, marker);
     });
+    return marker;
+}
 
-    // 임시 최단 경로가 있다면 표시
-    if (node.tempPath) {
-        // 이전 임시 경로 제거
-        pathPolylines.filter(line => line.tempPath).forEach(line => line.setMap(null));
-        pathPolylines = pathPolylines.filter(line => !line.tempPath);
-        
-        // 새로운 임시 경로 표시
-        const tempPathLine = new google.maps.Polyline({
-            path: node.tempPath,
-            geodesic: true,
-            strokeColor: "#000000",
-            strokeOpacity: 0.7,
-            strokeWeight: 2,
-            map: window.map
-        });
-        tempPathLine.tempPath = true;
-        pathPolylines.push(tempPathLine);
+function visualizeExplorationStep(trace, nodeIndex = 0) {
+    if (!trace || !trace.lat) return;
+    if (trace.restarted) {
+        // 다시 시작한 탐색은 처음부터 그린다.
+        trace.restarted = false;
+        clearVisualization();
+        nodeIndex = 0;
+    }
+    if (nodeIndex >= trace.lat.length) {
+        // 스트리밍 중이면 다음 묶음이 올 때까지 기다린다.
+        if (trace.streaming) {
+            currentVisualizationTimeout = setTimeout(() => visualizeExplorationStep(trace, nodeIndex), animationSpeed);
+        }
+        return;
     }
 
+    const node = traceNode(trace, nodeIndex);
+
+    // 현재 노드 마커 생성
+    createNodeMarker(node);
+
+    // 이전 임시 경로 제거 후 현재 노드까지의 임시 최단 경로 표시
+    pathPolylines.filter(line => line.tempPath).forEach(line => line.setMap(null));
+    pathPolylines = pathPolylines.filter(line => !line.tempPath);
+
+    const tempPathLine = new google.maps.Polyline({
+        path: tracePath(trace, nodeIndex),
+        geodesic: true,
+        strokeColor: "#000000",
+        strokeOpacity: 0.7,
+        strokeWeight: 2,
+        map: window.map
+    });
+    tempPathLine.tempPath = true;
+    pathPolylines.push(tempPathLine);
+
     // 이전 노드와 연결선 그리기
-    if (node.previousNode !== null) {
-        const previousNode = nodes.find(n => n.id === node.previousNode);
-        if (previousNode) {
-            createExplorationLine(
-                { lat: previousNode.lat, lng: previousNode.lng },
-                { lat: node.lat, lng: node.lng },
-                isForward
-            );
-        }
+    if (node.parent >= 0) {
+        const previousNode = traceNode(trace, node.parent);
+        createExplorationLine(previousNode, node, node.isForward);
     }
 
     // 다음 노드 처리
     currentVisualizationTimeout = setTimeout(() => {
-        visualizeExplorationStep(nodes, nodeIndex + 1);
+        visualizeExplorationStep(trace, nodeIndex + 1);
     }, animationSpeed);
 }
 
@@ -245,46 +368,20 @@ function showAllNodesInstantly() {
     
     // 최단 경로 먼저 표시
     showFinalPath(true);
-    
-    // 모든 노드와 연결선 즉시 표시
-    pathData.exploredNodes.forEach(node => {
-        const isForward = node.direction === "forward";
-        
-        // 노드 마커 생성
-        const marker = new google.maps.Marker({
-            position: { lat: node.lat, lng: node.lng },
-            map: window.map,
-            icon: {
-                path: google.maps.SymbolPath.CIRCLE,
-                scale: 5,
-                fillColor: isForward ? "#4444FF" : "#44FF44",
-                fillOpacity: 0.7,
-                strokeColor: isForward ? "#4444FF" : "#44FF44",
-                strokeWeight: 1,
-            },
-        });
-        markers.push(marker);
 
-        // 비용 정보 표시
-        const infoWindow = new google.maps.InfoWindow({
-            content: `<div>Cost: ${node.cost.toFixed(2)}</div>`,
-        });
-        marker.addListener("click", () => {
-            infoWindow.open(window.map, marker);
-        });
+    const trace = pathData.exploredNodes;
+    if (!trace || !trace.lat) return;
+
+    // 모든 노드와 연결선 즉시 표시
+    for (let i = 0; i < trace.lat.length; i++) {
+        const node = traceNode(trace, i);
+        createNodeMarker(node);
 
         // 이전 노드와 연결선 그리기
-        if (node.previousNode !== null) {
-            const previousNode = pathData.exploredNodes.find(n => n.id === node.previousNode);
-            if (previousNode) {
-                createExplorationLine(
-                    { lat: previousNode.lat, lng: previousNode.lng },
-                    { lat: node.lat, lng: node.lng },
-                    isForward
-                );
-            }
+        if (node.parent >= 0) {
+            createExplorationLine(traceNode(trace, node.parent), node, node.isForward);
         }
-    });
+    }
 }
 
 window.onload = initMap;
\ No newline at end of file
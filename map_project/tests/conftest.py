@@ -0,0 +1,77 @@
+import pytest
+
+import routing
+from algorithms import road_network
+from algorithms.contraction import build_contraction_hierarchy
+from algorithms.graph import RoadGraph
+from algorithms.graph_provider import ARRAY_NAMES, SyntheticGraphProvider
+from algorithms.landmarks import Landmarks
+from algorithms.regions import Region
+from algorithms.synthetic import CITY_KINDS, city_arrays
+from tests.helpers import CITY_NODES
+
+
+@pytest.fixture(scope="session", params=CITY_KINDS)
+def city_kind(request):
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def city(city_kind):
+    """synthetic.city_arrays 로 만든 가상 도로망 배열 (GRAPH_PROVIDER="synthetic:<종류>,nodes=900,seed=1" 과 같다)."""
+    return city_arrays(city_kind, CITY_NODES, seed=1)
+
+
+@pytest.fixture(scope="session")
+def city_graph(city):
+    return RoadGraph.from_edges(*(city[name] for name in ARRAY_NAMES))
+
+
+@pytest.fixture(scope="session")
+def landmarks(city_graph):
+    return Landmarks.build(city_graph, 8)
+
+
+@pytest.fixture(scope="session")
+def ch(city_graph):
+    return build_contraction_hierarchy(city_graph)
+
+
+@pytest.fixture
+def provider(city_kind, monkeypatch):
+    """
+    find_corridor_route 가 불러올 도로망을 city 와 같은 가상 도로망으로 바꾼다.
+    지역 밖으로 나간 요청도 OSM 을 내려받지 않는다. 다른 도로망에서 불러 둔 그래프는 버린다.
+    """
+    provider = SyntheticGraphProvider(kind=city_kind, nodes=CITY_NODES, seed=1)
+    monkeypatch.setattr(road_network, "graph_provider", provider)
+    road_network.graph_loads.clear()
+    yield provider
+    road_network.graph_loads.clear()
+
+
+@pytest.fixture
+def edge_updates():
+    """routing.update_edges. 테스트가 바꾼 갱신은 끝나면 되돌리고 캐시를 비운다."""
+    routing.route_cache.clear()
+    routing.graph_loads.clear()
+    yield routing.update_edges
+    _, factors = routing.edge_updates.snapshot()
+    routing.update_edges([(u, v, key, 1.0) for u, v, key in factors])
+    routing.route_cache.clear()
+    routing.graph_loads.clear()
+
+
+@pytest.fixture
+def region(city_graph, landmarks, ch, monkeypatch):
+    """city_graph 를 CH, 랜드마크와 함께 전처리한 지역 하나만 있는 것으로 한다."""
+    region = Region("test", None, city_graph, ch, landmarks, 0.0, 0.0)
+    monkeypatch.setattr(routing, "regions", [region])
+    return region
+
+
+@pytest.fixture
+def client():
+    """sid 없이 보내면 요청 스레드에서 처리하는 Flask 테스트 클라이언트."""
+    from app import app
+    return app.test_client()
@@ -0,0 +1,91 @@
+"""테스트에서 함께 쓰는 도우미: 노드 쌍과 좌표 고르기, Dijkstra 와 비교하기."""
+import math
+
+import numpy as np
+import pytest
+
+from algorithms import road_network
+from algorithms.path_finder import dijkstra_search, path_cost, snap_to_edge
+
+CITY_NODES = 900  # 테스트용 가상 도로망의 교차로 수 (CH 를 만드는 데 1초 남짓)
+
+
+def random_pairs(graph, count, seed=0):
+    """서로 다른 임의의 (출발, 도착) 노드 쌍."""
+    rng = np.random.default_rng(seed)
+    pairs = []
+    while len(pairs) < count:
+        start, goal = rng.integers(0, graph.num_nodes, 2)
+        if start != goal:
+            pairs.append((int(start), int(goal)))
+    return pairs
+
+
+def endpoints(graph, pairs):
+    """노드 쌍 대신 각 노드에서 나가는 도로 구간의 1/4 지점 좌표 쌍 (도로망 범위 안에서 구간 위로 스냅된다)."""
+    def point(node):
+        lo, hi = graph.fwd_offsets[node], graph.fwd_offsets[node + 1]
+        other = graph.fwd_targets[lo] if hi > lo else node
+        return {
+            "lat": float(0.75 * graph.lat[node] + 0.25 * graph.lat[other]),
+            "lng": float(0.75 * graph.lon[node] + 0.25 * graph.lon[other]),
+        }
+    return [(point(start), point(goal)) for start, goal in pairs]
+
+
+def path_edges(graph, path):
+    """경로 노드 목록이 지나는 엣지의 OSM (u, v, key). 평행 엣지는 모두 넣는다."""
+    edges = []
+    for u, v in zip(path, path[1:]):
+        for edge in range(graph.fwd_offsets[u], graph.fwd_offsets[u + 1]):
+            if graph.fwd_targets[edge] == v:
+                edges.append((int(graph.node_ids[u]), int(graph.node_ids[v]), int(graph.fwd_keys[edge])))
+    return edges
+
+
+def assert_same_cost(search, start, goal, graph):
+    """search 가 Dijkstra 와 같은 거리의 (끊기지 않은) 경로를 찾는지. 찾은 경로를 반환한다."""
+    expected, found = {}, {}
+    dijkstra_search(start, goal, graph, stats=expected)
+    path, _ = search(start, goal, graph, stats=found)
+    assert found["distance"] == pytest.approx(expected["distance"], rel=1e-6)
+    if path is not None:
+        assert path_cost(path, start, goal, graph) == pytest.approx(expected["distance"], rel=1e-6)
+    return path
+
+
+def assert_route_optimal(route):
+    """route 가 그 그래프에서 Dijkstra 와 같은 거리의 경로인지 (경로가 없으면 Dijkstra 도 못 찾는지)."""
+    expected = {}
+    dijkstra_search(route.start, route.goal, route.graph, stats=expected)
+    if route.path is None:
+        assert expected["distance"] == math.inf
+        return
+    assert route.stats["distance"] == pytest.approx(expected["distance"], rel=1e-6)
+    assert path_cost(route.path, route.start, route.goal, route.graph) == pytest.approx(expected["distance"], rel=1e-6)
+
+
+def assert_corridor_optimal(full, start, end, weight="distance"):
+    """
+    find_corridor_route 가 도로망 전체(full, 현재 엣지 갱신을 적용)에서 Dijkstra 로 찾은 것과 같은
+    거리의 경로를 찾는지. 찾은 경로를 반환한다.
+    """
+    route = road_network.find_corridor_route(start, end, weight=weight)
+    _, factors = road_network.edge_updates.snapshot()
+    graph = (full.with_edge_factors(factors) if factors else full).weighted(weight)
+    expected = {}
+    dijkstra_search(snap_to_edge(start["lat"], start["lng"], graph),
+                    snap_to_edge(end["lat"], end["lng"], graph), graph, stats=expected)
+    if route.path is None:
+        assert expected["distance"] == math.inf
+        return route
+    assert route.stats["optimal"]
+    assert route.stats["distance"] == pytest.approx(expected["distance"], rel=1e-6)
+    return route
+
+
+def random_points(graph, count, seed=0):
+    """도로망 범위 안의 임의 (lat, lon) 좌표."""
+    north, south, east, west = graph.bounds
+    rng = np.random.default_rng(seed)
+    return list(zip(rng.uniform(south, north, count).tolist(), rng.uniform(west, east, count).tolist()))
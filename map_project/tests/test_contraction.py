@@ -0,0 +1,22 @@
+"""Contraction Hierarchies 질의가 Dijkstra 와 같은 최단 거리와 경로를 찾는지 확인한다."""
+from algorithms.contraction import ContractionHierarchy
+from tests.helpers import assert_same_cost, random_pairs
+
+PAIRS = 30
+
+
+def ch_search(ch):
+    return lambda start, goal, graph, stats: ch.search(start, goal, stats=stats)
+
+
+def test_ch_matches_dijkstra(city_graph, ch):
+    for start, goal in random_pairs(city_graph, PAIRS):
+        assert_same_cost(ch_search(ch), start, goal, city_graph)
+
+
+def test_ch_save_and_load(city_graph, ch, tmp_path):
+    """저장했다가 불러온 CH 도 같은 경로를 찾는다."""
+    ch.save(tmp_path / "city.npz")
+    loaded = ContractionHierarchy.load(tmp_path / "city.npz")
+    for start, goal in random_pairs(city_graph, 10, seed=2):
+        assert loaded.search(start, goal)[0] == ch.search(start, goal)[0]
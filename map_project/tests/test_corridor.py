@@ -0,0 +1,8 @@
+"""코리도 탐색이 도로망 전체에서 찾은 것과 같은 최단 경로를 찾는지 확인한다."""
+from tests.helpers import assert_corridor_optimal, endpoints, random_pairs
+
+
+def test_corridor_route_matches_dijkstra(city_graph, provider):
+    for start, end in endpoints(city_graph, random_pairs(city_graph, 8, seed=6)):
+        assert_corridor_optimal(city_graph, start, end)
+
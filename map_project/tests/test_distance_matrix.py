@@ -0,0 +1,42 @@
+"""/distance-matrix 가 Dijkstra 와 같은 거리를 돌려주고, 잘못된 요청은 400 으로 거절하는지 확인한다."""
+import pytest
+
+from algorithms.path_finder import dijkstra_search, snap_to_edge
+from routing import MAX_MATRIX_DISTANCE, MAX_MATRIX_POINTS
+from tests.helpers import endpoints, random_pairs
+
+
+def test_matrix_matches_dijkstra(city_graph, region, client):
+    pairs = endpoints(city_graph, random_pairs(city_graph, 4, seed=10))
+    origins, destinations = [start for start, _ in pairs], [end for _, end in pairs]
+    response = client.post("/distance-matrix", json={
+        "origins": origins, "destinations": destinations, "maxDistance": 3000,
+    })
+    assert response.status_code == 200
+    distances = response.get_json()["distances"]
+
+    for origin, row in zip(origins, distances):
+        start = snap_to_edge(origin["lat"], origin["lng"], city_graph)
+        for destination, distance in zip(destinations, row):
+            expected = {}
+            dijkstra_search(start, snap_to_edge(destination["lat"], destination["lng"], city_graph), city_graph,
+                            stats=expected)
+            if expected["distance"] > 3000:
+                assert distance is None
+            else:
+                assert distance == pytest.approx(expected["distance"], rel=1e-6)
+
+
+@pytest.mark.parametrize("body", [
+    {"origins": [{"lat": 0.0, "lng": 0.0}], "destinations": [{"lat": 0.0, "lng": 0.0}], "maxDistance": "far"},
+    {"origins": [{"lat": 0.0, "lng": 0.0}], "destinations": [{"lat": 0.0, "lng": 0.0}],
+     "maxDistance": MAX_MATRIX_DISTANCE * 2},
+    {"origins": [{"lat": 0.0}], "destinations": [{"lat": 0.0, "lng": 0.0}]},
+    {"origins": [{"lat": "0", "lng": 0.0}], "destinations": [{"lat": 0.0, "lng": 0.0}]},
+    {"origins": [{"lat": 0.0, "lng": 0.0}] * (MAX_MATRIX_POINTS + 1), "destinations": [{"lat": 0.0, "lng": 0.0}]},
+    {"origins": [], "destinations": [{"lat": 0.0, "lng": 0.0}]},
+])
+def test_bad_request(client, body):
+    response = client.post("/distance-matrix", json=body)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
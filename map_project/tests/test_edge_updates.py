@@ -0,0 +1,115 @@
+"""엣지 갱신(통제, 속도 계수) 뒤에도 탐색과 경로 캐시가 최단 경로를 돌려주는지 확인한다."""
+import math
+import threading
+from functools import partial
+
+import numpy as np
+import pytest
+
+import routing
+from algorithms import road_network
+from algorithms.edge_updates import CLOSED
+from algorithms.path_finder import bidirectional_a_star, path_cost
+from algorithms.regions import Region
+from tests.helpers import (
+    assert_corridor_optimal, assert_route_optimal, assert_same_cost, endpoints, path_edges, random_pairs,
+)
+
+PAIRS = 30
+
+
+def test_search_matches_dijkstra_after_closures(city_graph, landmarks):
+    """통제한 엣지는 지나지 않고, 갱신 전 거리로 만든 랜드마크 하한도 그대로 맞다."""
+    rng = np.random.default_rng(3)
+    closed = rng.choice(city_graph.num_edges, city_graph.num_edges // 10, replace=False)
+    sources = np.repeat(np.arange(city_graph.num_nodes), np.diff(city_graph.fwd_offsets))
+    factors = {
+        (int(city_graph.node_ids[sources[edge]]), int(city_graph.node_ids[city_graph.fwd_targets[edge]]),
+         int(city_graph.fwd_keys[edge])): CLOSED
+        for edge in closed
+    }
+    updated = city_graph.with_edge_factors(factors)
+    alt = partial(bidirectional_a_star, heuristic=landmarks)
+    for start, goal in random_pairs(updated, PAIRS, seed=4):
+        for search in (bidirectional_a_star, alt):
+            path = assert_same_cost(search, start, goal, updated)
+            if path is not None:
+                assert math.isfinite(path_cost(path, start, goal, updated))
+
+    reopened = updated.with_edge_factors({})
+    for start, goal in random_pairs(reopened, PAIRS, seed=4):
+        assert_same_cost(alt, start, goal, reopened)
+
+
+@pytest.mark.parametrize("heuristic", [None, "straight", "landmarks", "ch"])
+def test_region_route_follows_edge_updates(city_graph, landmarks, ch, heuristic, provider, edge_updates, monkeypatch):
+    """
+    전처리한 지역에서 찾은 경로가 통제 전, 경로 위 엣지를 통제한 뒤, 다시 연 뒤 모두 최단인지.
+    CH 와 랜드마크는 통제 전 거리로 만든 그대로 쓴다.
+    """
+    region = Region("test", None, city_graph, ch, landmarks, 0.0, 0.0)
+    monkeypatch.setattr(routing, "regions", [region])
+    for start, end in endpoints(city_graph, random_pairs(city_graph, 10, seed=5)):
+        route = routing.find_route(start, end, heuristic)
+        assert_route_optimal(route)
+
+        edges = path_edges(route.graph, route.path) if route.path else []
+        if edges:
+            edge_updates([(u, v, key, CLOSED) for u, v, key in edges[len(edges) // 2:][:2]])
+            closed = routing.find_route(start, end, heuristic)
+            assert closed.graph.version == routing.edge_updates.version
+            assert_route_optimal(closed)
+            if closed.path is not None:
+                assert closed.stats["distance"] >= route.stats["distance"] * (1 - 1e-6)
+
+            edge_updates([(u, v, key, 1.0) for u, v, key in edges])
+            reopened = routing.find_route(start, end, heuristic)
+            assert_route_optimal(reopened)
+            assert reopened.stats["distance"] == pytest.approx(route.stats["distance"], rel=1e-6)
+
+
+def test_corridor_route_follows_edge_updates(city_graph, provider, edge_updates):
+    """경로 위 엣지를 통제한 뒤와 다시 연 뒤에도 코리도 탐색이 최단 경로를 찾는다."""
+    for start, end in endpoints(city_graph, random_pairs(city_graph, 8, seed=6)):
+        route = assert_corridor_optimal(city_graph, start, end)
+        edges = path_edges(route.graph, route.path) if route.path else []
+        if edges:
+            edge_updates([(u, v, key, CLOSED) for u, v, key in edges[len(edges) // 2:][:2]])
+            assert_corridor_optimal(city_graph, start, end)
+            edge_updates([(u, v, key, 1.0) for u, v, key in edges])
+            assert_corridor_optimal(city_graph, start, end)
+
+
+def test_graph_loaded_during_update_follows_it(city_graph, provider, edge_updates, monkeypatch):
+    """불러오는 도중에 들어온 갱신도 그 그래프와, 그것을 함께 쓰는 다음 요청에 적용된다."""
+    node = int(np.argmax(np.diff(city_graph.fwd_offsets) > 0))
+    edge = int(city_graph.fwd_offsets[node])
+    target = int(city_graph.fwd_targets[edge])
+    u, v, key = int(city_graph.node_ids[node]), int(city_graph.node_ids[target]), int(city_graph.fwd_keys[edge])
+    points = [{"lat": lat, "lng": lng} for lat, lng in (city_graph.position(node), city_graph.position(target))]
+
+    # 불러온 그래프에 그때의 갱신을 적용한 뒤, 결과를 넘기기 전에 멈춰 둔다.
+    started, release = threading.Event(), threading.Event()
+    with_edge_updates = road_network.with_edge_updates
+
+    def slow_with_edge_updates(graph):
+        graph = with_edge_updates(graph)
+        started.set()
+        release.wait(10)
+        return graph
+
+    monkeypatch.setattr(road_network, "with_edge_updates", slow_with_edge_updates)
+    reused = road_network.graph_loads.stats()["reused"]
+    loaded = []
+    thread = threading.Thread(target=lambda: loaded.append(road_network.load_area_graph(points)))
+    thread.start()
+    assert started.wait(10)
+    edge_updates([(u, v, key, CLOSED)])
+    release.set()
+    thread.join(10)
+
+    again = road_network.load_area_graph(points)
+    assert road_network.graph_loads.stats()["reused"] == reused + 1
+    for graph in (loaded[0], again):
+        assert graph.version == road_network.edge_updates.version
+        assert graph.fwd_weights[graph.edge_position(u, v, key)] == math.inf
@@ -0,0 +1,44 @@
+"""큰 그래프에서 쓰는 노드별 하한(NodeBounds) 이 한 번에 계산한 배열과 같은지, 그것으로도 최단 경로를 찾는지."""
+from functools import partial
+
+import pytest
+
+from algorithms import heuristics
+from algorithms.heuristics import NodeBounds, straight_line, travel_time
+from algorithms.path_finder import a_star_search, bidirectional_a_star
+from tests.helpers import assert_same_cost, random_pairs
+
+PAIRS = 30
+
+
+@pytest.fixture
+def lazy(monkeypatch):
+    """city_graph 도 큰 그래프처럼 노드별로 하한을 계산하게 한다."""
+    monkeypatch.setattr(heuristics, "VECTORIZED_MAX_NODES", 0)
+
+
+@pytest.mark.parametrize("weight", ["distance", "time"])
+def test_node_bounds_match_array(city_graph, weight, monkeypatch):
+    graph = city_graph.weighted(weight)
+    heuristic = travel_time() if weight == "time" else straight_line
+    seeds = [(0, 0.0), (graph.num_nodes // 2, 3.0)]
+    for reverse in (False, True):
+        array = heuristic(graph, seeds, reverse)
+        monkeypatch.setattr(heuristics, "VECTORIZED_MAX_NODES", 0)
+        bounds = heuristic(graph, seeds, reverse)
+        monkeypatch.undo()
+        assert isinstance(bounds, NodeBounds)
+        assert [bounds[node] for node in range(graph.num_nodes)] == pytest.approx(array.tolist(), rel=1e-12)
+
+
+@pytest.mark.parametrize("search", [a_star_search, bidirectional_a_star])
+def test_search_with_node_bounds_matches_dijkstra(city_graph, lazy, search):
+    for start, goal in random_pairs(city_graph, PAIRS):
+        assert_same_cost(search, start, goal, city_graph)
+
+
+def test_time_search_with_node_bounds_matches_dijkstra(city_graph, lazy):
+    graph = city_graph.weighted("time")
+    search = partial(bidirectional_a_star, heuristic=travel_time())
+    for start, goal in random_pairs(graph, PAIRS):
+        assert_same_cost(search, start, goal, graph)
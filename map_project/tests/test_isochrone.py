@@ -0,0 +1,29 @@
+"""넓혀 가며 불러온 bbox 의 등시선 탐색이 도로망 전체에서 닿는 노드와 비용을 그대로 찾는지 확인한다."""
+import pytest
+
+from algorithms.isochrone import reached_costs
+from algorithms.path_finder import snap_to_edge
+from algorithms.road_network import ISOCHRONE_SNAP_MARGIN, find_isochrone_tree
+from algorithms.speeds import MAX_SPEED, kph_to_mps
+from tests.helpers import random_points
+
+
+@pytest.mark.parametrize("weight, budget", [("time", 30.0), ("time", 90.0), ("distance", 800.0)])
+def test_isochrone_tree_matches_full_graph(city_graph, provider, weight, budget):
+    full = city_graph.weighted(weight)
+    for lat, lon in random_points(city_graph, 6, seed=3):
+        graph, start, costs, _ = find_isochrone_tree({"lat": lat, "lng": lon}, budget, weight)
+        expected = reached_costs(snap_to_edge(lat, lon, full), full, budget)
+        reached = {int(graph.node_ids[node]): cost for node, cost in costs.items() if cost <= budget}
+        assert reached.keys() == {int(full.node_ids[node]) for node, cost in expected.items() if cost <= budget}
+        for node, cost in expected.items():
+            if cost <= budget:
+                assert reached[int(full.node_ids[node])] == pytest.approx(cost, abs=1e-3)
+
+
+def test_isochrone_tree_stops_before_max_speed_box(city_graph, provider):
+    north, south, east, west = city_graph.bounds
+    _, _, costs, stats = find_isochrone_tree({"lat": (north + south) / 2, "lng": (east + west) / 2}, 30.0, "time")
+    assert costs
+    assert stats["attempts"] == 1
+    assert stats["radius"] < 30.0 * kph_to_mps(MAX_SPEED) + ISOCHRONE_SNAP_MARGIN
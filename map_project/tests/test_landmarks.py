@@ -0,0 +1,64 @@
+"""ALT 랜드마크 하한이 허용 가능한지, 양방향 ALT 가 Dijkstra 와 같은 최단 거리를 찾는지 확인한다."""
+from functools import partial
+
+import numpy as np
+import pytest
+
+from algorithms import heuristics
+from algorithms.heuristics import NodeBounds, travel_time
+from algorithms.landmarks import Landmarks
+from algorithms.path_finder import bidirectional_a_star, shortest_path_tree, snap_to_edge
+from tests.helpers import assert_same_cost, random_pairs, random_points
+
+PAIRS = 30
+
+
+def test_bounds_are_admissible(city_graph, landmarks):
+    """하한은 0 이상이고, 출발 노드에서 닿는 노드까지의 실제 거리를 넘지 않는다."""
+    for source, _ in random_pairs(city_graph, 5, seed=8):
+        costs, _ = shortest_path_tree(city_graph, [(source, 0.0)])
+        nodes = list(costs)
+        bounds = landmarks.bounds_from(source)
+        assert np.all(bounds >= 0.0)
+        assert np.all(bounds[nodes] <= np.array([costs[node] for node in nodes]) + 1e-6)
+
+
+def test_alt_matches_dijkstra(city_graph, landmarks):
+    alt = partial(bidirectional_a_star, heuristic=landmarks)
+    for start, goal in random_pairs(city_graph, PAIRS):
+        assert_same_cost(alt, start, goal, city_graph)
+
+
+def test_alt_matches_dijkstra_on_phantom_nodes(city_graph, landmarks):
+    alt = partial(bidirectional_a_star, heuristic=landmarks)
+    points = random_points(city_graph, 2 * PAIRS, seed=2)
+    for (lat1, lon1), (lat2, lon2) in zip(points[::2], points[1::2]):
+        start, goal = snap_to_edge(lat1, lon1, city_graph), snap_to_edge(lat2, lon2, city_graph)
+        assert_same_cost(alt, start, goal, city_graph)
+
+
+def test_node_bounds_match_array(city_graph, landmarks, monkeypatch):
+    """큰 그래프에서 쓰는 노드별 하한이 한 번에 계산한 배열과 같다."""
+    monkeypatch.setattr(heuristics, "VECTORIZED_MAX_NODES", 0)
+    seeds = [(0, 0.0), (city_graph.num_nodes // 2, 3.0)]
+    for reverse in (False, True):
+        bounds = landmarks(city_graph, seeds, reverse)
+        assert isinstance(bounds, NodeBounds)
+        expected = landmarks.bound_array(seeds, reverse).tolist()
+        assert [bounds[node] for node in range(city_graph.num_nodes)] == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize("weight", ["distance", "time"])
+def test_alt_with_node_bounds_matches_dijkstra(city_graph, landmarks, weight, monkeypatch):
+    monkeypatch.setattr(heuristics, "VECTORIZED_MAX_NODES", 0)
+    graph = city_graph.weighted(weight)
+    alt = partial(bidirectional_a_star, heuristic=travel_time(landmarks) if weight == "time" else landmarks)
+    for start, goal in random_pairs(graph, PAIRS):
+        assert_same_cost(alt, start, goal, graph)
+
+
+def test_arrays_round_trip(landmarks):
+    loaded = Landmarks.from_arrays(landmarks.to_arrays())
+    assert loaded.landmarks.tolist() == landmarks.landmarks.tolist()
+    assert np.array_equal(loaded.forward, landmarks.forward)
+    assert Landmarks.from_arrays({}) is None
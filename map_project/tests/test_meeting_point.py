@@ -0,0 +1,65 @@
+"""/meeting-point 가 방 참가자 모두가 갈 수 있는 최적의 만남 장소를 찾고, 잘못된 요청은 거절하는지 확인한다."""
+import numpy as np
+import pytest
+
+import app
+from algorithms.path_finder import _source_seeds, shortest_path_tree, snap_to_edge
+from routing import MAX_MEETING_MEMBERS
+from tests.helpers import endpoints, random_pairs
+
+
+@pytest.fixture
+def room(monkeypatch):
+    """빈 방 하나. (방 코드, 참가자 이름 -> 공유한 위치 사전)."""
+    monkeypatch.setitem(app.rooms, "test-room", {"users": [], "locations": {}})
+    return "test-room", app.rooms["test-room"]["locations"]
+
+
+def share(locations, points):
+    for i, point in enumerate(points):
+        locations[f"user{i}"] = {"location": point, "address": ""}
+
+
+@pytest.mark.parametrize("objective", ["minmax", "minsum"])
+def test_meeting_point_is_optimal(city_graph, region, client, room, objective):
+    code, locations = room
+    share(locations, [start for start, _ in endpoints(city_graph, random_pairs(city_graph, 3, seed=11))])
+    response = client.post("/meeting-point", json={"room": code, "objective": objective})
+
+    # 모든 노드에 대한 참가자별 거리로 기준을 직접 계산한다.
+    distances = np.full((len(locations), city_graph.num_nodes), np.inf)
+    for i, entry in enumerate(locations.values()):
+        start = snap_to_edge(entry["location"]["lat"], entry["location"]["lng"], city_graph)
+        costs, _ = shortest_path_tree(city_graph, _source_seeds(start, city_graph))
+        distances[i, list(costs)] = list(costs.values())
+    best = (distances.max(axis=0) if objective == "minmax" else distances.sum(axis=0)).min()
+    if not np.isfinite(best):
+        assert response.status_code == 404
+        return
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [member["username"] for member in body["members"]] == list(locations)
+    key = "max_distance" if objective == "minmax" else "total_distance"
+    assert body[key] == pytest.approx(best, rel=1e-6)
+    for member in body["members"]:
+        assert (member["path"][-1]["lat"], member["path"][-1]["lng"]) == \
+            pytest.approx((body["meetingPoint"]["lat"], body["meetingPoint"]["lng"]))
+
+
+@pytest.mark.parametrize("points, objective", [
+    ([{"lat": 0.0, "lng": 0.0}], "minmax"),
+    ([{"lat": 0.0, "lng": 0.0}] * (MAX_MEETING_MEMBERS + 1), "minmax"),
+    ([{"lat": 0.0, "lng": 0.0}, {"lat": 0.0}], "minmax"),
+    ([{"lat": 0.0, "lng": 0.0}] * 2, "closest"),
+])
+def test_bad_request(client, room, points, objective):
+    code, locations = room
+    share(locations, points)
+    response = client.post("/meeting-point", json={"room": code, "objective": objective})
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_unknown_room(client):
+    assert client.post("/meeting-point", json={"room": "no-such-room"}).status_code == 404
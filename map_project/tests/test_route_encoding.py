@@ -0,0 +1,92 @@
+"""경로 응답 형식(polyline, packed) 을 인코딩했다가 되살리면 원래 본문이 나오는지 확인한다."""
+import numpy as np
+import pytest
+
+from algorithms.path_finder import bidirectional_a_star, path_to_coords
+from algorithms.route_encoding import TRACE_COLUMNS, decode_packed, decode_polyline, encode_body, encode_polyline
+from algorithms.search_trace import SearchTrace
+from tests.helpers import random_pairs
+
+
+def test_polyline_known_value():
+    # Google 문서의 예제
+    points = [{"lat": 38.5, "lng": -120.2}, {"lat": 40.7, "lng": -120.95}, {"lat": 43.252, "lng": -126.453}]
+    assert encode_polyline(points) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+    assert decode_polyline("_p~iF~ps|U_ulLnnqC_mqNvxq`@") == points
+
+
+@pytest.mark.parametrize("precision", [5, 6])
+def test_polyline_round_trip(precision):
+    rng = np.random.default_rng(precision)
+    points = [{"lat": float(lat), "lng": float(lng)}
+              for lat, lng in zip(rng.uniform(-89, 89, 500), rng.uniform(-179, 179, 500))]
+    text = encode_polyline(points, precision)
+    decoded = decode_polyline(text, precision)
+
+    assert len(decoded) == len(points)
+    for point, restored in zip(points, decoded):
+        assert restored["lat"] == pytest.approx(point["lat"], abs=0.5 / 10 ** precision + 1e-12)
+        assert restored["lng"] == pytest.approx(point["lng"], abs=0.5 / 10 ** precision + 1e-12)
+    # 한 번 반올림한 좌표는 그대로 다시 인코딩된다.
+    assert encode_polyline(decoded, precision) == text
+
+
+def test_polyline_empty():
+    assert encode_polyline([]) == ""
+    assert decode_polyline("") == []
+
+
+@pytest.fixture
+def route_body(city_graph):
+    """/find-path 와 같은 모양의 본문: 경로, 전체 탐색 기록, 대안 경로."""
+    (start, goal), (other_start, other_goal) = random_pairs(city_graph, 2, seed=7)
+    path, trace = bidirectional_a_star(start, goal, city_graph, trace=SearchTrace(city_graph, "full", sample_every=1))
+    other, _ = bidirectional_a_star(other_start, other_goal, city_graph)
+    return {
+        "path": path_to_coords(path or [start], city_graph),
+        "exploredNodes": trace.to_dict(),
+        "weight": "distance",
+        "cost": 1234.5,
+        "cached": False,
+        "alternatives": [{"path": path_to_coords(other or [other_start], city_graph), "cost": 2345.0}],
+    }
+
+
+def assert_same_path(encoded, points):
+    assert isinstance(encoded, str)
+    decoded = decode_polyline(encoded)
+    assert len(decoded) == len(points)
+    for point, restored in zip(points, decoded):
+        assert restored["lat"] == pytest.approx(point["lat"], abs=1e-5)
+        assert restored["lng"] == pytest.approx(point["lng"], abs=1e-5)
+
+
+def test_polyline_body(route_body):
+    body = encode_body(route_body, "polyline")
+    assert_same_path(body["path"], route_body["path"])
+    assert_same_path(body["alternatives"][0]["path"], route_body["alternatives"][0]["path"])
+    assert body["exploredNodes"] == route_body["exploredNodes"]
+
+
+def test_packed_round_trip(route_body):
+    data = encode_body(route_body, "packed")
+    body = decode_packed(data)
+
+    assert_same_path(body["path"], route_body["path"])
+    assert_same_path(body["alternatives"][0]["path"], route_body["alternatives"][0]["path"])
+    assert body["alternatives"][0]["cost"] == route_body["alternatives"][0]["cost"]
+    for key in ("weight", "cost", "cached"):
+        assert body[key] == route_body[key]
+
+    trace, original = body["exploredNodes"], route_body["exploredNodes"]
+    assert len(original["lat"]) > 0
+    for name, dtype in TRACE_COLUMNS.items():
+        # 좌표와 비용은 float32 로 줄여 보낸다.
+        assert trace[name] == np.asarray(original[name], dtype=dtype).tolist()
+    for key in original.keys() - TRACE_COLUMNS.keys():
+        assert trace[key] == original[key]
+
+
+def test_packed_rejects_other_data():
+    with pytest.raises(ValueError):
+        decode_packed(b"JSON" + bytes(16))
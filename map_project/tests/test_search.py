@@ -0,0 +1,13 @@
+"""A* 와 양방향 A* 가 같은 그래프에서 Dijkstra 와 같은 최단 거리를 찾는지 확인한다."""
+import pytest
+
+from algorithms.path_finder import a_star_search, bidirectional_a_star
+from tests.helpers import assert_same_cost, random_pairs
+
+PAIRS = 30
+
+
+@pytest.mark.parametrize("search", [a_star_search, bidirectional_a_star])
+def test_search_matches_dijkstra(city_graph, search):
+    for start, goal in random_pairs(city_graph, PAIRS):
+        assert_same_cost(search, start, goal, city_graph)
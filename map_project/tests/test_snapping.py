@@ -0,0 +1,40 @@
+"""끝점을 가장 가까운 도로 구간 위의 지점(PhantomNode) 으로 스냅하고 그 사이를 탐색한다."""
+import numpy as np
+import pytest
+
+from algorithms.path_finder import (
+    a_star_search, bidirectional_a_star, haversine, path_to_coords, snap_to_edge,
+)
+from tests.helpers import assert_same_cost, random_points
+
+PAIRS = 30
+
+
+def test_snap_is_no_farther_than_closest_road_node(city_graph):
+    """도로 구간 위의 지점은 도로가 닿는 어느 노드(구간의 끝점)보다 멀 수 없다 (투영 오차만큼 여유)."""
+    degree = np.diff(city_graph.fwd_offsets) + np.diff(city_graph.rev_offsets)
+    lat, lon = city_graph.lat[degree > 0], city_graph.lon[degree > 0]
+    for point_lat, point_lon in random_points(city_graph, 200, seed=1):
+        phantom = snap_to_edge(point_lat, point_lon, city_graph)
+        assert 0.0 <= phantom.ratio <= 1.0
+        nearest = min(haversine(point_lat, point_lon, a, b) for a, b in zip(lat.tolist(), lon.tolist()))
+        assert haversine(point_lat, point_lon, phantom.lat, phantom.lon) <= nearest + 0.01
+
+
+def test_path_starts_and_ends_at_snapped_points(city_graph):
+    (lat1, lon1), (lat2, lon2) = random_points(city_graph, 2, seed=3)
+    start, goal = snap_to_edge(lat1, lon1, city_graph), snap_to_edge(lat2, lon2, city_graph)
+    path, _ = bidirectional_a_star(start, goal, city_graph)
+    if path is not None:
+        coords = path_to_coords(path, city_graph, start, goal)
+        assert (coords[0]["lat"], coords[0]["lng"]) == pytest.approx((start.lat, start.lon))
+        assert (coords[-1]["lat"], coords[-1]["lng"]) == pytest.approx((goal.lat, goal.lon))
+
+
+def test_search_matches_dijkstra_on_phantom_nodes(city_graph):
+    """도로 구간 위의 임의 지점 사이."""
+    points = random_points(city_graph, 2 * PAIRS, seed=2)
+    for (lat1, lon1), (lat2, lon2) in zip(points[::2], points[1::2]):
+        start, goal = snap_to_edge(lat1, lon1, city_graph), snap_to_edge(lat2, lon2, city_graph)
+        assert_same_cost(a_star_search, start, goal, city_graph)
+        assert_same_cost(bidirectional_a_star, start, goal, city_graph)
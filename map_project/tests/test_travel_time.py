@@ -0,0 +1,52 @@
+"""이동 시간(weight="time") 탐색이 travel_time 휴리스틱으로도 최단 경로를 찾는지 확인한다."""
+from functools import partial
+
+import math
+
+import pytest
+
+from algorithms.graph import RoadGraph
+from algorithms.heuristics import straight_line, travel_time
+from algorithms.path_finder import bidirectional_a_star, snap_to_edge
+from algorithms.speeds import MAX_SPEED, kph_to_mps
+from tests.helpers import assert_corridor_optimal, assert_same_cost, endpoints, random_pairs, random_points
+
+PAIRS = 30
+
+
+@pytest.fixture(params=["straight_line", "landmarks"])
+def heuristic(request, landmarks):
+    return travel_time(straight_line if request.param == "straight_line" else landmarks)
+
+
+def test_time_search_matches_dijkstra(city_graph, heuristic):
+    graph = city_graph.weighted("time")
+    search = partial(bidirectional_a_star, heuristic=heuristic)
+    for start, goal in random_pairs(graph, PAIRS):
+        assert_same_cost(search, start, goal, graph)
+
+
+def test_time_search_matches_dijkstra_on_phantom_nodes(city_graph, heuristic):
+    graph = city_graph.weighted("time")
+    search = partial(bidirectional_a_star, heuristic=heuristic)
+    points = random_points(graph, 2 * PAIRS, seed=2)
+    for (lat1, lon1), (lat2, lon2) in zip(points[::2], points[1::2]):
+        start, goal = snap_to_edge(lat1, lon1, graph), snap_to_edge(lat2, lon2, graph)
+        assert_same_cost(search, start, goal, graph)
+
+
+def test_time_corridor_route_matches_dijkstra(city_graph, provider):
+    for start, end in endpoints(city_graph, random_pairs(city_graph, 8, seed=6)):
+        assert_corridor_optimal(city_graph, start, end, weight="time")
+
+
+@pytest.mark.parametrize("lengths, speeds, expected", [
+    ([0.0, 0.0], [50.0, 50.0], kph_to_mps(MAX_SPEED)),  # 길이가 0 인 엣지뿐
+    ([0.0, 100.0], [100.0, 36.0], 10.0),
+    ([math.inf, 100.0], [50.0, 36.0], 10.0),
+])
+def test_max_speed_ignores_degenerate_edges(lengths, speeds, expected):
+    graph = RoadGraph.from_edges([1, 2, 3], [0.0, 0.0, 0.001], [0.0, 0.001, 0.0], [1, 2], [2, 3], [0, 0],
+                                 lengths, speeds)
+    assert graph.max_speed == pytest.approx(expected)
+    assert graph.weighted("time").max_speed == pytest.approx(expected)